@@ -0,0 +1,141 @@
+import sys
+import threading
+from collections import OrderedDict
+
+# -----------------------------------------------------------------------------
+# Bounded-memory LRU caches for number analysis
+# Results are keyed on the exact parsed value (with its type, so 1/2 and 0.5
+# stay distinct) and evicted least-recently-used first once the cache holds
+# more than its memory budget.
+# -----------------------------------------------------------------------------
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+def estimate_size(obj):
+    """Rough memory footprint of a cached key or value in bytes."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (tuple, list)):
+        size += sum(estimate_size(item) for item in obj)
+    return size
+
+def cache_key(value):
+    """Key a parsed value by type and value, since 2 == 2.0 == Fraction(2) in Python."""
+    return (type(value).__name__, value)
+
+class LRUCache:
+    """Thread-safe LRU mapping with a memory budget and hit/miss counters."""
+
+    _MISSING = object()
+
+    def __init__(self, name, max_bytes=DEFAULT_BUDGET_BYTES):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(key) + estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._data:
+            _, (_, size) = self._data.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def set_budget(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return a dict with entries, bytes, hits, misses and evictions."""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def cached(self, func, key=cache_key):
+        """Wrap a one-argument function so its results are memoized in this cache."""
+        def wrapper(value):
+            k = key(value)
+            result = self.get(k, self._MISSING)
+            if result is self._MISSING:
+                result = func(value)
+                self.put(k, result)
+            return result
+        wrapper.__doc__ = func.__doc__
+        wrapper.__name__ = getattr(func, "__name__", "cached")
+        wrapper.cache = self
+        return wrapper
+
+# -----------------------------------------------------------------------------
+# Shared caches used by the Number Properties tab; the budget is split so one
+# kind of result cannot starve the others.
+# -----------------------------------------------------------------------------
+
+prime_cache = LRUCache("primality", DEFAULT_BUDGET_BYTES // 4)
+factor_cache = LRUCache("factorization", DEFAULT_BUDGET_BYTES // 2)
+property_cache = LRUCache("properties", DEFAULT_BUDGET_BYTES // 4)
+
+ALL_CACHES = (prime_cache, factor_cache, property_cache)
+
+def set_memory_budget(total_bytes):
+    """Resize all shared caches to share total_bytes in the default proportions."""
+    prime_cache.set_budget(total_bytes // 4)
+    factor_cache.set_budget(total_bytes // 2)
+    property_cache.set_budget(total_bytes // 4)
+
+def combined_stats():
+    """Sum the statistics of all shared caches."""
+    total = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+    for cache in ALL_CACHES:
+        for k, v in cache.stats().items():
+            total[k] += v
+    return total
+
+def format_stats():
+    """One-line summary of the shared cache statistics for the UI."""
+    s = combined_stats()
+    return (f"Cache: {s['hits']} hits, {s['misses']} misses, "
+            f"{s['entries']} entries ({s['bytes'] / 1024:.0f} KiB)")
@@ -0,0 +1,303 @@
+import os
+import csv
+import json
+import time
+import atexit
+import sqlite3
+import zipfile
+import tempfile
+import logging
+from collections import deque, namedtuple
+
+import numpy as np
+
+import number_analysis
+
+# -----------------------------------------------------------------------------
+# Number Properties analysis history
+# The most recent records live in a ring buffer in memory; when it is full the
+# oldest record is spilled to an SQLite file instead of being dropped. Both
+# tiers are indexed by value and by property flag (flags are a bitmask over
+# number_analysis.PROPERTY_NAMES), and every query and export streams the
+# spilled records from a cursor before the in-memory ones, oldest first.
+# -----------------------------------------------------------------------------
+
+DEFAULT_MEMORY_RECORDS = 1000
+
+HistoryRecord = namedtuple("HistoryRecord", "id timestamp kind input value flags summary details")
+
+FLAG_BITS = {name: 1 << i for i, name in enumerate(number_analysis.PROPERTY_NAMES)}
+
+EXPORT_FORMATS = ("txt", "csv", "jsonl", "npz")
+
+# Records per step when streaming exports
+_EXPORT_CHUNK = 4096
+
+def pack_flags(props):
+    """Bitmask of the properties that are True in a classify() result."""
+    flags = 0
+    for name, bit in FLAG_BITS.items():
+        if props.get(name):
+            flags |= bit
+    return flags
+
+def unpack_flags(flags):
+    """Names of the properties set in a bitmask."""
+    return [name for name, bit in FLAG_BITS.items() if flags & bit]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    kind TEXT NOT NULL,
+    input TEXT NOT NULL,
+    value TEXT NOT NULL,
+    flags INTEGER NOT NULL,
+    summary TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_value ON history (value);
+CREATE TABLE IF NOT EXISTS history_flags (
+    flag INTEGER NOT NULL,
+    record_id INTEGER NOT NULL,
+    PRIMARY KEY (flag, record_id)
+) WITHOUT ROWID;
+"""
+
+class AnalysisHistory:
+    """
+    Bounded in-memory history that spills to SQLite.
+
+    memory_records caps the ring buffer; max_spilled (None = unlimited) caps
+    the number of records kept on disk, dropping the oldest. The spill file
+    is a private temporary file unless a path is given.
+    """
+
+    def __init__(self, memory_records=DEFAULT_MEMORY_RECORDS, path=None, max_spilled=None):
+        if memory_records < 1:
+            raise ValueError("memory_records must be at least 1.")
+        self.memory_records = memory_records
+        self.max_spilled = max_spilled
+        self.path = path
+        self._owns_file = path is None
+        self._db = None
+        self._spilled = 0
+        self._next_id = 1
+        self._ring = deque()
+        self._by_value = {}
+        self._by_flag = {bit: set() for bit in FLAG_BITS.values()}
+
+    def __len__(self):
+        return self._spilled + len(self._ring)
+
+    # -- storage ---------------------------------------------------------------
+
+    def _connect(self):
+        if self._db is None:
+            if self.path is None:
+                fd, self.path = tempfile.mkstemp(prefix="properties-history-", suffix=".sqlite")
+                os.close(fd)
+                atexit.register(self.close)
+            self._db = sqlite3.connect(self.path)
+            self._db.executescript(_SCHEMA)
+            self._spilled = self._db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            last = self._db.execute("SELECT MAX(id) FROM history").fetchone()[0]
+            if last is not None:
+                self._next_id = max(self._next_id, last + 1)
+        return self._db
+
+    def _index(self, record):
+        self._by_value.setdefault(record.value, set()).add(record.id)
+        for bit, ids in self._by_flag.items():
+            if record.flags & bit:
+                ids.add(record.id)
+
+    def _unindex(self, record):
+        ids = self._by_value.get(record.value)
+        if ids is not None:
+            ids.discard(record.id)
+            if not ids:
+                del self._by_value[record.value]
+        for bit, ids in self._by_flag.items():
+            if record.flags & bit:
+                ids.discard(record.id)
+
+    def _spill(self, record):
+        db = self._connect()
+        with db:
+            db.execute("INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (record.id, record.timestamp, record.kind, record.input, record.value,
+                        record.flags, record.summary, json.dumps(record.details)))
+            db.executemany("INSERT INTO history_flags VALUES (?, ?)",
+                           [(bit, record.id) for bit in self._by_flag if record.flags & bit])
+            self._spilled += 1
+            if self.max_spilled is not None and self._spilled > self.max_spilled:
+                excess = self._spilled - self.max_spilled
+                cutoff = db.execute("SELECT id FROM history ORDER BY id LIMIT 1 OFFSET ?",
+                                    (excess - 1,)).fetchone()[0]
+                db.execute("DELETE FROM history WHERE id <= ?", (cutoff,))
+                db.execute("DELETE FROM history_flags WHERE record_id <= ?", (cutoff,))
+                self._spilled -= excess
+
+    # -- public API ------------------------------------------------------------
+
+    def add(self, kind, input_str, value, summary, props=None, details=None):
+        """Append a record and return it; the oldest in-memory record spills to disk when full."""
+        record = HistoryRecord(self._next_id, time.time(), kind, input_str, value,
+                               pack_flags(props or {}), summary, details or {})
+        self._next_id += 1
+        if len(self._ring) >= self.memory_records:
+            oldest = self._ring.popleft()
+            self._unindex(oldest)
+            self._spill(oldest)
+        self._ring.append(record)
+        self._index(record)
+        return record
+
+    def set_memory_records(self, memory_records):
+        """Change the ring buffer capacity, spilling records that no longer fit."""
+        if memory_records < 1:
+            raise ValueError("memory_records must be at least 1.")
+        self.memory_records = memory_records
+        while len(self._ring) > memory_records:
+            oldest = self._ring.popleft()
+            self._unindex(oldest)
+            self._spill(oldest)
+
+    def clear(self):
+        """Forget every record, in memory and on disk."""
+        self._ring.clear()
+        self._by_value.clear()
+        for ids in self._by_flag.values():
+            ids.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM history")
+                self._db.execute("DELETE FROM history_flags")
+        self._spilled = 0
+
+    def close(self):
+        """Close the spill file, deleting it if it was a private temporary file."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            if self._owns_file and self.path is not None:
+                try:
+                    os.remove(self.path)
+                except OSError as e:
+                    logging.warning("Could not remove history file %s: %s", self.path, e)
+                self.path = None
+                self._spilled = 0
+
+    def _row_to_record(self, row):
+        return HistoryRecord(*row[:7], json.loads(row[7]))
+
+    def query(self, value=None, flags=()):
+        """
+        Yield records oldest first, optionally restricted to one value and/or
+        to records that have every property named in flags.
+        """
+        bits = [FLAG_BITS[name] for name in flags]
+        if self._spilled:
+            sql = "SELECT * FROM history"
+            clauses, params = [], []
+            if value is not None:
+                clauses.append("value = ?")
+                params.append(value)
+            for bit in bits:
+                clauses.append("id IN (SELECT record_id FROM history_flags WHERE flag = ?)")
+                params.append(bit)
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            cursor = self._db.execute(sql + " ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(_EXPORT_CHUNK)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_record(row)
+
+        if value is None and not bits:
+            yield from list(self._ring)
+            return
+        candidates = [self._by_value.get(value, set())] if value is not None else []
+        candidates += [self._by_flag[bit] for bit in bits]
+        ids = set.intersection(*candidates) if candidates else set()
+        if ids:
+            yield from (r for r in list(self._ring) if r.id in ids)
+
+    def __iter__(self):
+        return self.query()
+
+    # -- export ----------------------------------------------------------------
+
+    def export(self, path, fmt=None):
+        """
+        Write every record to path as txt, csv, jsonl or npz (chosen from the
+        extension when fmt is None), streaming from storage; returns the count.
+        """
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip(".").lower() or "txt"
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'.")
+        if fmt == "npz":
+            return self._export_npz(path)
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if fmt == "txt":
+                f.write("Number Properties Analysis\n")
+                f.write("=========================\n\n")
+                for record in self:
+                    f.write(f"{record.summary}\n")
+                    count += 1
+            elif fmt == "jsonl":
+                for record in self:
+                    row = record._asdict()
+                    row["flags"] = unpack_flags(record.flags)
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["id", "timestamp", "kind", "input", "value"]
+                                + number_analysis.PROPERTY_NAMES + ["summary", "details"])
+                for record in self:
+                    writer.writerow([record.id, record.timestamp, record.kind, record.input, record.value]
+                                    + [int(bool(record.flags & FLAG_BITS[name]))
+                                       for name in number_analysis.PROPERTY_NAMES]
+                                    + [record.summary, json.dumps(record.details, ensure_ascii=False)])
+                    count += 1
+        return count
+
+    def _export_npz(self, path):
+        """
+        Write one compressed .npy member per column. Each member is written
+        straight into the zip file in chunks; string widths are found in a
+        first pass so no column is ever held in memory as a whole.
+        """
+        count = 0
+        widths = {"kind": 1, "input": 1, "value": 1, "summary": 1}
+        for record in self:
+            count += 1
+            for name in widths:
+                widths[name] = max(widths[name], len(getattr(record, name)))
+        columns = [
+            ("id", np.dtype(np.int64)),
+            ("timestamp", np.dtype(np.float64)),
+            ("flags", np.dtype(np.uint32)),
+        ] + [(name, np.dtype(f"<U{width}")) for name, width in widths.items()]
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for name, dtype in columns:
+                with zf.open(f"{name}.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(
+                        member, {"descr": np.lib.format.dtype_to_descr(dtype),
+                                 "fortran_order": False, "shape": (count,)})
+                    chunk = []
+                    for record in self:
+                        chunk.append(getattr(record, name))
+                        if len(chunk) == _EXPORT_CHUNK:
+                            member.write(np.asarray(chunk, dtype=dtype).tobytes())
+                            chunk = []
+                    if chunk:
+                        member.write(np.asarray(chunk, dtype=dtype).tobytes())
+        return count
@@ -0,0 +1,189 @@
+import os
+import json
+import math
+import threading
+import logging
+
+import numpy as np
+
+import prime_sieve
+
+# -----------------------------------------------------------------------------
+# Arithmetic-function tables
+# Euler's totient φ, Möbius μ, divisor count d, divisor sum σ and the number
+# of prime factors with multiplicity Ω for every n <= N, filled by a sieve and
+# stored in NumPy arrays so that each value is an O(1) lookup.
+#
+# A linear (Euler) sieve visits every n once, but in Python that is a scalar
+# loop of N iterations. Instead each prime power p^k <= N is applied to all of
+# its multiples with one strided NumPy operation, which is only needed for
+# p <= sqrt(N): whatever is left of n after dividing out those primes is a
+# single large prime, applied to all n at once at the end.
+# -----------------------------------------------------------------------------
+
+FUNCTION_NAMES = ("phi", "mu", "tau", "sigma", "omega")
+
+FUNCTION_LABELS = {
+    "phi": "Euler's Totient φ(n)",
+    "mu": "Möbius μ(n)",
+    "tau": "Divisor Count d(n)",
+    "sigma": "Divisor Sum σ(n)",
+    "omega": "Prime Factors with Multiplicity Ω(n)",
+}
+
+DEFAULT_TABLE_LIMIT = 10 ** 6
+
+def _dtypes(limit):
+    """Smallest safe dtypes for tables up to limit."""
+    wide = np.uint32 if limit < 2 ** 32 else np.uint64
+    # σ(n) < 6n for n < 10^9 (Robin's inequality), so uint32 suffices up to 5e8
+    sigma = np.uint32 if limit <= 5 * 10 ** 8 else np.uint64
+    return {
+        "phi": wide,
+        "mu": np.int8,
+        "tau": np.uint16 if limit < 10 ** 12 else np.uint32,
+        "sigma": sigma,
+        "omega": np.uint8,
+    }
+
+def _allocate(limit, path, name, dtype, fill):
+    shape = (limit + 1,)
+    if path is None:
+        return np.full(shape, fill, dtype=dtype)
+    arr = np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape)
+    arr[:] = fill
+    return arr
+
+class ArithmeticTables:
+    """φ, μ, d, σ and Ω for 0 <= n <= limit; entries for n = 0 are 0."""
+
+    def __init__(self, limit, path=None):
+        self.limit = int(limit)
+        self.path = path
+        if path is not None and self._load(path):
+            return
+        self._build()
+        if path is not None:
+            for name in FUNCTION_NAMES:
+                getattr(self, name).flush()
+            with open(os.path.join(path, "meta.json"), "w") as f:
+                json.dump({"limit": self.limit}, f)
+
+    def _load(self, path):
+        """Reuse memory-mapped tables in path if they cover the limit."""
+        meta_path = os.path.join(path, "meta.json")
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("limit", -1) < self.limit:
+                return False
+            for name in FUNCTION_NAMES:
+                setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+            self.limit = meta["limit"]
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _build(self):
+        n = self.limit
+        path = self.path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        dt = _dtypes(n)
+        logging.debug("Building arithmetic tables up to %d", n)
+
+        phi = _allocate(n, path, "phi", dt["phi"], 1)
+        mu = _allocate(n, path, "mu", dt["mu"], 1)
+        tau = _allocate(n, path, "tau", dt["tau"], 1)
+        sigma = _allocate(n, path, "sigma", dt["sigma"], 1)
+        omega = _allocate(n, path, "omega", dt["omega"], 0)
+        # Part of n not yet explained by the primes processed so far
+        rem = np.arange(n + 1, dtype=np.uint32 if n < 2 ** 32 else np.uint64)
+
+        for p in prime_sieve.primes_up_to(math.isqrt(n)):
+            # Level 1: every multiple of p
+            s = slice(p, n + 1, p)
+            phi[s] *= p - 1
+            mu[s] *= -1
+            tau[s] *= 2
+            sigma[s] *= p + 1
+            omega[s] += 1
+            rem[s] //= p
+            # Level k: multiples of p^k gain one more factor p
+            pk = p * p
+            k = 2
+            prev_sigma = p + 1
+            while pk <= n:
+                s = slice(pk, n + 1, pk)
+                cur_sigma = prev_sigma * p + 1
+                phi[s] *= p
+                mu[s] = 0
+                tau[s] //= k
+                tau[s] *= k + 1
+                sigma[s] //= prev_sigma
+                sigma[s] *= cur_sigma
+                omega[s] += 1
+                rem[s] //= p
+                prev_sigma = cur_sigma
+                pk *= p
+                k += 1
+
+        # What remains (> 1) is a single prime factor q > sqrt(N)
+        big = np.nonzero(rem > 1)[0]
+        q = rem[big]
+        phi[big] *= (q - 1).astype(phi.dtype)
+        mu[big] *= -1
+        tau[big] *= 2
+        sigma[big] *= (q + 1).astype(sigma.dtype)
+        omega[big] += 1
+
+        for arr in (phi, mu, tau, sigma, omega):
+            arr[0] = 0
+        self.phi, self.mu, self.tau, self.sigma, self.omega = phi, mu, tau, sigma, omega
+
+    def lookup(self, n):
+        """Return {name: value} for one n <= limit."""
+        n = int(n)
+        if not 0 < n <= self.limit:
+            raise ValueError(f"n must be between 1 and {self.limit}.")
+        return {name: int(getattr(self, name)[n]) for name in FUNCTION_NAMES}
+
+    def bulk(self, name, ns):
+        """Return the values of one function for an array of indices."""
+        if name not in FUNCTION_NAMES:
+            raise ValueError(f"Unknown arithmetic function '{name}'.")
+        return getattr(self, name)[np.asarray(ns, dtype=np.int64)]
+
+# -----------------------------------------------------------------------------
+# Values from a factorization (for n beyond the table)
+# -----------------------------------------------------------------------------
+
+def from_factorization(factors):
+    """Compute {name: value} from a complete {prime: exponent} factorization of n >= 1."""
+    phi = tau = sigma = 1
+    omega = 0
+    mu = 1
+    for p, e in factors.items():
+        if p == -1:
+            continue
+        phi *= (p - 1) * p ** (e - 1)
+        tau *= e + 1
+        sigma *= (p ** (e + 1) - 1) // (p - 1)
+        omega += e
+        mu = 0 if e > 1 else -mu if mu else 0
+    return {"phi": phi, "mu": mu, "tau": tau, "sigma": sigma, "omega": omega}
+
+# -----------------------------------------------------------------------------
+# Shared default tables
+# -----------------------------------------------------------------------------
+
+_default_tables = None
+_default_lock = threading.Lock()
+
+def get_default_tables(limit=DEFAULT_TABLE_LIMIT):
+    """Build (once) and return in-memory tables covering at least limit."""
+    global _default_tables
+    with _default_lock:
+        if _default_tables is None or _default_tables.limit < limit:
+            _default_tables = ArithmeticTables(limit)
+        return _default_tables
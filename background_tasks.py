@@ -0,0 +1,139 @@
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# -----------------------------------------------------------------------------
+# Background tasks for the Tk interface
+# Long computations run on a worker thread while the Tk main loop polls for
+# the result with after(), so the window stays responsive. Tk widgets are only
+# ever touched from the main loop. Cancellation is cooperative: the task
+# function receives its Task and calls check_cancelled() (or passes
+# task.is_cancelled as a cancel callback) between expensive steps.
+#
+# Each TkTaskRunner runs one logical job at a time; submitting a new task
+# cancels the previous one and its result, if it still arrives, is dropped.
+# -----------------------------------------------------------------------------
+
+POLL_INTERVAL_MS = 50
+# A superseded task that cannot be interrupted keeps its thread until it
+# finishes, so allow a couple of those before new work has to queue.
+MAX_WORKERS = 3
+
+class TaskCancelled(Exception):
+    """Raised inside a task function when its task has been cancelled."""
+
+class Task:
+    """Handle shared between the Tk thread and the worker running one job."""
+
+    def __init__(self):
+        self._cancel_event = threading.Event()
+        self.status = ""
+        self.future = None
+        self._posted = deque()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, status):
+        """Set a short status message for the progress display (worker side)."""
+        self.status = status
+
+    def post(self, item):
+        """Send a partial result to the Tk thread (worker side); delivered in order."""
+        self._posted.append(item)
+
+    def take_posted(self):
+        items = []
+        while self._posted:
+            items.append(self._posted.popleft())
+        return items
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Shared worker pool for all background tasks."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="toolkit-worker")
+        return _executor
+
+class TkTaskRunner:
+    """
+    Run func(task, *args) off the Tk thread and deliver the outcome to
+    callbacks on the Tk thread:
+
+        on_done(result), on_error(exception), on_cancel(), on_progress(status),
+        on_partial(item) for every item the task post()s before it finishes
+
+    Only the most recently submitted task is live.
+    """
+
+    def __init__(self, widget, poll_ms=POLL_INTERVAL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._current = None
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    def submit(self, func, *args, on_done, on_error, on_cancel=None, on_progress=None, on_partial=None):
+        self.cancel(notify=False)
+        task = Task()
+        callbacks = (on_done, on_error, on_cancel, on_progress, on_partial)
+        task.future = get_executor().submit(func, task, *args)
+        self._current = task
+        self.widget.after(self.poll_ms, self._poll, task, callbacks)
+        return task
+
+    def cancel(self, notify=True):
+        """Cancel the live task; with notify its on_cancel callback runs on the next poll."""
+        task = self._current
+        if task is None:
+            return
+        task.cancel()
+        if not notify:
+            self._current = None
+
+    def _poll(self, task, callbacks):
+        if task is not self._current:
+            # Superseded: whatever it produces is discarded
+            return
+        on_done, on_error, on_cancel, on_progress, on_partial = callbacks
+        if task.is_cancelled():
+            self._current = None
+            if on_cancel is not None:
+                on_cancel()
+            return
+        # Check completion before draining so nothing posted is left behind
+        done = task.future.done()
+        if on_partial is not None:
+            for item in task.take_posted():
+                on_partial(item)
+        if not done:
+            if on_progress is not None:
+                on_progress(task.status)
+            self.widget.after(self.poll_ms, self._poll, task, callbacks)
+            return
+        self._current = None
+        try:
+            result = task.future.result()
+        except TaskCancelled:
+            if on_cancel is not None:
+                on_cancel()
+        except Exception as e:
+            if not isinstance(e, ValueError):
+                logging.error("Background task failed", exc_info=e)
+            on_error(e)
+        else:
+            on_done(result)
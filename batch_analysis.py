@@ -0,0 +1,275 @@
+# -----------------------------------------------------------------------------
+# Headless batch number analysis
+# Streams numbers from a file or stdin (one per line, or one column of a CSV
+# file) through the same parse -> classify -> factorize pipeline as the Number
+# Properties tab and writes JSONL or CSV results as they complete. Work is
+# split into chunks that run on a process pool; at most a fixed number of
+# chunks are in flight, so memory stays bounded however long the input is.
+#
+# Example:
+#     python batch_analysis.py numbers.txt -o results.jsonl --factor
+#     python batch_analysis.py numbers.csv --csv-column value --format csv
+#     python batch_analysis.py numbers.txt --properties "Primality,Special Classes"
+# -----------------------------------------------------------------------------
+import os
+import sys
+import csv
+import json
+import argparse
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import number_parser
+import number_analysis
+import prime_table
+import special_numbers
+import property_graph
+
+DEFAULT_CHUNK_SIZE = 256
+# Chunks queued per worker; bounds memory while keeping every core busy
+CHUNKS_PER_WORKER = 4
+# Per-number factorization time limit in batch mode (seconds)
+DEFAULT_FACTOR_TIME_LIMIT = 5.0
+# Special-number recognizers estimated above this (microseconds) are skipped
+SPECIAL_COST_BUDGET = 10000
+
+# -----------------------------------------------------------------------------
+# Input
+# -----------------------------------------------------------------------------
+
+def read_lines(stream):
+    """Yield non-empty, non-comment lines from a text stream."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def read_csv_column(stream, column=0):
+    """Yield one column of a CSV stream; column is an index or a header name."""
+    reader = csv.reader(stream)
+    if isinstance(column, str) and not column.isdigit():
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            column = header.index(column)
+        except ValueError:
+            raise ValueError(f"CSV column '{column}' not found in header.")
+    column = int(column)
+    for row in reader:
+        if len(row) > column and row[column].strip():
+            yield row[column].strip()
+
+def chunked(iterable, size):
+    """Group an iterable into lists of at most size items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# -----------------------------------------------------------------------------
+# Analysis (runs in worker processes)
+# -----------------------------------------------------------------------------
+
+def analyze_value(text, factor=False, factor_time_limit=DEFAULT_FACTOR_TIME_LIMIT, properties=None):
+    """
+    Analyze one input string and return a JSON-serializable record.
+
+    With properties (property_graph node names) only those are evaluated and
+    stored under "values"; the default is the full classify/factor record.
+    """
+    record = {"input": text}
+    try:
+        num = number_parser.parse_number(text)
+        record["type"] = type(num).__name__
+        if properties is not None:
+            ctx = property_graph.PropertyContext(num, text, factor_time_limit)
+            values = dict(ctx.stream(ctx.plan(properties)))
+            record["values"] = {name: property_graph.to_record_value(name, values[name])
+                                for name in properties if name in values}
+            return record
+        exact = number_analysis.to_exact(num)
+        props = number_analysis.classify(exact)
+        record["properties"] = props
+        factors = None
+        if factor and props["Composite"]:
+            factors, remaining = number_analysis.factorize(exact, factor_time_limit)
+            record["factorization"] = number_analysis.format_factorization(factors, remaining)
+            if remaining:
+                factors = None
+        if props["Natural Number"]:
+            special = special_numbers.recognize(exact, prime=props["Prime"], factors=factors,
+                                                max_cost=SPECIAL_COST_BUDGET)
+            record["special"] = [f"{name} {detail}" if detail else name
+                                 for name, value, detail in special if value]
+    except (ValueError, ArithmeticError) as e:
+        # One bad line (e.g. an overflowing float) must not abort the stream
+        record["error"] = str(e) or type(e).__name__
+    return record
+
+def analyze_chunk(lines, factor=False, factor_time_limit=DEFAULT_FACTOR_TIME_LIMIT, properties=None):
+    """Analyze a list of input strings."""
+    return [analyze_value(line, factor, factor_time_limit, properties) for line in lines]
+
+def analyze_stream(values, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, factor=False,
+                   factor_time_limit=DEFAULT_FACTOR_TIME_LIMIT, properties=None):
+    """
+    Yield one record per input value, in input order.
+
+    workers=0 analyzes in this process; otherwise a process pool with the
+    given number of workers (default: all cores) is used.
+    """
+    # Make sure the shared prime table exists before workers open it
+    prime_table.get_default_table()
+    chunks = chunked(values, chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk, factor, factor_time_limit, properties)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(analyze_chunk, chunk, factor, factor_time_limit, properties))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+# -----------------------------------------------------------------------------
+# Output
+# -----------------------------------------------------------------------------
+
+CSV_FIELDS = ["input", "type"] + number_analysis.PROPERTY_NAMES + ["special", "factorization", "error"]
+
+def write_jsonl(records, stream):
+    """Write records as JSON lines, flushing periodically; return the count."""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+        if count % 1000 == 0:
+            stream.flush()
+    stream.flush()
+    return count
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    return str(value)
+
+def write_csv(records, stream, properties=None):
+    """
+    Write records as CSV with one column per property (the requested
+    properties, if any); return the count.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(CSV_FIELDS if properties is None else ["input", "type"] + properties + ["error"])
+    count = 0
+    for record in records:
+        if properties is not None:
+            values = record.get("values", {})
+            writer.writerow([record["input"], record.get("type", "")]
+                            + [_csv_cell(values.get(name)) for name in properties]
+                            + [record.get("error", "")])
+            count += 1
+            if count % 1000 == 0:
+                stream.flush()
+            continue
+        props = record.get("properties", {})
+        writer.writerow(
+            [record["input"], record.get("type", "")]
+            + ["Yes" if props.get(name) else "No" if props else "" for name in number_analysis.PROPERTY_NAMES]
+            + ["; ".join(record.get("special", ())), record.get("factorization", ""), record.get("error", "")]
+        )
+        count += 1
+        if count % 1000 == 0:
+            stream.flush()
+    stream.flush()
+    return count
+
+# -----------------------------------------------------------------------------
+# Command line
+# -----------------------------------------------------------------------------
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Batch number property analysis.")
+    parser.add_argument("input", nargs="?", default="-", help="input file, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout (default)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                        help="output format (default: from the output extension, else jsonl)")
+    parser.add_argument("--csv-column", default=None,
+                        help="read this CSV column (index or header name) instead of whole lines")
+    parser.add_argument("--factor", action="store_true", help="include prime factorizations of composites")
+    parser.add_argument("--properties", default=None,
+                        help="comma-separated properties or property groups to compute instead of "
+                             "the full record, e.g. 'Prime,Divisor Count d(n)' or 'Basic,Special Classes'")
+    parser.add_argument("--factor-time-limit", type=float, default=DEFAULT_FACTOR_TIME_LIMIT,
+                        help="seconds to spend factoring each number")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores, 0 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="numbers per work unit")
+    return parser
+
+def resolve_properties(spec):
+    """Expand a comma-separated list of node and group names into node names."""
+    names = []
+    for item in (part.strip() for part in spec.split(",")):
+        if not item:
+            continue
+        if item in property_graph.GROUPS:
+            expanded = property_graph.names_in_groups([item])
+        elif item in property_graph.PROPERTY_NODES and property_graph.PROPERTY_NODES[item].group:
+            expanded = [item]
+        else:
+            raise ValueError(f"Unknown property '{item}'.")
+        names += [name for name in expanded if name not in names]
+    if not names:
+        raise ValueError("No properties given.")
+    return names
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    properties = None
+    if args.properties is not None:
+        try:
+            properties = resolve_properties(args.properties)
+        except ValueError as e:
+            parser.error(str(e))
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        if args.csv_column is not None:
+            values = read_csv_column(in_stream, args.csv_column)
+        else:
+            values = read_lines(in_stream)
+        records = analyze_stream(values, args.workers, args.chunk_size, args.factor, args.factor_time_limit,
+                                 properties)
+        if fmt == "csv":
+            count = write_csv(records, out_stream, properties)
+        else:
+            count = write_jsonl(records, out_stream)
+        logging.info("Analyzed %d numbers", count)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+import os
+import re
+import math
+import cmath
+import operator
+from collections import namedtuple
+
+import numpy as np
+
+import step_log
+
+# -----------------------------------------------------------------------------
+# Complex arithmetic engine
+# The operations of the Complex Solver tab as a registry that needs no Tk:
+# every operation is an entry in OPERATIONS with its arity, operand kinds,
+# the function that computes it and the text of its equation and steps.
+# apply() dispatches through the table; scripts that run many operations can
+# hoist the lookup with function() and call the (mostly builtin) function
+# directly. solve() is the whole parse -> compute -> describe pipeline the
+# GUI uses.
+#
+# Operands are "complex" (parsed by parse_complex) or "polar" (r<θ, parsed
+# by parse_polar into the two arguments r and θ).
+#
+# Batch mode applies an operation to whole columns of operands: every entry
+# also has a NumPy counterpart that runs as one complex128 ufunc pass, and
+# load_operand / save_batch read and write the columns as CSV, .npy or
+# pasted lists.
+# -----------------------------------------------------------------------------
+
+Operation = namedtuple("Operation", "symbol label operands arity function expression steps batch")
+
+# Registered operations by symbol, in menu order
+OPERATIONS = {}
+
+def register(symbol, label, function, batch, operands=("complex",), expression=None, steps=None):
+    """
+    Register function as the operation symbol and batch as its NumPy
+    version. expression is a format string over the arguments (e.g.
+    '{0} + {1}'; complex numbers print with their own parentheses);
+    steps(log, args, result) adds the detailed calculation steps to a StepLog.
+    """
+    arity = sum(2 if kind == "polar" else 1 for kind in operands)
+    OPERATIONS[symbol] = Operation(symbol, label, tuple(operands), arity, function,
+                                   expression or f"{symbol}{{0}}", steps, batch)
+
+def operation(symbol):
+    """The Operation registered as symbol; ValueError for unknown symbols."""
+    try:
+        return OPERATIONS[symbol]
+    except KeyError:
+        raise ValueError(f"Unknown operation '{symbol}'.")
+
+def function(symbol):
+    """The raw function behind symbol, for calling it in a tight loop."""
+    return operation(symbol).function
+
+def apply(symbol, *args):
+    """Compute the operation symbol on args; math errors become ValueError."""
+    op = operation(symbol)
+    if len(args) != op.arity:
+        raise ValueError(f"{op.label} takes {op.arity} argument{'s' if op.arity != 1 else ''}, not {len(args)}.")
+    try:
+        return op.function(*args)
+    except ZeroDivisionError:
+        raise ValueError("Division by zero.")
+    except OverflowError:
+        raise ValueError(f"{op.label} overflowed.")
+    except ValueError:
+        raise ValueError(f"{op.label} is undefined for {', '.join(format_value(a) for a in args)}.")
+
+# -----------------------------------------------------------------------------
+# Parsing and formatting
+# -----------------------------------------------------------------------------
+
+def parse_complex(text):
+    """Parse 'a+bj', 'a+bi', 'bj' or 'a,b' into a complex number."""
+    s = text.strip()
+    if "," in s:
+        parts = s.split(",")
+        if len(parts) == 2:
+            try:
+                return complex(float(parts[0].strip()), float(parts[1].strip()))
+            except ValueError:
+                pass
+    try:
+        return complex(s.replace(" ", "").replace("i", "j"))
+    except ValueError:
+        raise ValueError("Invalid complex format (try e.g. 2+3j or 2,3).")
+
+def parse_polar(text):
+    """Parse 'r<θ' (θ in radians) into (r, θ)."""
+    parts = text.split("<")
+    if len(parts) != 2:
+        raise ValueError("Please enter the number in polar form r<θ (θ in radians).")
+    try:
+        return float(parts[0].strip()), float(parts[1].strip())
+    except ValueError:
+        raise ValueError(f"Invalid polar form '{text.strip()}' (try e.g. 2<0.785).")
+
+def parse_operands(symbol, texts):
+    """Parse the input strings for symbol into its flat argument tuple."""
+    op = operation(symbol)
+    if len(texts) < len(op.operands):
+        raise ValueError(f"{op.label} needs {len(op.operands)} input{'s' if len(op.operands) != 1 else ''}.")
+    args = []
+    for kind, text in zip(op.operands, texts):
+        if kind == "polar":
+            args.extend(parse_polar(text))
+        else:
+            args.append(parse_complex(text))
+    return tuple(args)
+
+def format_value(value):
+    """Display form of an argument or result; polar pairs as 'r < θ'."""
+    if isinstance(value, tuple):
+        return f"{value[0]} < {value[1]}"
+    return str(value)
+
+def expression(symbol, args):
+    """The operation written out on its arguments, e.g. '(1+2j) * (3-1j)'."""
+    op = operation(symbol)
+    if "polar" in op.operands:
+        return op.expression.format(format_value(args))
+    return op.expression.format(*args)
+
+def equation(symbol, args, result):
+    return f"{expression(symbol, args)} = {format_value(result)}"
+
+# -----------------------------------------------------------------------------
+# Detailed steps
+# -----------------------------------------------------------------------------
+
+def _multiplication_steps(log, args, result):
+    (a, b), (c, d) = (args[0].real, args[0].imag), (args[1].real, args[1].imag)
+    real_part, imag_part = a * c - b * d, a * d + b * c
+    log.add("Using (a+bi) * (c+di) = (ac-bd) + (ad+bc)i")
+    log.add("a = {}, b = {}, c = {}, d = {}", a, b, c, d)
+    log.add("Real part: {}*{} - {}*{} = {}", a, c, b, d, real_part)
+    log.add("Imaginary part: {}*{} + {}*{} = {}", a, d, b, c, imag_part)
+    log.add("Result = {} + {}j = {}", real_part, imag_part, result)
+
+def _division_steps(log, args, result):
+    (a, b), (c, d) = (args[0].real, args[0].imag), (args[1].real, args[1].imag)
+    numerator_real, numerator_imag, denominator = a * c + b * d, b * c - a * d, c * c + d * d
+    log.add("Multiplying numerator and denominator by the conjugate of the denominator")
+    log.add("(a+bi)/(c+di) = [(a+bi)*(c-di)] / [(c+di)*(c-di)]")
+    log.add("a = {}, b = {}, c = {}, d = {}", a, b, c, d)
+    log.add("Numerator: real = {0}*{2} + {1}*{3} = {4}, imaginary = {1}*{2} - {0}*{3} = {5}",
+            a, b, c, d, numerator_real, numerator_imag)
+    log.add("Denominator: {}² + {}² = {}", c, d, denominator)
+    log.add("Result = ({} + {}j) / {} = {}", numerator_real, numerator_imag, denominator, result)
+
+def _power_steps(log, args, result):
+    z, w = args
+    if w.imag == 0 and w.real.is_integer() and 0 < w.real <= 5:
+        # Small integer powers: repeated multiplication
+        log.add("For integer powers, multiplying z1 by itself repeatedly:")
+        value = complex(1, 0)
+        for i in range(int(w.real)):
+            previous, value = value, value * z
+            log.add("Step {}: {} * {} = {}", i + 1, previous, z, value)
+        return
+    r, theta = cmath.polar(z)
+    log.add("Using formula: z^w = e^(w*ln(z))")
+    log.add("Convert {} to polar form: r = {}, θ = {} rad", z, r, theta)
+    log.add("Then, {0}^{1} = e^({1} * ln({0}))", z, w)
+    log.add("Result = {}", result)
+
+def _sqrt_steps(log, args, result):
+    r, theta = cmath.polar(args[0])
+    log.add("Convert to polar form: {} = {}e^({}j)", args[0], r, theta)
+    log.add("Square root: √r * e^(θ/2 * j)")
+    log.add("Result = √{} * e^({}j) = {}", r, theta / 2, result)
+
+def _abs_steps(log, args, result):
+    a, b = args[0].real, args[0].imag
+    log.add("Using formula: |a+bi| = √(a² + b²)")
+    log.add("|{0}+{1}j| = √({0}² + {1}²) = √({2} + {3}) = {4}", a, b, a * a, b * b, result)
+
+def _conjugate_steps(log, args, result):
+    a, b = args[0].real, args[0].imag
+    log.add("Conjugate of {0}+{1}j is {0}-{1}j = {2}", a, b, result)
+
+def _polar_steps(log, args, result):
+    a, b = args[0].real, args[0].imag
+    r, theta = result
+    log.add("For a complex number a+bj, r = √(a²+b²) and θ = atan2(b, a)")
+    log.add("r = √({} + {}) = {}", a * a, b * b, r)
+    log.add("θ = atan2({}, {}) = {} rad ({}°)", b, a, theta, math.degrees(theta))
+
+def _rect_steps(log, args, result):
+    r, theta = args
+    log.add("r = {}, θ = {}", r, theta)
+    log.add("Rectangular form: r*cos(θ) + r*sin(θ)j")
+    log.add("Result = {} + {}j = {}", r * math.cos(theta), r * math.sin(theta), result)
+
+def _exp_steps(log, args, result):
+    a, b = args[0].real, args[0].imag
+    log.add("Using Euler's formula: e^(a+bj) = e^a * (cos(b) + j*sin(b))")
+    log.add("e^{0} * (cos({1}) + j*sin({1}))", a, b)
+    log.add("Result = {} + j*{} = {}", result.real, result.imag, result)
+
+def _log_steps(log, args, result):
+    r, theta = cmath.polar(args[0])
+    log.add("For a complex number in polar form: ln(r*e^(θj)) = ln(r) + θj")
+    log.add("r = {}, θ = {}", r, theta)
+    log.add("Result = ln({}) + {}j = {}", r, theta, result)
+
+# -----------------------------------------------------------------------------
+# Registry
+# -----------------------------------------------------------------------------
+
+def _polar_batch(z):
+    return np.abs(z), np.angle(z)
+
+def _rect_batch(r, theta):
+    out = np.empty(np.broadcast_shapes(r.shape, theta.shape), dtype=np.complex128)
+    np.multiply(r, np.cos(theta), out=out.real)
+    np.multiply(r, np.sin(theta), out=out.imag)
+    return out
+
+BINARY = ("complex", "complex")
+
+register("+", "Addition", operator.add, np.add, BINARY, "{0} + {1}")
+register("-", "Subtraction", operator.sub, np.subtract, BINARY, "{0} - {1}")
+register("*", "Multiplication", operator.mul, np.multiply, BINARY, "{0} * {1}", _multiplication_steps)
+register("/", "Division", operator.truediv, np.divide, BINARY, "{0} / {1}", _division_steps)
+register("^", "Power", operator.pow, np.power, BINARY, "{0} ^ {1}", _power_steps)
+register("sqrt", "Square Root", cmath.sqrt, np.sqrt, expression="√{0}", steps=_sqrt_steps)
+register("abs", "Absolute Value", abs, np.abs, expression="|{0}|", steps=_abs_steps)
+register("conj", "Conjugate", operator.methodcaller("conjugate"), np.conjugate, steps=_conjugate_steps)
+register("polar", "Conversion to Polar Form", cmath.polar, _polar_batch, steps=_polar_steps)
+register("rect", "Conversion to Rectangular Form", cmath.rect, _rect_batch, ("polar",), "rect({0})", _rect_steps)
+register("sin", "Sine", cmath.sin, np.sin)
+register("cos", "Cosine", cmath.cos, np.cos)
+register("tan", "Tangent", cmath.tan, np.tan)
+register("exp", "Exponential", cmath.exp, np.exp, steps=_exp_steps)
+register("log", "Natural Logarithm", cmath.log, np.log, expression="ln{0}", steps=_log_steps)
+
+# -----------------------------------------------------------------------------
+# Full pipeline
+# -----------------------------------------------------------------------------
+
+def calculation_step(op, args):
+    return f"Calculating {op.label.lower()}: {expression(op.symbol, args)}"
+
+def solve(symbol, texts, show_steps=True):
+    """
+    Parse the input strings, compute the operation and describe it. Returns
+    {"symbol", "label", "args", "result", "equation", "steps"}; steps is a
+    StepLog that always records parsing and the calculation, and the detailed
+    derivation when show_steps is set. Raises ValueError for bad input or
+    undefined results.
+    """
+    op = operation(symbol)
+    texts = [t.strip() for t in texts]
+    names = ("first", "second")
+    steps = step_log.StepLog()
+    for index, kind in enumerate(op.operands):
+        if index >= len(texts) or not texts[index]:
+            if index == 0:
+                raise ValueError("Please enter the first complex number.")
+            raise ValueError("Please enter the second complex number for binary operations.")
+        if kind == "polar":
+            steps.add("Parsing polar form: {}", texts[index])
+        else:
+            steps.add("Parsing {} complex number: {}", names[index], texts[index])
+    args = parse_operands(symbol, texts)
+    if "polar" not in op.operands:
+        for i, a in enumerate(args):
+            steps.add("z{} = {}", i + 1, a)
+
+    steps.add(calculation_step, op, args)
+    result = apply(symbol, *args)
+    if show_steps and op.steps is not None:
+        op.steps(steps, args, result)
+    return {"symbol": symbol, "label": op.label, "args": args, "result": result,
+            "equation": equation(symbol, args, result), "steps": steps}
+
+# -----------------------------------------------------------------------------
+# Batch mode
+# -----------------------------------------------------------------------------
+
+# Separators between values in a pasted list
+_LIST_SEPARATOR_RE = re.compile(r"[\s,;]+")
+
+def apply_batch(symbol, *columns):
+    """
+    Apply symbol elementwise to broadcast columns (complex128, or float64 r
+    and θ for polar operands) in one NumPy pass. Undefined or overflowing
+    elements come out as nan / inf instead of raising; polar results are
+    (r, θ) arrays.
+    """
+    op = operation(symbol)
+    if len(columns) != op.arity:
+        raise ValueError(f"{op.label} takes {op.arity} column{'s' if op.arity != 1 else ''}, not {len(columns)}.")
+    arrays = []
+    for kind in op.operands:
+        dtypes = (np.float64, np.float64) if kind == "polar" else (np.complex128,)
+        for dtype in dtypes:
+            arrays.append(np.asarray(columns[len(arrays)], dtype=dtype))
+    try:
+        np.broadcast_shapes(*(a.shape for a in arrays))
+    except ValueError:
+        raise ValueError(f"Column lengths do not match: {', '.join(str(len(a)) for a in arrays if a.ndim)}.")
+    with np.errstate(all="ignore"):
+        return op.batch(*arrays)
+
+def nonfinite_count(result):
+    """Number of result elements that are nan or infinite."""
+    parts = result if isinstance(result, tuple) else (result,)
+    bad = np.zeros(np.shape(parts[0]), dtype=bool)
+    for part in parts:
+        bad |= ~np.isfinite(part)
+    return int(bad.sum())
+
+def _parse_list(text, polar):
+    """Values of a pasted list separated by commas, semicolons or whitespace."""
+    tokens = [t for t in _LIST_SEPARATOR_RE.split(text.strip()) if t]
+    if not tokens:
+        raise ValueError("The list of values is empty.")
+    if polar:
+        pairs = [parse_polar(t) for t in tokens]
+        return np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs])
+    values = []
+    for t in tokens:
+        try:
+            values.append(complex(t.replace("i", "j")))
+        except ValueError:
+            raise ValueError(f"Invalid complex value '{t}' (write e.g. 2+3j without spaces).")
+    return (np.array(values, dtype=np.complex128),)
+
+def _split_columns(array, polar, source):
+    """Operand columns from a loaded array: one complex column or two real ones."""
+    if np.iscomplexobj(array):
+        if polar:
+            raise ValueError(f"{source}: polar operands need two real columns r, θ.")
+        return (array.ravel(),)
+    if array.ndim == 2 and array.shape[1] == 2:
+        if polar:
+            return array[:, 0], array[:, 1]
+        return (array[:, 0] + 1j * array[:, 1],)
+    if array.ndim <= 1 and not polar:
+        return (array.astype(np.complex128).ravel(),)
+    raise ValueError(f"{source}: expected one complex column or two real columns "
+                     f"({'r, θ' if polar else 'real, imaginary'}).")
+
+def _header_rows(path):
+    """Number of leading lines (a header) that do not start with a number."""
+    with open(path) as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if line and (line[0].isdigit() or line[0] in "+-.(" or line.startswith(("nan", "inf"))):
+                return index
+    return 0
+
+def _load_text(path, polar):
+    skip = _header_rows(path)
+    with open(path) as f:
+        for index, line in enumerate(f):
+            if index >= skip and line.strip():
+                fields = line.count(",") + 1
+                break
+        else:
+            raise ValueError(f"{path}: no values found.")
+    try:
+        if fields == 1:
+            array = np.loadtxt(path, dtype=np.complex128, skiprows=skip, ndmin=1)
+        else:
+            array = np.loadtxt(path, dtype=np.float64, delimiter=",", skiprows=skip, ndmin=2)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}")
+    return _split_columns(array, polar, path)
+
+def load_operand(source, polar=False):
+    """
+    Load one operand column from a .npy file, a CSV / text file (one complex
+    value, or real and imaginary parts, per line; r and θ for polar
+    operands) or a pasted list. Returns a tuple of arrays: (z,) or (r, θ).
+    """
+    path = source.strip()
+    if not os.path.isfile(path):
+        return _parse_list(source, polar)
+    if path.lower().endswith(".npy"):
+        return _split_columns(np.load(path, allow_pickle=False), polar, path)
+    return _load_text(path, polar)
+
+def save_batch(path, result):
+    """
+    Write a batch result to path: .npy keeps the array (polar results as
+    (n, 2) r, θ), anything else is CSV with real / imaginary columns.
+    """
+    if isinstance(result, tuple):
+        columns, names = np.column_stack(result), "r,theta"
+    elif np.iscomplexobj(result):
+        columns, names = np.column_stack((result.real, result.imag)), "real,imag"
+    else:
+        columns, names = np.asarray(result)[:, None], "value"
+    if path.lower().endswith(".npy"):
+        np.save(path, columns if isinstance(result, tuple) else result)
+    else:
+        np.savetxt(path, columns, fmt="%.17g", delimiter=",", header=names, comments="")
+    return len(columns)
@@ -0,0 +1,422 @@
+import re
+import cmath
+import keyword
+import functools
+
+import numpy as np
+
+import complex_engine
+import step_log
+
+# -----------------------------------------------------------------------------
+# Compiled complex expressions
+# Expressions such as exp(z1)*conj(z2)/(1+z1^2) are tokenized and parsed
+# once into an AST of tuples, simplified, and compiled into two Python
+# functions: a scalar one calling cmath and a vectorized one calling NumPy
+# ufuncs on complex128 arrays. The same CompiledExpression therefore serves
+# single evaluations, batch columns and plotting.
+#
+# Compilation folds constant subtrees (2*pi*i becomes one constant) and
+# eliminates common subexpressions: the AST is hash-consed, with the operands
+# of + and * in a canonical order, and every distinct subtree becomes one
+# line of straight-line code, so z1^2 in exp(z1^2)/(1+z1^2) is computed once.
+# Compiled expressions are kept in an LRU cache keyed by source text.
+#
+# Grammar (the number parser's, plus names and calls):
+#   expr   := term (('+' | '-') term)*
+#   term   := unary (('*' | '/') unary)*
+#   unary  := ('+' | '-') unary | power
+#   power  := atom (('^' | '**') unary)?
+#   atom   := NUMBER | NAME '(' expr ')' | NAME | '(' expr ')'
+# Names are the functions below, the constants pi, e, i and j, and otherwise
+# variables (z, z1, z2, ...).
+# -----------------------------------------------------------------------------
+
+# Compiled expressions kept in the LRU cache
+EXPRESSION_CACHE_SIZE = 256
+
+_TOKEN_RE = re.compile(r"""
+    (?P<number>(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?[jJiI]?(?![A-Za-z_\d]))
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>\*\*|[-+*/^()])
+  | (?P<space>\s+)
+  | (?P<error>.)
+""", re.VERBOSE)
+
+def _engine_function(symbol):
+    op = complex_engine.operation(symbol)
+    return op.function, op.batch
+
+# name -> (scalar function, vectorized function)
+FUNCTIONS = {name: _engine_function(name)
+             for name in ("sqrt", "abs", "conj", "sin", "cos", "tan", "exp", "log")}
+FUNCTIONS["ln"] = FUNCTIONS["log"]
+FUNCTIONS["re"] = (lambda z: z.real, np.real)
+FUNCTIONS["im"] = (lambda z: z.imag, np.imag)
+FUNCTIONS["arg"] = (cmath.phase, np.angle)
+
+CONSTANTS = {"pi": complex(cmath.pi), "e": complex(cmath.e), "i": 1j, "j": 1j}
+
+# Binary operators as they appear in the generated code
+_PYTHON_OPERATORS = {"+": "+", "-": "-", "*": "*", "/": "/", "^": "**"}
+_COMMUTATIVE = ("+", "*")
+
+# -----------------------------------------------------------------------------
+# Parsing
+# -----------------------------------------------------------------------------
+
+def tokenize(source):
+    """Split source into (kind, text, position) tokens; ValueError on anything else."""
+    tokens = []
+    for m in _TOKEN_RE.finditer(source):
+        kind = m.lastgroup
+        if kind == "space":
+            continue
+        if kind == "error":
+            raise ValueError(f"Unexpected character '{m.group()}' at position {m.start() + 1}.")
+        tokens.append((kind, m.group(), m.start()))
+    return tokens
+
+def _number(text):
+    text = text.replace("_", "")
+    if text[-1] in "jJiI":
+        return complex(0, float(text[:-1]))
+    return complex(float(text))
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, text=None):
+        tok = self.peek()
+        if tok is None:
+            raise ValueError("Unexpected end of expression.")
+        if text is not None and tok[1] != text:
+            raise ValueError(f"Expected '{text}' at position {tok[2] + 1}.")
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Please enter an expression.")
+        node = self.expr()
+        tok = self.peek()
+        if tok is not None:
+            raise ValueError(f"Unexpected '{tok[1]}' at position {tok[2] + 1}.")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() is not None and self.peek()[1] in ("+", "-"):
+            op = self.take()[1]
+            node = (op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() is not None and self.peek()[1] in ("*", "/"):
+            op = self.take()[1]
+            node = (op, node, self.unary())
+        return node
+
+    def unary(self):
+        tok = self.peek()
+        if tok is not None and tok[1] in ("+", "-"):
+            self.take()
+            operand = self.unary()
+            return ("neg", operand) if tok[1] == "-" else operand
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        tok = self.peek()
+        if tok is not None and tok[1] in ("^", "**"):
+            self.take()
+            return ("^", base, self.unary())
+        return base
+
+    def atom(self):
+        kind, text, pos = self.take()
+        if kind == "number":
+            return ("const", _number(text))
+        if kind == "name":
+            nxt = self.peek()
+            if text in FUNCTIONS:
+                if nxt is None or nxt[1] != "(":
+                    raise ValueError(f"Function '{text}' needs an argument in parentheses.")
+                self.take("(")
+                argument = self.expr()
+                self.take(")")
+                return ("call", text, argument)
+            if text in CONSTANTS:
+                return ("const", CONSTANTS[text])
+            if keyword.iskeyword(text):
+                raise ValueError(f"'{text}' cannot be used as a variable.")
+            return ("var", text)
+        if text == "(":
+            node = self.expr()
+            self.take(")")
+            return node
+        raise ValueError(f"Unexpected '{text}' at position {pos + 1}.")
+
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def parse_ast(source):
+    """Tokenize and parse source into an AST (cached per input string)."""
+    return _Parser(tokenize(source)).parse()
+
+# -----------------------------------------------------------------------------
+# Simplification: constant folding and canonical operand order
+# -----------------------------------------------------------------------------
+
+def _evaluate_constant(node):
+    """Scalar value of an operator node whose operands are all constants."""
+    kind = node[0]
+    if kind == "neg":
+        return -node[1][1]
+    if kind == "call":
+        return FUNCTIONS[node[1]][0](node[2][1])
+    a, b = node[1][1], node[2][1]
+    if kind == "+":
+        return a + b
+    if kind == "-":
+        return a - b
+    if kind == "*":
+        return a * b
+    if kind == "/":
+        return a / b
+    return a ** b
+
+def simplify(node):
+    """Fold constant subtrees and order the operands of + and * canonically."""
+    kind = node[0]
+    if kind in ("const", "var"):
+        return node
+    if kind == "neg":
+        node = ("neg", simplify(node[1]))
+        children = [node[1]]
+    elif kind == "call":
+        node = ("call", node[1], simplify(node[2]))
+        children = [node[2]]
+    else:
+        a, b = simplify(node[1]), simplify(node[2])
+        if kind in _COMMUTATIVE and repr(b) < repr(a):
+            a, b = b, a
+        node = (kind, a, b)
+        children = [a, b]
+    if all(child[0] == "const" for child in children):
+        try:
+            return ("const", _evaluate_constant(node))
+        except (ArithmeticError, ValueError):
+            # Left for run time, where scalars raise and arrays give inf / nan
+            pass
+    return node
+
+def _format_constant(value):
+    if isinstance(value, complex) and value.imag == 0:
+        value = value.real
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return str(value)
+
+def unparse(node):
+    """The expression text of a simplified AST (fully parenthesized)."""
+    kind = node[0]
+    if kind == "const":
+        return _format_constant(node[1])
+    if kind == "var":
+        return node[1]
+    if kind == "neg":
+        return f"-({unparse(node[1])})"
+    if kind == "call":
+        return f"{node[1]}({unparse(node[2])})"
+    return f"({unparse(node[1])} {kind} {unparse(node[2])})"
+
+# -----------------------------------------------------------------------------
+# Compilation to straight-line code
+# -----------------------------------------------------------------------------
+
+def _linearize(root):
+    """
+    Number the distinct subtrees of root bottom-up (common subexpressions
+    once). Returns (program, index of root) where program is a list of
+    nodes whose operands are ("ref", k) to earlier entries.
+    """
+    program, index = [], {}
+
+    def visit(node):
+        if node in index:
+            return index[node]
+        kind = node[0]
+        if kind in ("const", "var"):
+            entry = node
+        elif kind == "neg":
+            entry = ("neg", ("ref", visit(node[1])))
+        elif kind == "call":
+            entry = ("call", node[1], ("ref", visit(node[2])))
+        else:
+            entry = (kind, ("ref", visit(node[1])), ("ref", visit(node[2])))
+        index[node] = len(program)
+        program.append(entry)
+        return index[node]
+
+    return program, visit(root)
+
+def _integer_exponent(value):
+    """A real integer exponent as int, so that z^2 takes NumPy's fast integer-power path (else None)."""
+    if value.imag != 0 or not float(value.real).is_integer() or abs(value.real) >= 2 ** 53:
+        return None
+    return int(value.real)
+
+class CompiledExpression:
+    """
+    A parsed, simplified and compiled expression. Call it with the values of
+    its variables (positionally in the order of .variables, or by name):
+    scalars give a scalar result, arrays a complex128 array.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.tree = simplify(parse_ast(source))
+        self.program, self.root = _linearize(self.tree)
+        self.variables = tuple(sorted({e[1] for e in self.program if e[0] == "var"}))
+        self.constant = self.tree[1] if self.tree[0] == "const" else None
+        self.scalar = self._generate(vector=False)
+        self.vector = self._generate(vector=True)
+
+    def _generate(self, vector):
+        """Build the straight-line function with exec on generated code (no user text in it)."""
+        namespace, lines, names, exponents = {}, [], {}, {}
+        params = [f"v{k}" for k in range(len(self.variables))]
+        powers = {entry[2][1] for entry in self.program if entry[0] == "^"}
+        for k, entry in enumerate(self.program):
+            kind = entry[0]
+            if kind == "var":
+                names[k] = params[self.variables.index(entry[1])]
+                continue
+            if kind == "const":
+                # Constants stay complex, so constant subtrees simplify left
+                # unfolded (1/0, 10^400) give inf / nan in the vector code
+                names[k] = f"c{k}"
+                namespace[names[k]] = np.complex128(entry[1]) if vector else complex(entry[1])
+                if k in powers and _integer_exponent(entry[1]) is not None:
+                    exponents[k] = f"n{k}"
+                    namespace[exponents[k]] = _integer_exponent(entry[1])
+                continue
+            if kind == "neg":
+                code = f"-{names[entry[1][1]]}"
+            elif kind == "call":
+                fn = f"f_{entry[1]}"
+                namespace[fn] = FUNCTIONS[entry[1]][1 if vector else 0]
+                code = f"{fn}({names[entry[2][1]]})"
+            else:
+                right = exponents.get(entry[2][1], names[entry[2][1]]) if kind == "^" else names[entry[2][1]]
+                code = f"{names[entry[1][1]]} {_PYTHON_OPERATORS[kind]} {right}"
+            names[k] = f"t{k}"
+            lines.append(f"    t{k} = {code}")
+        lines.append(f"    return {names[self.root]}")
+        exec(f"def compiled({', '.join(params)}):\n" + "\n".join(lines), namespace)
+        return namespace["compiled"]
+
+    def _bind(self, args, kwargs):
+        values = list(args)
+        if len(values) > len(self.variables):
+            raise ValueError(f"The expression has {len(self.variables)} variable(s), got {len(values)} values.")
+        for name in self.variables[len(values):]:
+            if name not in kwargs:
+                raise ValueError(f"Please give a value for {name}.")
+            values.append(kwargs[name])
+        return values
+
+    def evaluate(self, *args, **kwargs):
+        """Scalar evaluation; math errors become ValueError."""
+        values = [complex(v) for v in self._bind(args, kwargs)]
+        try:
+            return self.scalar(*values)
+        except ZeroDivisionError:
+            raise ValueError("Division by zero.")
+        except OverflowError:
+            raise ValueError("The expression overflowed.")
+        except ValueError:
+            raise ValueError("The expression is undefined for these values.")
+
+    def evaluate_batch(self, *args, **kwargs):
+        """Vectorized evaluation over broadcast columns; undefined elements give nan / inf."""
+        values = [np.asarray(v, dtype=np.complex128) for v in self._bind(args, kwargs)]
+        try:
+            shape = np.broadcast_shapes(*(v.shape for v in values))
+        except ValueError:
+            raise ValueError(f"Column lengths do not match: {', '.join(str(len(v)) for v in values if v.ndim)}.")
+        with np.errstate(all="ignore"):
+            result = self.vector(*values)
+        if np.shape(result) != shape:
+            result = np.full(shape, result, dtype=np.complex128)
+        return result
+
+    def __call__(self, *args, **kwargs):
+        values = list(args) + list(kwargs.values())
+        if any(isinstance(v, (np.ndarray, list, tuple)) for v in values):
+            return self.evaluate_batch(*args, **kwargs)
+        return self.evaluate(*args, **kwargs)
+
+    def describe(self):
+        """The compiled program as readable steps, one per distinct subexpression."""
+        steps, names = [], {}
+        for k, entry in enumerate(self.program):
+            kind = entry[0]
+            if kind == "var":
+                names[k] = entry[1]
+                continue
+            if kind == "const":
+                names[k] = _format_constant(entry[1])
+                continue
+            if kind == "neg":
+                text = f"-{names[entry[1][1]]}"
+            elif kind == "call":
+                text = f"{entry[1]}({names[entry[2][1]]})"
+            else:
+                text = f"{names[entry[1][1]]} {kind} {names[entry[2][1]]}"
+            names[k] = f"t{len(steps) + 1}"
+            steps.append(f"{names[k]} = {text}")
+        if not steps:
+            steps.append(f"Result = {names[self.root]}")
+        return steps
+
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile(source):
+    return CompiledExpression(source)
+
+def compile_expression(source):
+    """The CompiledExpression for source, from the LRU cache when possible."""
+    try:
+        return _compile(source.strip())
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply.")
+
+# -----------------------------------------------------------------------------
+# Solver pipeline (mirrors complex_engine.solve)
+# -----------------------------------------------------------------------------
+
+def solve(source, texts, show_steps=True):
+    """
+    Evaluate source with variable values parsed from texts ({name: input
+    string}). Returns the same dict as complex_engine.solve.
+    """
+    expression = compile_expression(source)
+    steps = step_log.StepLog()
+    steps.add("Compiling: {}", source.strip())
+    args = []
+    for name in expression.variables:
+        text = texts.get(name, "").strip()
+        if not text:
+            raise ValueError(f"Please enter a value for {name}.")
+        args.append(complex_engine.parse_complex(text))
+        steps.add("{} = {}", name, args[-1])
+    if show_steps:
+        steps.extend(expression.describe())
+    result = expression.evaluate(*args)
+    return {"symbol": "expression", "label": "Expression", "args": tuple(args), "result": result,
+            "equation": f"{source.strip()} = {complex_engine.format_value(result)}", "steps": steps}
@@ -0,0 +1,517 @@
+import re
+import decimal
+import functools
+from decimal import Decimal
+
+import complex_engine
+import step_log
+
+# -----------------------------------------------------------------------------
+# Arbitrary-precision complex arithmetic
+# The Complex Solver operations on complex numbers whose parts are Decimals,
+# rounded to a chosen number of significant digits instead of float64's ~16.
+# Inputs are parsed exactly ("0.1" is one tenth, not the nearest double).
+#
+# Correct rounding:
+#   * +, -, *, /, conj, abs and integer powers compute the exact rectangular
+#     parts (Decimal +, - and * are exact given enough digits) and round once;
+#   * exp, log, sqrt, sin, cos, tan, polar, rect and general powers run
+#     Ziv's strategy: evaluate with guard digits, and accept the result only
+#     when every value within the error bound rounds to the same digits,
+#     otherwise recompute with twice the guard digits.
+#
+# Speed at 50-100 digits comes from the decimal module's C core (exp, ln and
+# sqrt are libmpdec's, themselves correctly rounded), a cached π reused at
+# every lower precision, and argument reduction: sin / cos reduce modulo π/2
+# with as many extra digits of π as the reduction cancels, then halve the
+# argument before the Taylor series and double back; atan halves its
+# argument the same way before its series.
+# -----------------------------------------------------------------------------
+
+DEFAULT_DIGITS = 50
+MIN_DIGITS = 5
+MAX_DIGITS = 1000
+# First guard digits of Ziv's loop; doubled on every retry
+GUARD_DIGITS = 10
+ZIV_STEPS = 6
+# Kernels are accurate to 10^ERROR_SLACK units in the last working digit
+ERROR_SLACK = 3
+# Halvings before the sin / cos and atan series
+HALVINGS = 8
+# Integer powers are exact while the exact result has at most this many digits
+EXACT_POWER_DIGITS = 20000
+# Arguments of sin / cos beyond 10^MAX_REDUCTION_DIGITS are rejected
+MAX_REDUCTION_DIGITS = 10000
+# exp(x) over- or underflows every Decimal context once |x| >= 10^MAX_POWER_EXPONENT_DIGITS
+MAX_POWER_EXPONENT_DIGITS = 19
+# Digits of the first estimate of w log z in a power
+ROUGH_DIGITS = 20
+# ... and the largest Im(w log z) reduced (log z is taken to that many more digits)
+MAX_POWER_REDUCTION_DIGITS = 1000
+
+_NUMBER = r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_IMAGINARY_RE = re.compile(rf"([+-]?)({_NUMBER})?[ij]")
+_RECTANGULAR_RE = re.compile(rf"([+-]?{_NUMBER})(?:([+-])({_NUMBER})?[ij])?")
+
+@functools.lru_cache(maxsize=None)
+def _context(prec):
+    return decimal.Context(prec=prec, rounding=decimal.ROUND_HALF_EVEN,
+                           Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+# Exact +, - and * (never used for division)
+_EXACT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+_ZERO, _ONE = Decimal(0), Decimal(1)
+
+class PrecisionComplex:
+    """A complex number with Decimal parts, rounded to digits significant digits (None if exact)."""
+    __slots__ = ("real", "imag", "digits")
+
+    def __init__(self, real, imag=_ZERO, digits=None):
+        self.real = real
+        self.imag = imag
+        self.digits = digits
+
+    def __complex__(self):
+        return complex(float(self.real), float(self.imag))
+
+    def __eq__(self, other):
+        if isinstance(other, PrecisionComplex):
+            return self.real == other.real and self.imag == other.imag
+        return NotImplemented
+
+    __hash__ = None
+
+    def __str__(self):
+        imag = format_decimal(self.imag.copy_abs()) + "j"
+        if self.real.is_zero() and not self.real.is_signed():
+            return ("-" if self.imag.is_signed() else "") + imag
+        return f"({format_decimal(self.real)}{'-' if self.imag.is_signed() else '+'}{imag})"
+
+    def __repr__(self):
+        return f"PrecisionComplex({str(self.real)!r}, {str(self.imag)!r}, digits={self.digits})"
+
+def format_decimal(x):
+    """Decimal without trailing zeros; scientific notation only for very large or small values."""
+    if x.is_zero():
+        return "-0" if x.is_signed() else "0"
+    x = x.normalize(_context(len(x.as_tuple().digits)))
+    if x.as_tuple().exponent > 0 and x.adjusted() < 21:
+        return format(x, "f")
+    return str(x)
+
+# -----------------------------------------------------------------------------
+# Parsing
+# -----------------------------------------------------------------------------
+
+def parse_digits(text):
+    """Parse the number of significant digits of the precision mode."""
+    try:
+        digits = int(str(text).strip())
+    except ValueError:
+        raise ValueError(f"Precision must be a number of digits, not '{str(text).strip()}'.")
+    if not MIN_DIGITS <= digits <= MAX_DIGITS:
+        raise ValueError(f"Precision must be between {MIN_DIGITS} and {MAX_DIGITS} digits.")
+    return digits
+
+def parse_complex(text):
+    """Parse 'a+bj', 'a+bi', 'bj', 'a' or 'a,b' exactly into a PrecisionComplex."""
+    s = text.strip().replace(" ", "")
+    if s.startswith("(") and s.endswith(")"):
+        s = s[1:-1]
+    try:
+        if "," in s:
+            real, imag = s.split(",")
+            return PrecisionComplex(Decimal(real), Decimal(imag))
+        m = _IMAGINARY_RE.fullmatch(s)
+        if m:
+            return PrecisionComplex(_ZERO, Decimal(m.group(1) + (m.group(2) or "1")))
+        m = _RECTANGULAR_RE.fullmatch(s)
+        if m:
+            imag = Decimal(m.group(2) + (m.group(3) or "1")) if m.group(2) else _ZERO
+            return PrecisionComplex(Decimal(m.group(1)), imag)
+    except (ValueError, decimal.InvalidOperation):
+        pass
+    raise ValueError("Invalid complex format (try e.g. 2+3j or 2,3).")
+
+def parse_polar(text):
+    """Parse 'r<θ' (θ in radians) exactly into (r, θ)."""
+    parts = text.split("<")
+    if len(parts) != 2:
+        raise ValueError("Please enter the number in polar form r<θ (θ in radians).")
+    try:
+        return Decimal(parts[0].strip()), Decimal(parts[1].strip())
+    except decimal.InvalidOperation:
+        raise ValueError(f"Invalid polar form '{text.strip()}' (try e.g. 2<0.785).")
+
+def parse_operands(symbol, texts):
+    """Parse the input strings for symbol into its flat argument tuple."""
+    op = complex_engine.operation(symbol)
+    args = []
+    for kind, text in zip(op.operands, texts):
+        if kind == "polar":
+            args.extend(parse_polar(text))
+        else:
+            args.append(parse_complex(text))
+    return tuple(args)
+
+# -----------------------------------------------------------------------------
+# Real kernels: results at precision p with a relative error below
+# 10^(ERROR_SLACK - p)
+# -----------------------------------------------------------------------------
+
+def _machin_pi(digits):
+    """π to digits decimals with integers: π = 16 atan(1/5) - 4 atan(1/239)."""
+    scale = 10 ** (digits + 10)
+
+    def arctan_inverse(n):
+        x = total = scale // n
+        n2, k, sign = n * n, 3, -1
+        while x:
+            x //= n2
+            total += sign * (x // k)
+            sign, k = -sign, k + 2
+        return total
+
+    return Decimal(16 * arctan_inverse(5) - 4 * arctan_inverse(239)).scaleb(-(digits + 10), _EXACT)
+
+# Most precise π computed so far, rounded down for lower precisions
+_pi_cache = [0, None]
+
+def _pi(p):
+    if p > _pi_cache[0]:
+        _pi_cache[:] = [p + 10, _machin_pi(p + 10)]
+    return _context(p).plus(_pi_cache[1])
+
+def _sin_cos(x, p):
+    """(sin x, cos x) with relative accuracy, also near the zeros of either."""
+    if x.is_zero():
+        return x, _ONE
+    if x.adjusted() > MAX_REDUCTION_DIGITS:
+        raise ValueError("The argument is too large for trigonometric reduction.")
+    # Reduce to r = x - k π/2, |r| <= π/4; the subtraction cancels about
+    # -log10|r| digits, so retry with that many more digits of π
+    extra = 10
+    while True:
+        with decimal.localcontext(_context(p + max(x.adjusted(), 0) + extra)):
+            half_pi = _pi(p + max(x.adjusted(), 0) + extra) / 2
+            k = (x / half_pi).to_integral_value()
+            r = x - k * half_pi
+        if r.is_zero() or r.adjusted() >= 5 - extra:
+            break
+        extra = 15 - r.adjusted()
+    with decimal.localcontext(_context(p + 5 + HALVINGS)):
+        y = r / 2 ** HALVINGS
+        y2, term, s, n = y * y, y, y, 1
+        eps = abs(y).scaleb(-(p + 5 + HALVINGS))
+        while abs(term) > eps:
+            term = -term * y2 / ((n + 1) * (n + 2))
+            s += term
+            n += 2
+        c = (1 - s * s).sqrt()
+        for _ in range(HALVINGS):
+            s, c = 2 * s * c, 1 - 2 * s * s
+    quadrant = int(k) % 4
+    s, c = ((s, c), (c, s.copy_negate()), (s.copy_negate(), c.copy_negate()), (c.copy_negate(), s))[quadrant]
+    return _context(p).plus(s), _context(p).plus(c)
+
+def _sinh_cosh(x, p):
+    """(sinh x, cosh x); a series for |x| < 1 keeps sinh accurate near zero."""
+    with decimal.localcontext(_context(p + 5)):
+        if abs(x) < 1:
+            x2, term, s, n = x * x, x, x, 1
+            eps = abs(x).scaleb(-(p + 5))
+            while abs(term) > eps:
+                term = term * x2 / ((n + 1) * (n + 2))
+                s += term
+                n += 2
+            c = (1 + s * s).sqrt()
+        else:
+            e = x.exp()
+            s, c = (e - 1 / e) / 2, (e + 1 / e) / 2
+    return _context(p).plus(s), _context(p).plus(c)
+
+def _atan(x, p):
+    if x.is_zero():
+        return x
+    if x.copy_abs() > 1:
+        # atan x = ±π/2 - atan(1/x), at least π/4 in size
+        with decimal.localcontext(_context(p + 5)):
+            return _context(p).plus(_pi(p + 5).copy_sign(x) / 2 - _atan(1 / x, p + 5))
+    with decimal.localcontext(_context(p + 5 + HALVINGS)):
+        # atan x = 2 atan(x / (1 + √(1 + x²))), with no cancellation
+        for _ in range(HALVINGS):
+            x = x / (1 + (1 + x * x).sqrt())
+        x2, term, total, n = x * x, x, x, 1
+        eps = abs(x).scaleb(-(p + 5 + HALVINGS))
+        while abs(term) > eps:
+            term = -term * x2
+            n += 2
+            total += term / n
+        return _context(p).plus(total * 2 ** HALVINGS)
+
+def _atan2(y, x, p):
+    """Argument of x + yi in (-π, π], signed zeros as in cmath.phase."""
+    if x.is_zero() and y.is_zero():
+        return _pi(p).copy_sign(y) if x.is_signed() else _ZERO.copy_sign(y)
+    with decimal.localcontext(_context(p + 5)):
+        if y.copy_abs() <= x.copy_abs():
+            t = _atan(y / x, p + 5)
+            if x.is_signed():
+                t = t - _pi(p + 5) if y.is_signed() else t + _pi(p + 5)
+        else:
+            t = _pi(p + 5).copy_sign(y) / 2 - _atan(x / y, p + 5)
+    return _context(p).plus(t)
+
+def _square_modulus(z):
+    return _EXACT.add(_EXACT.multiply(z.real, z.real), _EXACT.multiply(z.imag, z.imag))
+
+# -----------------------------------------------------------------------------
+# Complex kernels: (real, imag) at working precision p
+# -----------------------------------------------------------------------------
+
+def _exp(z, p):
+    with decimal.localcontext(_context(p + 5)):
+        m = z.real.exp()
+        s, c = _sin_cos(z.imag, p + 5)
+        return m * c, m * s
+
+def _log(z, p):
+    if z.real.is_zero() and z.imag.is_zero():
+        raise ValueError("The logarithm of zero is undefined.")
+    with decimal.localcontext(_context(p + 5)):
+        # ln|z| from the exact |z|², so no cancellation near |z| = 1
+        return _square_modulus(z).ln() / 2, _atan2(z.imag, z.real, p + 5)
+
+def _sqrt(z, p):
+    if z.real.is_zero() and z.imag.is_zero():
+        return _ZERO, z.imag
+    with decimal.localcontext(_context(p + 5)):
+        m = _square_modulus(z).sqrt()
+        if not z.real.is_signed():
+            real = ((m + z.real) / 2).sqrt()
+            return real, z.imag / (2 * real)
+        imag = ((m - z.real) / 2).sqrt().copy_sign(z.imag)
+        return z.imag / (2 * imag), imag
+
+def _sin(z, p):
+    s, c = _sin_cos(z.real, p + 5)
+    sh, ch = _sinh_cosh(z.imag, p + 5)
+    with decimal.localcontext(_context(p + 5)):
+        return s * ch, c * sh
+
+def _cos(z, p):
+    s, c = _sin_cos(z.real, p + 5)
+    sh, ch = _sinh_cosh(z.imag, p + 5)
+    with decimal.localcontext(_context(p + 5)):
+        return c * ch, -s * sh
+
+def _tan(z, p):
+    s, c = _sin_cos(z.real, p + 5)
+    sh, ch = _sinh_cosh(z.imag, p + 5)
+    with decimal.localcontext(_context(p + 5)):
+        # (sin 2a + i sinh 2b) / (cos 2a + cosh 2b), the denominator as 2(cos²a + sinh²b)
+        d = c * c + sh * sh
+        return s * c / d, sh * ch / d
+
+def _times_log(z, w, p):
+    with decimal.localcontext(_context(p + 5)):
+        log_real, log_imag = _log(z, p)
+        return PrecisionComplex(_EXACT.subtract(_EXACT.multiply(w.real, log_real), _EXACT.multiply(w.imag, log_imag)),
+                                _EXACT.add(_EXACT.multiply(w.real, log_imag), _EXACT.multiply(w.imag, log_real)))
+
+def _power(z, w, p):
+    # A rough w log z first: its size is the number of digits exp loses, and
+    # beyond MAX_POWER_EXPONENT_DIGITS the result over- or underflows
+    rough = _times_log(z, w, ROUGH_DIGITS)
+    if not rough.real.is_zero() and rough.real.adjusted() >= MAX_POWER_EXPONENT_DIGITS:
+        if rough.real.is_signed():
+            return _ZERO, _ZERO
+        raise decimal.Overflow
+    if not rough.imag.is_zero() and rough.imag.adjusted() > MAX_POWER_REDUCTION_DIGITS:
+        raise ValueError("The argument is too large for trigonometric reduction.")
+    size = max(x.adjusted() for x in (rough.real, rough.imag, _ONE) if not x.is_zero())
+    t = _times_log(z, w, p + 5 + size + 1)
+    # exp turns the absolute error of w log z into a relative one
+    return _exp(t, p)
+
+def _rect(r, theta, p):
+    s, c = _sin_cos(theta, p + 5)
+    with decimal.localcontext(_context(p + 5)):
+        return r * c, r * s
+
+def _settled(values, digits, p, scale=None):
+    """True when every value rounds to the same digits anywhere within its error bound."""
+    context = _context(digits)
+    for x in values:
+        if x.is_zero():
+            continue
+        error = (x.copy_abs() if scale is None else scale).scaleb(ERROR_SLACK - p, _EXACT)
+        if context.plus(_EXACT.subtract(x, error)) != context.plus(_EXACT.add(x, error)):
+            return False
+    return True
+
+def _ziv(kernel, args, digits, absolute=False):
+    """Round kernel(*args, p) to digits, raising p until the rounding is certain."""
+    guard = GUARD_DIGITS
+    for _ in range(ZIV_STEPS):
+        p = digits + guard
+        values = kernel(*args, p)
+        scale = max(v.copy_abs() for v in values) if absolute else None
+        if _settled(values, digits, p, scale):
+            break
+        guard *= 2
+    context = _context(digits)
+    return tuple(context.plus(v) for v in values)
+
+# -----------------------------------------------------------------------------
+# Operations (symbols as in complex_engine)
+# -----------------------------------------------------------------------------
+
+def _complex(values, digits):
+    return PrecisionComplex(values[0], values[1], digits)
+
+def add(z, w, digits):
+    context = _context(digits)
+    return PrecisionComplex(context.add(z.real, w.real), context.add(z.imag, w.imag), digits)
+
+def subtract(z, w, digits):
+    context = _context(digits)
+    return PrecisionComplex(context.subtract(z.real, w.real), context.subtract(z.imag, w.imag), digits)
+
+def multiply(z, w, digits):
+    context = _context(digits)
+    real = _EXACT.subtract(_EXACT.multiply(z.real, w.real), _EXACT.multiply(z.imag, w.imag))
+    imag = _EXACT.add(_EXACT.multiply(z.real, w.imag), _EXACT.multiply(z.imag, w.real))
+    return PrecisionComplex(context.plus(real), context.plus(imag), digits)
+
+def divide(z, w, digits):
+    denominator = _square_modulus(w)
+    if denominator.is_zero():
+        raise ZeroDivisionError("complex division by zero")
+    context = _context(digits)
+    real = _EXACT.add(_EXACT.multiply(z.real, w.real), _EXACT.multiply(z.imag, w.imag))
+    imag = _EXACT.subtract(_EXACT.multiply(z.imag, w.real), _EXACT.multiply(z.real, w.imag))
+    return PrecisionComplex(context.divide(real, denominator), context.divide(imag, denominator), digits)
+
+def _integer_exponent(w, z):
+    """w as an int when it is a real integer whose exact power stays small enough."""
+    if not w.imag.is_zero() or w.real != w.real.to_integral_value():
+        return None
+    # Checked before int(), which is quadratic in the exponent's digits
+    if w.real.adjusted() > len(str(EXACT_POWER_DIGITS)):
+        return None
+    n = int(w.real)
+    size = max(len(z.real.as_tuple().digits), len(z.imag.as_tuple().digits))
+    return n if abs(n) * size <= EXACT_POWER_DIGITS else None
+
+def power(z, w, digits):
+    """z^w on the principal branch; integer powers exactly, others through exp(w log z)."""
+    zero = z.real.is_zero() and z.imag.is_zero()
+    if w.real.is_zero() and w.imag.is_zero():
+        return PrecisionComplex(_ONE, _ZERO, digits)
+    if zero:
+        if not w.imag.is_zero() or w.real < 0:
+            raise ZeroDivisionError("0 to a negative or complex power")
+        return PrecisionComplex(_ZERO, _ZERO, digits)
+    n = _integer_exponent(w, z)
+    if n is None:
+        return _complex(_ziv(_power, (z, w), digits, absolute=True), digits)
+    result, base, k = PrecisionComplex(_ONE), z, abs(n)
+    while k:
+        if k & 1:
+            result = multiply(result, base, decimal.MAX_PREC)
+        base, k = multiply(base, base, decimal.MAX_PREC), k >> 1
+    if n < 0:
+        return divide(PrecisionComplex(_ONE), result, digits)
+    return PrecisionComplex(_context(digits).plus(result.real), _context(digits).plus(result.imag), digits)
+
+def sqrt(z, digits):
+    return _complex(_ziv(_sqrt, (z,), digits), digits)
+
+def absolute(z, digits):
+    # libmpdec's sqrt of the exact |z|² is correctly rounded
+    return _context(digits).sqrt(_square_modulus(z))
+
+def conjugate(z, digits):
+    context = _context(digits)
+    return PrecisionComplex(context.plus(z.real), context.minus(z.imag), digits)
+
+def polar(z, digits):
+    """(|z|, arg z) each correctly rounded."""
+    return absolute(z, digits), _ziv(lambda p: (_atan2(z.imag, z.real, p),), (), digits)[0]
+
+def degrees(theta, digits):
+    """theta (radians) in degrees, correctly rounded."""
+    return _ziv(lambda p: (_context(p).divide(_EXACT.multiply(theta, 180), _pi(p + 5)),), (), digits)[0]
+
+def rect(r, theta, digits):
+    return _complex(_ziv(_rect, (r, theta), digits), digits)
+
+def sin(z, digits):
+    return _complex(_ziv(_sin, (z,), digits), digits)
+
+def cos(z, digits):
+    return _complex(_ziv(_cos, (z,), digits), digits)
+
+def tan(z, digits):
+    return _complex(_ziv(_tan, (z,), digits), digits)
+
+def exp(z, digits):
+    return _complex(_ziv(_exp, (z,), digits), digits)
+
+def log(z, digits):
+    return _complex(_ziv(_log, (z,), digits), digits)
+
+FUNCTIONS = {"+": add, "-": subtract, "*": multiply, "/": divide, "^": power, "sqrt": sqrt,
+             "abs": absolute, "conj": conjugate, "polar": polar, "rect": rect,
+             "sin": sin, "cos": cos, "tan": tan, "exp": exp, "log": log}
+
+def apply(symbol, *args, digits=DEFAULT_DIGITS):
+    """Compute the operation symbol on args at digits significant digits; errors become ValueError."""
+    op = complex_engine.operation(symbol)
+    if symbol not in FUNCTIONS:
+        raise ValueError(f"{op.label} has no arbitrary-precision version.")
+    try:
+        return FUNCTIONS[symbol](*args, digits)
+    except (ZeroDivisionError, decimal.DivisionByZero, decimal.DivisionUndefined):
+        raise ValueError("Division by zero.")
+    except decimal.Overflow:
+        raise ValueError(f"{op.label} overflowed.")
+    except decimal.InvalidOperation:
+        raise ValueError(f"{op.label} is undefined for {', '.join(complex_engine.format_value(a) for a in args)}.")
+
+# -----------------------------------------------------------------------------
+# Solver pipeline (mirrors complex_engine.solve)
+# -----------------------------------------------------------------------------
+
+def solve(symbol, texts, digits=DEFAULT_DIGITS, show_steps=True):
+    """
+    complex_engine.solve at digits significant digits: the same dict, with
+    PrecisionComplex / Decimal values.
+    """
+    op = complex_engine.operation(symbol)
+    texts = [t.strip() for t in texts]
+    names = ("first", "second")
+    steps = step_log.StepLog()
+    steps.add("Working precision: {} significant digits", digits)
+    for index, kind in enumerate(op.operands):
+        if index >= len(texts) or not texts[index]:
+            if index == 0:
+                raise ValueError("Please enter the first complex number.")
+            raise ValueError("Please enter the second complex number for binary operations.")
+        if kind == "polar":
+            steps.add("Parsing polar form exactly: {}", texts[index])
+        else:
+            steps.add("Parsing {} complex number exactly: {}", names[index], texts[index])
+    args = parse_operands(symbol, texts)
+    if "polar" not in op.operands:
+        for i, a in enumerate(args):
+            steps.add("z{} = {}", i + 1, a)
+
+    steps.add(complex_engine.calculation_step, op, args)
+    result = apply(symbol, *args, digits=digits)
+    if show_steps:
+        steps.add("The result is correctly rounded to {} significant digits", digits)
+    return {"symbol": symbol, "label": op.label, "args": args, "result": result,
+            "equation": complex_engine.equation(symbol, args, result), "steps": steps}
@@ -1,12 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import math
-import cmath
 import logging
 import os
 import ctypes  # Required for setting the taskbar icon on Windows
 from PIL import Image, ImageTk  # For image handling
 
+import complex_engine
+import complex_solver_functions
+import step_view
+
 logging.basicConfig(level=logging.DEBUG)
 
 class ComplexSolverApp:
@@ -117,6 +119,8 @@ class ComplexSolverApp:
         self.style.configure("Header.TLabel", background=c["bg"], foreground=c["fg"], font=("Arial", 14, "bold"))
         self.style.configure("Result.TLabel", background=c["bg"], foreground=c["fg"], font=("Arial", 10))
         self.style.configure("Step.TLabel", background=c["bg"], foreground=c["fg"], font=("Arial", 10, "italic"))
+        if hasattr(self, "step_view"):
+            self.step_view.set_colors(c)
         self.style.configure("Yes.TLabel", background=c["yes_bg"], foreground=c["yes_fg"])
         self.style.configure("No.TLabel", background=c["no_bg"], foreground=c["no_fg"])
         self.style.configure("Operator.TButton", font=("Arial", 12, "bold"), width=5)
@@ -197,16 +201,37 @@ class ComplexSolverApp:
         op_label.grid(row=4, column=0, sticky="w", pady=(10,5))
         self.operation_var = tk.StringVar(value="+")
         op_combo = ttk.Combobox(op_frame, textvariable=self.operation_var, state="readonly",
-                                values=["+", "-", "*", "/", "^", "sqrt", "abs", "conj", "polar", "rect", "sin", "cos", "tan", "exp", "log"])
+                                values=["+", "-", "*", "/", "^", "sqrt", "abs", "conj", "polar", "rect", "sin", "cos", "tan", "exp", "log", "expression"])
         op_combo.grid(row=5, column=0, sticky="w")
         
+        # Free-form expression in z1 / z2 (z is z1), used by the "expression" operation
+        expr_frame = ttk.Frame(op_frame, style="TFrame")
+        expr_frame.grid(row=6, column=0, pady=(10,0), sticky="ew")
+        expr_frame.columnconfigure(1, weight=1)
+        ttk.Label(expr_frame, text="Expression:", style="TLabel").grid(row=0, column=0, padx=(0,10), sticky="w")
+        self.complex_expression_var = tk.StringVar(value="exp(z1)*conj(z2)/(1+z1^2)")
+        ttk.Entry(expr_frame, textvariable=self.complex_expression_var, width=40).grid(row=0, column=1, sticky="ew")
+        
+        # "double" computes with cmath on float64, a digit count with complex_precision
+        precision_frame = ttk.Frame(op_frame, style="TFrame")
+        precision_frame.grid(row=7, column=0, pady=(10,0), sticky="w")
+        ttk.Label(precision_frame, text="Precision (digits):", style="TLabel").grid(row=0, column=0, padx=(0,10), sticky="w")
+        self.complex_precision_var = tk.StringVar(value="double")
+        ttk.Combobox(precision_frame, textvariable=self.complex_precision_var, width=10,
+                     values=["double", "30", "50", "100"]).grid(row=0, column=1, sticky="w")
+        
         solve_btn = ttk.Button(op_frame, text="Solve", command=self.solve_complex)
-        solve_btn.grid(row=6, column=0, pady=(20,0), sticky="w")
+        solve_btn.grid(row=8, column=0, pady=(20,0), sticky="w")
+        
+        # Same operation over whole columns (CSV, .npy or pasted lists)
+        complex_solver_functions.create_complex_batch_frame(self, op_frame, 9)
         
         self.steps_frame = ttk.Frame(self.content_frame, style="TFrame")
         self.steps_frame.grid(row=2, column=0, columnspan=2, pady=(10,20), sticky="nsew")
         steps_header = ttk.Label(self.steps_frame, text="Calculation Steps:", style="Header.TLabel")
         steps_header.pack(anchor="w")
+        self.step_view = step_view.StepView(self.steps_frame, self.get_theme_colors())
+        self.step_view.pack(anchor="w", fill="x")
         
         self.results_frame = ttk.Frame(self.content_frame, style="TFrame")
         self.results_frame.grid(row=3, column=0, columnspan=2, pady=(10,20), sticky="nsew")
@@ -228,18 +253,7 @@ class ComplexSolverApp:
             self.z1_entry.insert(0, self.z1_placeholder_text)
 
     def parse_complex_input(self, input_str):
-        s = input_str.strip()
-        if "," in s:
-            parts = s.split(",")
-            if len(parts) == 2:
-                try:
-                    return complex(float(parts[0].strip()), float(parts[1].strip()))
-                except ValueError:
-                    pass
-        try:
-            return complex(s.replace(" ", ""))
-        except:
-            raise ValueError("Invalid complex format (try e.g. 2+3j or 2,3).")
+        return complex_engine.parse_complex(input_str)
 
     def clear_complex_results(self):
         for w in self.results_frame.winfo_children():
@@ -247,13 +261,14 @@ class ComplexSolverApp:
                 w.destroy()
 
     def clear_steps(self):
-        for w in self.steps_frame.winfo_children():
-            if w != self.steps_frame.winfo_children()[0]:
-                w.destroy()
+        self.step_view.clear()
 
     def add_step(self, text):
-        step_lbl = ttk.Label(self.steps_frame, text=text, style="Step.TLabel")
-        step_lbl.pack(anchor="w")
+        self.step_view.add(text)
+
+    def display_steps(self, log):
+        """Replace the steps with log (a step_log.StepLog)."""
+        self.step_view.set_log(log)
 
     def add_to_history(self, operation_text, equation, result):
         self.history.append((operation_text, equation, result))
@@ -266,173 +281,11 @@ class ComplexSolverApp:
         result_lbl.pack(anchor="w", pady=(5,0))
 
     def solve_complex(self):
-        self.clear_complex_results()
-        self.clear_steps()
-        try:
-            z1_str = self.z1_entry.get().strip()
-            z2_str = self.second_complex_var.get().strip()
-            operation = self.operation_var.get()
-            if z1_str == self.z1_placeholder_text:
-                z1_str = ""
-            if not z1_str:
-                messagebox.showerror("Error", "Please enter the first complex number.")
-                return
-            self.add_step(f"Parsing first complex number: {z1_str}")
-            z1 = self.parse_complex_input(z1_str)
-            self.add_step(f"z1 = {z1}")
-            z2 = None
-            equation = ""
-            operation_text = ""
-            result = None
-            if operation in ['+', '-', '*', '/', '^']:
-                if not z2_str:
-                    messagebox.showerror("Error", "Please enter the second complex number for binary operations.")
-                    return
-                self.add_step(f"Parsing second complex number: {z2_str}")
-                z2 = self.parse_complex_input(z2_str)
-                self.add_step(f"z2 = {z2}")
-                if operation == '+':
-                    self.add_step(f"Calculating: {z1} + {z2}")
-                    result = z1 + z2
-                    operation_text = "Addition"
-                    equation = f"({z1}) + ({z2}) = {result}"
-                elif operation == '-':
-                    self.add_step(f"Calculating: {z1} - {z2}")
-                    result = z1 - z2
-                    operation_text = "Subtraction"
-                    equation = f"({z1}) - ({z2}) = {result}"
-                elif operation == '*':
-                    self.add_step(f"Calculating: {z1} * {z2}")
-                    result = z1 * z2
-                    operation_text = "Multiplication"
-                    equation = f"({z1}) * ({z2}) = {result}"
-                    if self.show_steps_var.get():
-                        a, b = z1.real, z1.imag
-                        c, d = z2.real, z2.imag
-                        self.add_step("Using formula: (a+bi)*(c+di) = (ac - bd) + (ad + bc)i")
-                        self.add_step(f"a = {a}, b = {b}, c = {c}, d = {d}")
-                        self.add_step(f"Real part: {a*c - b*d}")
-                        self.add_step(f"Imaginary part: {a*d + b*c}")
-                elif operation == '/':
-                    if z2 == 0:
-                        messagebox.showerror("Error", "Division by zero.")
-                        return
-                    self.add_step(f"Calculating: {z1} / {z2}")
-                    result = z1 / z2
-                    operation_text = "Division"
-                    equation = f"({z1}) / ({z2}) = {result}"
-                    if self.show_steps_var.get():
-                        a, b = z1.real, z1.imag
-                        c, d = z2.real, z2.imag
-                        self.add_step("Multiplying numerator/denominator by conjugate of denominator")
-                        numerator_real = a*c + b*d
-                        numerator_imag = b*c - a*d
-                        denominator = c*c + d*d
-                        self.add_step(f"Num real={numerator_real}, Num imag={numerator_imag}, Den={denominator}")
-                elif operation == '^':
-                    self.add_step(f"Calculating: {z1} ^ {z2}")
-                    result = z1 ** z2
-                    operation_text = "Power"
-                    equation = f"({z1}) ^ ({z2}) = {result}"
-                    if self.show_steps_var.get():
-                        if z2.imag == 0 and z2.real.is_integer() and 0 < z2.real <= 5:
-                            self.add_step("Multiplying z1 repeatedly:")
-                            power = int(z2.real)
-                            temp = complex(1, 0)
-                            for i in range(power):
-                                temp_prev = temp
-                                temp *= z1
-                                self.add_step(f"Step {i+1}: {temp_prev} * {z1} = {temp}")
-                        else:
-                            r, theta = cmath.polar(z1)
-                            self.add_step("Using formula: z^w = e^(w*ln(z))")
-                            self.add_step(f"Polar form of z1: r = {r}, θ = {theta}")
-            else:
-                if operation == 'sqrt':
-                    self.add_step(f"Calculating sqrt({z1})")
-                    result = cmath.sqrt(z1)
-                    operation_text = "Square Root"
-                    equation = f"sqrt({z1}) = {result}"
-                    if self.show_steps_var.get():
-                        r, theta = cmath.polar(z1)
-                        self.add_step(f"Polar form: r = {r}, θ = {theta}")
-                elif operation == 'abs':
-                    self.add_step(f"Calculating abs({z1})")
-                    result = abs(z1)
-                    operation_text = "Absolute Value"
-                    equation = f"|{z1}| = {result}"
-                elif operation == 'conj':
-                    self.add_step(f"Calculating conjugate of {z1}")
-                    result = z1.conjugate()
-                    operation_text = "Conjugate"
-                    equation = f"conj({z1}) = {result}"
-                elif operation == 'polar':
-                    self.add_step(f"Converting {z1} to polar form")
-                    r, theta = cmath.polar(z1)
-                    result = f"{r} < {theta}"
-                    operation_text = "Conversion to Polar Form"
-                    equation = f"polar({z1}) = {result}"
-                elif operation == 'rect':
-                    self.add_step(f"Converting polar form {z1_str} to rectangular")
-                    parts = z1_str.split('<')
-                    if len(parts) != 2:
-                        messagebox.showerror("Error", "For rect conversion, use format r<theta")
-                        return
-                    r = float(parts[0].strip())
-                    th = float(parts[1].strip())
-                    result = complex(r * math.cos(th), r * math.sin(th))
-                    operation_text = "Conversion to Rectangular Form"
-                    equation = f"rect({z1_str}) = {result}"
-                elif operation == 'sin':
-                    self.add_step(f"Calculating sin({z1})")
-                    result = cmath.sin(z1)
-                    operation_text = "Sine"
-                    equation = f"sin({z1}) = {result}"
-                elif operation == 'cos':
-                    self.add_step(f"Calculating cos({z1})")
-                    result = cmath.cos(z1)
-                    operation_text = "Cosine"
-                    equation = f"cos({z1}) = {result}"
-                elif operation == 'tan':
-                    self.add_step(f"Calculating tan({z1})")
-                    result = cmath.tan(z1)
-                    operation_text = "Tangent"
-                    equation = f"tan({z1}) = {result}"
-                elif operation == 'exp':
-                    self.add_step(f"Calculating exp({z1})")
-                    result = cmath.exp(z1)
-                    operation_text = "Exponential"
-                    equation = f"exp({z1}) = {result}"
-                    if self.show_steps_var.get():
-                        a, b = z1.real, z1.imag
-                        self.add_step(f"Using Euler's formula: e^(a+bj) = e^a*(cos(b)+j*sin(b))")
-                elif operation == 'log':
-                    if z1 == 0:
-                        messagebox.showerror("Error", "Cannot compute logarithm of zero.")
-                        return
-                    self.add_step(f"Calculating log({z1})")
-                    result = cmath.log(z1)
-                    operation_text = "Natural Logarithm"
-                    equation = f"log({z1}) = {result}"
-                    if self.show_steps_var.get():
-                        r, theta = cmath.polar(z1)
-                        self.add_step(f"Polar form: r = {r}, θ = {theta}")
-                else:
-                    messagebox.showerror("Error", "Unknown operation selected.")
-                    return
-            self.display_result(equation)
-            self.add_to_history(operation_text, equation, result)
-            if hasattr(self, 'add_to_visualization') and self.visualize_var.get():
-                if operation in ['+', '-', '*', '/', '^']:
-                    self.add_to_visualization(f"z1 ({operation_text})", z1)
-                    self.add_to_visualization(f"z2 ({operation_text})", z2)
-                self.add_to_visualization(f"Result ({operation_text})", result)
-        except Exception as e:
-            logging.exception("Error during complex solving")
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        # The math lives in complex_engine; this is the thin GUI client
+        complex_solver_functions.solve_complex(self)
 
     def display_complex_results(self, operation_text, equation, result):
-        pass
+        complex_solver_functions.display_complex_results(self, operation_text, equation, result)
 
     # Combined with the second code: create_number_conversion_tab
     def create_number_conversion_tab(self):
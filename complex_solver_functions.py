@@ -1,20 +1,24 @@
 import math
+import time
 import cmath
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import logging
 
+import complex_engine
+import complex_expressions
+import complex_precision
+import background_tasks
+
 # Set up logging for debugging purposes
 logging.basicConfig(level=logging.DEBUG)
 
 def solve_complex(self):
     """
-    Solve complex number operations and update the GUI with the results.
-    
-    This function parses input complex numbers (from GUI variables), determines
-    the selected operation, performs the computation with optional step-by-step 
-    logging, displays the result in both rectangular and polar forms, and adds 
-    the operation to history and (optionally) to the visualization.
+    Solve the selected complex operation with complex_engine (or
+    complex_precision when a digit count is selected) and show the steps,
+    the result in rectangular and polar form, the history entry and
+    (optionally) the points in the visualization.
     """
     # Clear any previous results and steps from the UI
     self.clear_complex_results()
@@ -22,237 +26,60 @@ def solve_complex(self):
     
     try:
         # Retrieve inputs and operation
-        z1_str = self.first_complex_var.get().strip()
+        z1_str = self.z1_entry.get().strip()
+        if z1_str == getattr(self, 'z1_placeholder_text', None):
+            z1_str = ""
         z2_str = self.second_complex_var.get().strip()
         operation = self.operation_var.get()
+        precision = self.complex_precision_var.get().strip().lower()
         
-        if not z1_str:
-            messagebox.showerror("Error", "Please enter the first complex number.")
-            return
-        
-        # Parse first complex number
-        self.add_step(f"Parsing first complex number: {z1_str}")
-        z1 = self.parse_complex_input(z1_str)
-        self.add_step(f"z1 = {z1}")
-        
-        # Initialize variables used in binary operations
-        z2 = None
-        equation = ""
-        operation_text = ""
-        result = None
-        
-        # For binary operations: +, -, *, /, and power (^)
-        if operation in ['+', '-', '*', '/', '^']:
-            if not z2_str:
-                messagebox.showerror("Error", "Please enter the second complex number for binary operations.")
-                return
-            
-            self.add_step(f"Parsing second complex number: {z2_str}")
-            z2 = self.parse_complex_input(z2_str)
-            self.add_step(f"z2 = {z2}")
-            
-            # Perform the selected binary operation
-            if operation == '+':
-                self.add_step(f"Performing addition: {z1} + {z2}")
-                result = z1 + z2
-                operation_text = "Addition"
-                equation = f"({z1}) + ({z2}) = {result}"
-                
-            elif operation == '-':
-                self.add_step(f"Performing subtraction: {z1} - {z2}")
-                result = z1 - z2
-                operation_text = "Subtraction"
-                equation = f"({z1}) - ({z2}) = {result}"
-                
-            elif operation == '*':
-                self.add_step(f"Performing multiplication: {z1} * {z2}")
-                result = z1 * z2
-                operation_text = "Multiplication"
-                equation = f"({z1}) * ({z2}) = {result}"
-                # Provide detailed multiplication steps if enabled
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    c, d = z2.real, z2.imag
-                    self.add_step("Using (a+bi) * (c+di) = (ac-bd) + (ad+bc)i")
-                    self.add_step(f"a = {a}, b = {b}, c = {c}, d = {d}")
-                    real_part = a*c - b*d
-                    imag_part = a*d + b*c
-                    self.add_step(f"Real part: {a}*{c} - {b}*{d} = {real_part}")
-                    self.add_step(f"Imaginary part: {a}*{d} + {b}*{c} = {imag_part}")
-                    self.add_step(f"Result = {real_part} + {imag_part}j = {result}")
-                
-            elif operation == '/':
-                if z2 == 0:
-                    messagebox.showerror("Error", "Division by zero.")
-                    return
-                
-                self.add_step(f"Performing division: {z1} / {z2}")
-                result = z1 / z2
-                operation_text = "Division"
-                equation = f"({z1}) / ({z2}) = {result}"
-                # Detailed division steps if enabled
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    c, d = z2.real, z2.imag
-                    self.add_step("Multiplying numerator and denominator by the conjugate of the denominator")
-                    self.add_step(f"(a+bi)/(c+di) = [(a+bi)*(c-di)] / [(c+di)*(c-di)]")
-                    self.add_step(f"a = {a}, b = {b}, c = {c}, d = {d}")
-                    numerator_real = a*c + b*d
-                    numerator_imag = b*c - a*d
-                    denominator = c*c + d*d
-                    self.add_step(f"Numerator: real = {a}*{c} + {b}*{d} = {numerator_real}, imaginary = {b}*{c} - {a}*{d} = {numerator_imag}")
-                    self.add_step(f"Denominator: {c}² + {d}² = {denominator}")
-                    self.add_step(f"Result = ({numerator_real} + {numerator_imag}j) / {denominator} = {result}")
-                
-            elif operation == '^':
-                self.add_step(f"Calculating power: {z1} ^ {z2}")
-                result = z1 ** z2
-                operation_text = "Power"
-                equation = f"({z1}) ^ ({z2}) = {result}"
-                # Detailed power calculation steps if enabled
-                if self.show_steps_var.get():
-                    # If exponent is an integer and small, show iterative multiplication
-                    if z2.imag == 0 and z2.real.is_integer() and 0 < z2.real <= 5:
-                        self.add_step("For integer powers, multiplying z1 by itself repeatedly:")
-                        power = int(z2.real)
-                        temp = complex(1, 0)
-                        for i in range(power):
-                            temp_prev = temp
-                            temp = temp * z1
-                            self.add_step(f"Step {i+1}: {temp_prev} * {z1} = {temp}")
-                    else:
-                        # General case using the exponential/log form
-                        r, theta = cmath.polar(z1)
-                        self.add_step("Using formula: z^w = e^(w*ln(z))")
-                        self.add_step(f"Convert {z1} to polar form: r = {r}, θ = {theta} rad")
-                        self.add_step(f"Then, {z1}^{z2} = e^({z2} * ln({z1}))")
-                        self.add_step(f"Result = {result}")
-        
-        # For unary operations (operations that require only one input)
+        if operation == "expression":
+            if precision != "double":
+                raise ValueError("Expressions are compiled for double precision; set Precision to 'double'.")
+            solution = complex_expressions.solve(self.complex_expression_var.get(),
+                                                 {"z1": z1_str, "z2": z2_str, "z": z1_str},
+                                                 self.show_steps_var.get())
+        elif precision != "double":
+            solution = complex_precision.solve(operation, [z1_str, z2_str], complex_precision.parse_digits(precision),
+                                               self.show_steps_var.get())
         else:
-            if operation == 'sqrt':
-                self.add_step(f"Calculating square root of {z1}")
-                result = cmath.sqrt(z1)
-                operation_text = "Square Root"
-                equation = f"√({z1}) = {result}"
-                if self.show_steps_var.get():
-                    r, theta = cmath.polar(z1)
-                    self.add_step(f"Convert to polar form: {z1} = {r}e^({theta}j)")
-                    self.add_step("Square root: √r * e^(θ/2 * j)")
-                    self.add_step(f"Result = √{r} * e^({theta/2}j) = {result}")
-            
-            elif operation == 'abs':
-                self.add_step(f"Calculating absolute value (modulus) of {z1}")
-                result = abs(z1)
-                operation_text = "Absolute Value"
-                equation = f"|{z1}| = {result}"
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    self.add_step(f"Using formula: |a+bi| = √(a² + b²)")
-                    self.add_step(f"|{a}+{b}j| = √({a}² + {b}²) = √({a*a} + {b*b}) = {result}")
-            
-            elif operation == 'conj':
-                self.add_step(f"Calculating conjugate of {z1}")
-                result = z1.conjugate()
-                operation_text = "Conjugate"
-                equation = f"conj({z1}) = {result}"
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    self.add_step(f"Conjugate of {a}+{b}j is {a}-{b}j = {result}")
-            
-            elif operation == 'polar':
-                self.add_step(f"Converting {z1} to polar form")
-                r, theta = cmath.polar(z1)
-                result = f"{r} < {theta}"
-                operation_text = "Conversion to Polar Form"
-                equation = f"polar({z1}) = {result} (r < θ, θ in radians)"
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    self.add_step(f"For a complex number {a}+{b}j, r = √(a²+b²) and θ = atan2(b, a)")
-                    self.add_step(f"r = √({a*a} + {b*b}) = {r}")
-                    self.add_step(f"θ = atan2({b}, {a}) = {theta} rad ({math.degrees(theta)}°)")
-            
-            elif operation == 'rect':
-                # Convert from polar to rectangular form.
-                polar_form = self.parse_polar_form(z1_str)
-                if polar_form:
-                    self.add_step(f"Converting polar form {z1_str} to rectangular form")
-                    result = polar_form
-                    operation_text = "Conversion to Rectangular Form"
-                    equation = f"rect({z1_str}) = {result}"
-                    if self.show_steps_var.get():
-                        parts = z1_str.split('<')
-                        r = float(parts[0].strip())
-                        theta = float(parts[1].strip())
-                        self.add_step(f"r = {r}, θ = {theta}")
-                        self.add_step(f"Rectangular form: r*cos(θ) + r*sin(θ)j")
-                        self.add_step(f"Result = {r*math.cos(theta)} + {r*math.sin(theta)}j = {result}")
-                else:
-                    messagebox.showerror("Error", "For rect operation, please enter z1 in polar form (r<θ).")
-                    return
-            
-            elif operation == 'sin':
-                self.add_step(f"Calculating sine of {z1}")
-                result = cmath.sin(z1)
-                operation_text = "Sine"
-                equation = f"sin({z1}) = {result}"
-            
-            elif operation == 'cos':
-                self.add_step(f"Calculating cosine of {z1}")
-                result = cmath.cos(z1)
-                operation_text = "Cosine"
-                equation = f"cos({z1}) = {result}"
-            
-            elif operation == 'tan':
-                self.add_step(f"Calculating tangent of {z1}")
-                result = cmath.tan(z1)
-                operation_text = "Tangent"
-                equation = f"tan({z1}) = {result}"
-            
-            elif operation == 'exp':
-                self.add_step(f"Calculating exponential of {z1}")
-                result = cmath.exp(z1)
-                operation_text = "Exponential"
-                equation = f"exp({z1}) = {result}"
-                if self.show_steps_var.get():
-                    a, b = z1.real, z1.imag
-                    self.add_step(f"Using Euler's formula: e^(a+bj) = e^a * (cos(b) + j*sin(b))")
-                    self.add_step(f"e^{a} * (cos({b}) + j*sin({b}))")
-                    self.add_step(f"Result = {math.exp(a)*math.cos(b)} + j*{math.exp(a)*math.sin(b)} = {result}")
-            
-            elif operation == 'log':
-                if z1 == 0:
-                    messagebox.showerror("Error", "Cannot compute logarithm of zero.")
-                    return
-                self.add_step(f"Calculating natural logarithm of {z1}")
-                result = cmath.log(z1)
-                operation_text = "Natural Logarithm"
-                equation = f"ln({z1}) = {result}"
-                if self.show_steps_var.get():
-                    r, theta = cmath.polar(z1)
-                    self.add_step("For a complex number in polar form: ln(r*e^(θj)) = ln(r) + θj")
-                    self.add_step(f"r = {r}, θ = {theta}")
-                    self.add_step(f"Result = ln({r}) + {theta}j = {result}")
-            else:
-                messagebox.showerror("Error", "Unknown operation selected.")
-                return
-        
-        # Display the results in the GUI
-        display_complex_results(self, operation_text, equation, result)
-        
-        # Add operation to history
-        self.add_to_history(operation_text, equation, result)
-        
-        # Optionally add operands and result to the visualization
-        if hasattr(self, 'add_to_visualization') and self.visualize_var.get():
-            if operation in ['+', '-', '*', '/', '^']:
-                self.add_to_visualization(f"z1 ({operation_text})", z1)
-                self.add_to_visualization(f"z2 ({operation_text})", z2)
-            self.add_to_visualization(f"Result ({operation_text})", result)
-    
+            solution = complex_engine.solve(operation, [z1_str, z2_str], self.show_steps_var.get())
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
     except Exception as e:
         logging.exception("Error during complex solving")
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        return
+    
+    self.display_steps(solution["steps"])
+    
+    operation_text, equation, result = solution["label"], solution["equation"], solution["result"]
+    display_complex_results(self, operation_text, equation, result)
+    self.add_to_history(operation_text, equation, result)
+    
+    # Optionally add operands and result to the visualization
+    if hasattr(self, 'add_to_visualization') and self.visualize_var.get():
+        if operation == "expression":
+            names = complex_expressions.compile_expression(self.complex_expression_var.get()).variables
+            for name, value in zip(names, solution["args"]):
+                self.add_to_visualization(f"{name} ({operation_text})", value)
+        elif complex_engine.operation(operation).operands == complex_engine.BINARY:
+            z1, z2 = solution["args"]
+            self.add_to_visualization(f"z1 ({operation_text})", complex(z1))
+            self.add_to_visualization(f"z2 ({operation_text})", complex(z2))
+        if isinstance(result, (complex, complex_precision.PrecisionComplex)):
+            self.add_to_visualization(f"Result ({operation_text})", complex(result))
+
+def complex_result_texts(result):
+    """(rectangular form, modulus, argument, argument in degrees) of a result as strings."""
+    if isinstance(result, complex_precision.PrecisionComplex):
+        r, theta = complex_precision.polar(result, result.digits)
+        return (f"{complex_precision.format_decimal(result.real)} + {complex_precision.format_decimal(result.imag)}j",
+                complex_precision.format_decimal(r), complex_precision.format_decimal(theta),
+                complex_precision.format_decimal(complex_precision.degrees(theta, result.digits)))
+    r, theta = cmath.polar(result)
+    return f"{result.real} + {result.imag}j", str(r), str(theta), str(math.degrees(theta))
 
 def display_complex_results(self, operation_text, equation, result):
     """
@@ -261,54 +88,193 @@ def display_complex_results(self, operation_text, equation, result):
     For complex results, both rectangular and polar forms are shown.
     For non-complex (real) results, a single value is displayed.
     """
-    # Clear previous results (if any)
-    for widget in self.complex_results_frame.winfo_children():
-        widget.destroy()
+    # Results go in a gridded frame below the packed "Result:" header
+    self.clear_complex_results()
+    frame = ttk.Frame(self.results_frame, style="TFrame")
+    frame.pack(anchor="w", fill="x")
     
     # Display header and equation
-    results_header = ttk.Label(self.complex_results_frame, text=f"Complex {operation_text} Result:", 
+    results_header = ttk.Label(frame, text=f"Complex {operation_text} Result:", 
                                style="Header.TLabel")
     results_header.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky="w")
     
-    equation_label = ttk.Label(self.complex_results_frame, text=equation, style="TLabel", font=("Arial", 12))
+    equation_label = ttk.Label(frame, text=equation, style="TLabel", font=("Arial", 12), wraplength=650)
     equation_label.grid(row=1, column=0, columnspan=2, pady=(0, 10), sticky="w")
     
     # Display results based on type
-    if isinstance(result, complex):
-        # Rectangular form
-        rect_label = ttk.Label(self.complex_results_frame, text="Rectangular form:", style="TLabel")
-        rect_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
-        rect_result = ttk.Label(self.complex_results_frame, text=f"{result.real} + {result.imag}j", 
-                                  style="Result.TLabel", font=("Arial", 12))
-        rect_result.grid(row=2, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
-        
-        # Polar form
-        r, theta = cmath.polar(result)
-        polar_label = ttk.Label(self.complex_results_frame, text="Polar form:", style="TLabel")
-        polar_label.grid(row=3, column=0, sticky="w", pady=(5, 0))
-        polar_result = ttk.Label(self.complex_results_frame, 
-                                 text=f"{r} < {theta} rad (≈ {math.degrees(theta)}°)", 
-                                 style="Result.TLabel", font=("Arial", 12))
-        polar_result.grid(row=3, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
-        
-        # Modulus
-        mod_label = ttk.Label(self.complex_results_frame, text="Modulus:", style="TLabel")
-        mod_label.grid(row=4, column=0, sticky="w", pady=(5, 0))
-        mod_result = ttk.Label(self.complex_results_frame, text=f"{abs(result)}", 
-                               style="Result.TLabel", font=("Arial", 12))
-        mod_result.grid(row=4, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
-        
-        # Argument
-        arg_label = ttk.Label(self.complex_results_frame, text="Argument:", style="TLabel")
-        arg_label.grid(row=5, column=0, sticky="w", pady=(5, 0))
-        arg_result = ttk.Label(self.complex_results_frame, 
-                               text=f"{theta} rad (≈ {math.degrees(theta)}°)", 
-                               style="Result.TLabel", font=("Arial", 12))
-        arg_result.grid(row=5, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
+    if isinstance(result, (complex, complex_precision.PrecisionComplex)):
+        rect_text, r, theta, degrees = complex_result_texts(result)
+        rows = [("Rectangular form:", rect_text),
+                ("Polar form:", f"{r} < {theta} rad (≈ {degrees}°)"),
+                ("Modulus:", r),
+                ("Argument:", f"{theta} rad (≈ {degrees}°)")]
+        for row, (name, text) in enumerate(rows, start=2):
+            ttk.Label(frame, text=name, style="TLabel").grid(row=row, column=0, sticky="nw", pady=(5, 0))
+            ttk.Label(frame, text=text, style="Result.TLabel", font=("Arial", 12), wraplength=550).grid(
+                row=row, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
     else:
-        # For real results (e.g. absolute value)
-        value_label = ttk.Label(self.complex_results_frame, text="Result:", style="TLabel")
+        # For real results (e.g. absolute value) and polar pairs
+        value_label = ttk.Label(frame, text="Result:", style="TLabel")
         value_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
-        value_result = ttk.Label(self.complex_results_frame, text=f"{result}", 
-                                 style="Result.TLabel", font=("Arial", 12))
+        value_result = ttk.Label(frame, text=complex_engine.format_value(result), 
+                                 style="Result.TLabel", font=("Arial", 12), wraplength=550)
         value_result.grid(row=2, column=1, sticky="w", pady=(5, 0), padx=(10, 0))
+
+# -----------------------------------------------------------------------------
+# Batch mode: the selected operation over whole columns of operands
+# -----------------------------------------------------------------------------
+
+# Results listed in the batch summary
+BATCH_PREVIEW_ROWS = 10
+
+BATCH_FILE_TYPES = [("CSV files", "*.csv"), ("NumPy arrays", "*.npy"), ("Text files", "*.txt"), ("All files", "*.*")]
+
+def create_complex_batch_frame(self, parent, row):
+    """Batch mode controls: z1 / z2 sources (file path or pasted list), run and save."""
+    batch_frame = ttk.LabelFrame(parent, text="Batch Mode (columns of operands)", padding="10")
+    batch_frame.grid(row=row, column=0, pady=(20, 0), sticky="ew")
+    batch_frame.columnconfigure(1, weight=1)
+    
+    self.complex_batch_vars = []
+    for i, name in enumerate(("z1", "z2")):
+        ttk.Label(batch_frame, text=f"{name} values (file or list):", style="TLabel").grid(
+            row=i, column=0, padx=(0, 10), pady=(0, 5), sticky="w")
+        var = tk.StringVar()
+        ttk.Entry(batch_frame, textvariable=var, width=40).grid(row=i, column=1, pady=(0, 5), sticky="ew")
+        ttk.Button(batch_frame, text="Browse…", command=lambda v=var: browse_complex_batch_file(self, v)).grid(
+            row=i, column=2, padx=(10, 0), pady=(0, 5))
+        self.complex_batch_vars.append(var)
+    
+    buttons = ttk.Frame(batch_frame, style="TFrame")
+    buttons.grid(row=2, column=0, columnspan=3, pady=(5, 0), sticky="w")
+    ttk.Button(buttons, text="Run Batch", command=lambda: run_complex_batch(self)).grid(row=0, column=0, padx=(0, 10))
+    ttk.Button(buttons, text="Save Results…", command=lambda: save_complex_batch(self)).grid(row=0, column=1, padx=(0, 10))
+    self.complex_batch_status_var = tk.StringVar()
+    ttk.Label(buttons, textvariable=self.complex_batch_status_var, style="TLabel").grid(row=0, column=2, sticky="w")
+    
+    ttk.Label(batch_frame, style="TLabel",
+              text="Lists: values separated by commas or spaces (2+3j, r<θ for rect). "
+                   "Files: .npy, or CSV with one complex value or 'real,imag' per line.",
+              wraplength=550).grid(row=3, column=0, columnspan=3, pady=(5, 0), sticky="w")
+    self.complex_batch_result = None
+    self.complex_batch_runner = background_tasks.TkTaskRunner(self.root)
+
+def browse_complex_batch_file(self, var):
+    path = filedialog.askopenfilename(filetypes=BATCH_FILE_TYPES, title="Load Operand Column")
+    if path:
+        var.set(path)
+
+# Batch column feeding each expression variable (z is an alias of z1)
+EXPRESSION_BATCH_COLUMNS = {"z1": 0, "z": 0, "z2": 1}
+
+def compute_expression_batch(task, source, sources):
+    """Compile source and evaluate it over the z1 / z2 columns (worker side)."""
+    expression = complex_expressions.compile_expression(source)
+    if not expression.variables:
+        raise ValueError("A batch expression needs z1 or z2.")
+    columns = {}
+    for name in expression.variables:
+        if name not in EXPRESSION_BATCH_COLUMNS:
+            raise ValueError(f"Batch expressions can only use z1, z2 and z, not {name}.")
+        index = EXPRESSION_BATCH_COLUMNS[name]
+        if index not in columns:
+            if not sources[index].strip():
+                raise ValueError(f"Please enter or load the z{index + 1} values.")
+            task.report(f"Loading z{index + 1}")
+            columns[index], = complex_engine.load_operand(sources[index])
+            task.check_cancelled()
+    task.report("Computing")
+    started = time.perf_counter()
+    result = expression.evaluate_batch(*(columns[EXPRESSION_BATCH_COLUMNS[name]] for name in expression.variables))
+    seconds = time.perf_counter() - started
+    return {"operation": "expression", "label": source.strip(), "result": result, "seconds": seconds,
+            "nonfinite": complex_engine.nonfinite_count(result)}
+
+def compute_complex_batch(task, operation, sources):
+    """Load the operand columns and apply operation to them (worker side)."""
+    op = complex_engine.operation(operation)
+    columns = []
+    for kind, source, name in zip(op.operands, sources, ("z1", "z2")):
+        if not source.strip():
+            raise ValueError(f"Please enter or load the {name} values.")
+        task.report(f"Loading {name}")
+        columns.extend(complex_engine.load_operand(source, polar=kind == "polar"))
+        task.check_cancelled()
+    task.report("Computing")
+    started = time.perf_counter()
+    result = complex_engine.apply_batch(operation, *columns)
+    seconds = time.perf_counter() - started
+    return {"operation": operation, "label": op.label, "result": result, "seconds": seconds,
+            "nonfinite": complex_engine.nonfinite_count(result)}
+
+def run_complex_batch(self):
+    """Run the selected operation over the batch columns on a background thread."""
+    operation = self.operation_var.get()
+    sources = [var.get() for var in self.complex_batch_vars]
+    if operation == "expression":
+        work, argument = compute_expression_batch, self.complex_expression_var.get()
+    else:
+        work, argument = compute_complex_batch, operation
+    
+    def on_done(result):
+        self.complex_batch_result = result
+        self.complex_batch_status_var.set(f"Done in {result['seconds']:.3f} s")
+        display_complex_batch(self, result)
+    
+    def on_error(e):
+        self.complex_batch_status_var.set("")
+        if isinstance(e, ValueError):
+            messagebox.showerror("Error", str(e))
+        else:
+            logging.error("Error during complex batch", exc_info=e)
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    
+    self.complex_batch_status_var.set("Starting")
+    self.complex_batch_runner.submit(work, argument, sources,
+                                     on_done=on_done, on_error=on_error,
+                                     on_progress=self.complex_batch_status_var.set)
+
+def display_complex_batch(self, result):
+    """Summarize a batch result: size, timing, non-finite count and the first values."""
+    self.clear_complex_results()
+    self.clear_steps()
+    frame = ttk.Frame(self.results_frame, style="TFrame")
+    frame.pack(anchor="w", fill="x")
+    
+    values = result["result"]
+    count = len(values[0]) if isinstance(values, tuple) else values.size
+    ttk.Label(frame, text=f"Batch {result['label']}: {count:,} results", style="Header.TLabel").grid(
+        row=0, column=0, columnspan=2, pady=(0, 10), sticky="w")
+    rows = [("Compute time", f"{result['seconds'] * 1000:.1f} ms"),
+            ("Non-finite results", f"{result['nonfinite']:,}")]
+    for i in range(min(count, BATCH_PREVIEW_ROWS)):
+        value = (values[0][i], values[1][i]) if isinstance(values, tuple) else values[i]
+        rows.append((f"[{i}]", complex_engine.format_value(value)))
+    if count > BATCH_PREVIEW_ROWS:
+        rows.append(("…", f"{count - BATCH_PREVIEW_ROWS:,} more (use Save Results…)"))
+    for row, (name, text) in enumerate(rows, start=1):
+        ttk.Label(frame, text=f"{name}:", style="TLabel").grid(row=row, column=0, sticky="w", pady=(2, 0))
+        ttk.Label(frame, text=text, style="Result.TLabel").grid(row=row, column=1, sticky="w", pady=(2, 0), padx=(10, 0))
+
+def save_complex_batch(self):
+    """Write the last batch result to CSV or .npy on a background thread."""
+    result = getattr(self, 'complex_batch_result', None)
+    if result is None:
+        messagebox.showinfo("Save Results", "Run a batch first.")
+        return
+    path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=BATCH_FILE_TYPES[:2],
+                                        title="Save Batch Results")
+    if not path:
+        return
+    
+    def on_done(count):
+        self.complex_batch_status_var.set(f"Saved {count:,} rows")
+        messagebox.showinfo("Save Results", f"{count:,} results saved to {path}")
+    
+    def on_error(e):
+        self.complex_batch_status_var.set("")
+        messagebox.showerror("Save Error", str(e))
+    
+    self.complex_batch_status_var.set("Saving")
+    self.complex_batch_runner.submit(lambda task: complex_engine.save_batch(path, result["result"]),
+                                     on_done=on_done, on_error=on_error)
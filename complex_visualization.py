@@ -9,6 +9,8 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 from matplotlib.figure import Figure
 import logging
 
+import complex_expressions
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 
@@ -111,12 +113,24 @@ def create_visualization_tab(self):
     add_manual_button = ttk.Button(manual_frame, text="Add", command=self.add_manual_complex)
     add_manual_button.grid(row=0, column=1)
     
+    # Image of the unit circle under an expression in z
+    curve_label = ttk.Label(controls_frame, text="Plot f(z) for |z| = 1:", style="TLabel", font=("Arial", 10, "bold"))
+    curve_label.grid(row=7, column=0, sticky="w", pady=(20, 5))
+    
+    curve_frame = ttk.Frame(controls_frame, style="TFrame")
+    curve_frame.grid(row=8, column=0, sticky="ew")
+    self.curve_expression_var = tk.StringVar(value="z^2 + 1/z")
+    curve_entry = ttk.Entry(curve_frame, textvariable=self.curve_expression_var, width=15)
+    curve_entry.grid(row=0, column=0, padx=(0, 5))
+    plot_curve_button = ttk.Button(curve_frame, text="Plot", command=self.add_expression_curve)
+    plot_curve_button.grid(row=0, column=1)
+    
     # Clear and Save Buttons
     clear_button = ttk.Button(controls_frame, text="Clear All Points", command=self.clear_visualization)
-    clear_button.grid(row=7, column=0, sticky="ew", pady=(20, 0))
+    clear_button.grid(row=9, column=0, sticky="ew", pady=(20, 0))
     
     save_plot_button = ttk.Button(controls_frame, text="Save Plot as Image", command=self.save_plot)
-    save_plot_button.grid(row=8, column=0, sticky="ew", pady=(10, 0))
+    save_plot_button.grid(row=10, column=0, sticky="ew", pady=(10, 0))
     
     # Plot Area Frame
     self.plot_frame = ttk.Frame(vis_frame, style="TFrame")
@@ -147,6 +161,7 @@ def create_visualization_tab(self):
     
     # Initialize storage for complex numbers and configure a color palette.
     self.complex_numbers = {}  # Dictionary mapping label -> (complex number, color)
+    self.complex_curves = {}  # Dictionary mapping label -> (array of points, color)
     self.colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
                    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
     self.color_index = 0
@@ -207,10 +222,17 @@ def update_plot(self):
             self.plot.arrow(0, 0, number.real, number.imag, 
                             head_width=0.1, head_length=0.1, fc=color, ec=color, alpha=0.6)
     
-    # Auto-adjust axis limits to ensure all points are visible.
-    if self.complex_numbers:
-        real_values = [z.real for _, (z, _) in self.complex_numbers.items()]
-        imag_values = [z.imag for _, (z, _) in self.complex_numbers.items()]
+    # Plot each stored curve (non-finite samples break the line).
+    curve_points = []
+    for label, (values, color) in self.complex_curves.items():
+        self.plot.plot(values.real, values.imag, color=color, linewidth=1.5, zorder=4)
+        curve_points.append(values[np.isfinite(values)])
+    
+    # Auto-adjust axis limits to ensure all points and curves are visible.
+    points = np.concatenate([np.array([z for z, _ in self.complex_numbers.values()], dtype=complex)] + curve_points)
+    if points.size:
+        real_values = [points.real.min(), points.real.max()]
+        imag_values = [points.imag.min(), points.imag.max()]
         if len(real_values) > 0 and len(imag_values) > 0:
             real_range = max(real_values) - min(real_values)
             imag_range = max(imag_values) - min(imag_values)
@@ -239,6 +261,33 @@ def add_to_visualization(self, label, complex_num):
         self.notebook.select(1)
     self.update_plot()
 
+# Samples along the unit circle for expression curves
+CURVE_SAMPLES = 720
+
+def add_expression_curve(self):
+    """Plot the image of the unit circle under the expression in z (vectorized evaluation)."""
+    try:
+        source = self.curve_expression_var.get().strip()
+        if not source:
+            return
+        expression = complex_expressions.compile_expression(source)
+        if len(expression.variables) > 1:
+            raise ValueError(f"Curves need an expression in one variable, not {', '.join(expression.variables)}.")
+        circle = np.exp(1j * np.linspace(0, 2 * np.pi, CURVE_SAMPLES + 1))
+        values = expression.evaluate_batch(*[circle] * len(expression.variables))
+        if not np.isfinite(values).any():
+            raise ValueError("The expression is undefined on the whole unit circle.")
+        color = self.colors[self.color_index % len(self.colors)]
+        self.color_index += 1
+        self.complex_curves[f"f(z) = {source}"] = (values, color)
+        self.update_legend()
+        self.update_plot()
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+    except Exception as e:
+        logging.exception("Unexpected error in add_expression_curve")
+        messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
 def update_legend(self):
     """Update the legend to display all added complex numbers."""
     # Clear all legend entries except the header.
@@ -261,6 +310,13 @@ def update_legend(self):
         text_label = ttk.Label(legend_entry_frame, text=text, style="TLabel")
         text_label.pack(side="left")
         row += 1
+    for label, (values, color) in self.complex_curves.items():
+        legend_entry_frame = ttk.Frame(self.legend_frame, style="TFrame")
+        legend_entry_frame.grid(row=row, column=0, columnspan=2, sticky="w", padx=10, pady=2)
+        color_indicator = tk.Canvas(legend_entry_frame, width=15, height=3, bg=color, highlightthickness=0)
+        color_indicator.pack(side="left", padx=(0,5))
+        ttk.Label(legend_entry_frame, text=label, style="TLabel").pack(side="left")
+        row += 1
 
 def add_manual_complex(self):
     """Add a manually entered complex number to the visualization."""
@@ -283,8 +339,9 @@ def add_manual_complex(self):
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
 def clear_visualization(self):
-    """Clear all complex numbers from the visualization."""
+    """Clear all complex numbers and curves from the visualization."""
     self.complex_numbers = {}
+    self.complex_curves = {}
     self.color_index = 0
     self.update_legend()
     self.update_plot()
@@ -0,0 +1,381 @@
+import math
+import decimal
+import fractions
+from collections import namedtuple
+
+# -----------------------------------------------------------------------------
+# Continued fractions
+# Partial quotients are streamed lazily from exact input: int, Fraction,
+# Decimal, decimal strings such as "3.14159", floats (taken at their exact
+# binary value) and quadratic irrationals (P + √D)/Q. Convergents and
+# semiconvergents are built from any stream of terms, so the best rational
+# approximation under a denominator bound N costs O(log N) terms.
+#
+# Quadratic irrationals have eventually periodic expansions; the period is
+# found exactly by watching the (P, Q) state of the expansion repeat.
+#
+# Float results of the number parser (non-integer powers) are approximate.
+# They are treated as the interval of values within FLOAT_RELATIVE_ERROR of
+# the float: only the partial quotients shared by the whole interval are
+# meaningful, and the simplest rational in the interval decides rationality.
+# -----------------------------------------------------------------------------
+
+# Relative error assumed for float values (about 30 ulps)
+FLOAT_RELATIVE_ERROR = 2.0 ** -48
+# A float counts as rational when the simplest rational p/q within its error
+# satisfies q² · width <= RATIONAL_MARGIN. An interval of that width holds
+# such a fraction by chance with probability about RATIONAL_MARGIN, so this
+# is the rate at which irrational results are misclassified.
+RATIONAL_MARGIN = 1e-4
+# A float is recognized as a quadratic irrational only when its certain
+# partial quotients show at least two full periods and this many terms, and
+# the coefficients of its minimal polynomial stay below QUADRATIC_MAX_HEIGHT
+# (large ones fit a float's few certain terms by coincidence)
+PERIOD_MIN_TERMS = 8
+QUADRATIC_MAX_HEIGHT = 10 ** 4
+# Square factors of D are pulled out of √D by trial division up to this bound
+SQUARE_FACTOR_BOUND = 1000
+
+# (P + √D) / Q with D > 0 not a perfect square and Q dividing D - P²
+QuadraticIrrational = namedtuple("QuadraticIrrational", "P D Q")
+
+def _exact(x):
+    """x as a Fraction; raise ValueError for values that are not finite reals."""
+    if isinstance(x, fractions.Fraction):
+        return x
+    if isinstance(x, (int, decimal.Decimal)):
+        return fractions.Fraction(x)
+    if isinstance(x, float):
+        if not math.isfinite(x):
+            raise ValueError(f"{x} has no continued fraction.")
+        return fractions.Fraction(x)
+    if isinstance(x, str):
+        try:
+            return fractions.Fraction(x.strip())
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"'{x.strip()}' is not an exact decimal or fraction.")
+    raise ValueError(f"{x!r} has no continued fraction.")
+
+# -----------------------------------------------------------------------------
+# Quadratic irrationals
+# -----------------------------------------------------------------------------
+
+def quadratic_irrational(P, D, Q=1):
+    """Validate (P + √D)/Q and scale it so that Q divides D - P²."""
+    if Q == 0:
+        raise ValueError("The denominator Q must not be zero.")
+    if D <= 0 or math.isqrt(D) ** 2 == D:
+        raise ValueError(f"D = {D} must be a positive non-square.")
+    if (D - P * P) % Q:
+        P, D, Q = P * abs(Q), D * Q * Q, Q * abs(Q)
+    return QuadraticIrrational(P, D, Q)
+
+def _quadratic_floor(P, s, Q):
+    """floor((P + √D)/Q) given s = isqrt(D) and D not a square."""
+    if Q > 0:
+        return (P + s) // Q
+    return -((P + s) // -Q) - 1
+
+def _quadratic_states(x):
+    """Yield (term, P, Q) along the expansion of the QuadraticIrrational x."""
+    P, D, Q = x
+    s = math.isqrt(D)
+    while True:
+        a = _quadratic_floor(P, s, Q)
+        yield a, P, Q
+        P = a * Q - P
+        Q = (D - P * P) // Q
+
+def periodic_expansion(x):
+    """
+    Return (preperiod, period) for the QuadraticIrrational x, so that x =
+    [preperiod[0]; preperiod[1:], period, period, ...]. The period has at
+    most about 2√D terms.
+    """
+    terms, seen = [], {}
+    for a, P, Q in _quadratic_states(x):
+        if (P, Q) in seen:
+            start = seen[(P, Q)]
+            return terms[:start], terms[start:]
+        seen[(P, Q)] = len(terms)
+        terms.append(a)
+
+def minimal_polynomial(x):
+    """Primitive (a, b, c) with a > 0 and a x² + b x + c = 0 for the QuadraticIrrational x."""
+    P, D, Q = x
+    # (Q x - P)² = D
+    a, b, c = Q * Q, -2 * P * Q, P * P - D
+    g = math.gcd(a, b, c)
+    return a // g, b // g, c // g
+
+def from_periodic(preperiod, period):
+    """The QuadraticIrrational with the given eventually periodic expansion."""
+    if not period or any(a < 1 for a in period) or any(a < 1 for a in preperiod[1:]):
+        raise ValueError("Partial quotients after the first must be positive.")
+    # y = [period; y] solves a1 y² + b1 y + c1 = 0
+    p0, q0, p1, q1 = _convergent_matrix(period)
+    a1, b1, c1 = q1, q0 - p1, -p0
+    # x = [preperiod; y] = (A y + B)/(C y + E), so y = (B - E x)/(C x - A)
+    B, E, A, C = _convergent_matrix(preperiod)
+    a = a1 * E * E - b1 * E * C + c1 * C * C
+    b = -2 * a1 * B * E + b1 * (B * C + E * A) - 2 * c1 * C * A
+    c = a1 * B * B - b1 * B * A + c1 * A * A
+    g = math.gcd(a, b, c)
+    a, b, c = a // g, b // g, c // g
+    disc = b * b - 4 * a * c
+    # x is whichever root expands as preperiod + period
+    expected = list(preperiod) + list(period)
+    for root in (quadratic_irrational(-b, disc, 2 * a), quadratic_irrational(b, disc, -2 * a)):
+        if [t for t, _ in zip(partial_quotients(root), expected)] == expected:
+            return root
+    raise ValueError("No quadratic irrational has this expansion.")
+
+def _square_part(D):
+    """(s, d) with D = s² d, pulling out square factors of primes below SQUARE_FACTOR_BOUND."""
+    s, d = 1, D
+    for p in range(2, SQUARE_FACTOR_BOUND):
+        if p * p > d:
+            break
+        while d % (p * p) == 0:
+            d //= p * p
+            s *= p
+    r = math.isqrt(d)
+    if r * r == d:
+        s, d = s * r, 1
+    return s, d
+
+def format_quadratic(x):
+    """Format a QuadraticIrrational in lowest terms, e.g. '(1 + √5)/2'."""
+    P, D, Q = x
+    s, d = _square_part(D)
+    if Q < 0:
+        P, s, Q = -P, -s, -Q
+    g = math.gcd(P, s, Q)
+    P, s, Q = P // g, s // g, Q // g
+    root = f"{'' if abs(s) == 1 else abs(s)}√{d}"
+    if P:
+        text = f"{P} {'+' if s > 0 else '−'} {root}"
+    else:
+        text = root if s > 0 else f"−{root}"
+    if Q == 1:
+        return text
+    return f"({text})/{Q}" if P else f"{text}/{Q}"
+
+def _compare(x, r):
+    """Sign of x - r for a Fraction or QuadraticIrrational x and a Fraction r."""
+    if not isinstance(x, QuadraticIrrational):
+        return (x > r) - (x < r)
+    P, D, Q = x
+    n, d = r.numerator, r.denominator
+    # (P + √D)/Q - n/d has the sign of Q · (d√D - (nQ - dP))
+    t = n * Q - d * P
+    sign = 1 if t < 0 or d * d * D > t * t else -1
+    return sign if Q > 0 else -sign
+
+# -----------------------------------------------------------------------------
+# Partial quotients, convergents and semiconvergents
+# -----------------------------------------------------------------------------
+
+def partial_quotients(x):
+    """
+    Yield the partial quotients of x lazily: finitely many for rationals,
+    forever for a QuadraticIrrational.
+    """
+    if isinstance(x, QuadraticIrrational):
+        for a, _, _ in _quadratic_states(x):
+            yield a
+        return
+    x = _exact(x)
+    p, q = x.numerator, x.denominator
+    while q:
+        a, r = divmod(p, q)
+        yield a
+        p, q = q, r
+
+def interval_partial_quotients(lo, hi):
+    """Yield the partial quotients shared by every number in [lo, hi]."""
+    lo, hi = _exact(lo), _exact(hi)
+    if lo > hi:
+        lo, hi = hi, lo
+    while True:
+        a = math.floor(lo)
+        if a != math.floor(hi):
+            return
+        yield a
+        if lo == a:
+            return
+        lo, hi = 1 / (hi - a), 1 / (lo - a)
+
+def _convergent_matrix(terms):
+    """(p_{n-1}, q_{n-1}, p_n, q_n) after the given terms."""
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    for a in terms:
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, a * q1 + q0
+    return p0, q0, p1, q1
+
+def convergents(terms):
+    """Yield the convergents p_n/q_n of a stream of partial quotients."""
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    for a in terms:
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, a * q1 + q0
+        yield fractions.Fraction(p1, q1)
+
+def semiconvergents(terms):
+    """
+    Yield (fraction, is_convergent) for every semiconvergent
+    (p_{n-1} + k p_n)/(q_{n-1} + k q_n), 1 <= k <= a_{n+1}, in order of
+    increasing denominator; k = a_{n+1} gives the convergents.
+    """
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    for n, a in enumerate(terms):
+        # There are no semiconvergents before a_1
+        for k in range(1 if n else a, a):
+            yield fractions.Fraction(p0 + k * p1, q0 + k * q1), False
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, a * q1 + q0
+        yield fractions.Fraction(p1, q1), True
+
+def best_approximation(x, max_denominator):
+    """
+    The fraction closest to x with denominator at most max_denominator
+    (the smaller one on a tie). x is any exact real or a QuadraticIrrational;
+    only the O(log max_denominator) terms needed are generated.
+    """
+    if max_denominator < 1:
+        raise ValueError("The denominator bound must be at least 1.")
+    if not isinstance(x, QuadraticIrrational):
+        x = _exact(x)
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    for a in partial_quotients(x):
+        q2 = a * q1 + q0
+        if q2 > max_denominator:
+            # Largest admissible semiconvergent against the last convergent
+            k = (max_denominator - q0) // q1
+            semi = fractions.Fraction(p0 + k * p1, q0 + k * q1)
+            last = fractions.Fraction(p1, q1)
+            # Whichever side of the midpoint x lies on is the closer one
+            side = _compare(x, (semi + last) / 2)
+            if side == 0:
+                return min(semi, last)
+            return max(semi, last) if side > 0 else min(semi, last)
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, q2
+    return fractions.Fraction(p1, q1)
+
+def simplest_rational(lo, hi):
+    """The fraction with the smallest denominator in [lo, hi] (Stern–Brocot search)."""
+    lo, hi = _exact(lo), _exact(hi)
+    if lo > hi:
+        lo, hi = hi, lo
+    terms = []
+    while True:
+        a = math.floor(lo)
+        if a == lo:
+            terms.append(a)
+            break
+        if a < math.floor(hi):
+            terms.append(a + 1)
+            break
+        terms.append(a)
+        lo, hi = 1 / (hi - a), 1 / (lo - a)
+    _, _, p, q = _convergent_matrix(terms)
+    return fractions.Fraction(p, q)
+
+def format_continued_fraction(terms, more=False, period=None):
+    """'[a0; a1, a2]', with '…' if more terms follow and the period in parentheses."""
+    terms = [str(a) for a in terms]
+    if period:
+        terms.append("(" + ", ".join(str(a) for a in period) + ")")
+    elif more:
+        terms.append("…")
+    if len(terms) == 1:
+        return f"[{terms[0]}]"
+    return f"[{terms[0]}; {', '.join(terms[1:])}]"
+
+# -----------------------------------------------------------------------------
+# Approximate (float) values
+# -----------------------------------------------------------------------------
+
+def float_interval(x, relative_error=FLOAT_RELATIVE_ERROR):
+    """The exact interval (lo, hi) of values a float result may stand for."""
+    x = _exact(x)
+    eps = abs(x) * fractions.Fraction(relative_error)
+    return x - eps, x + eps
+
+def float_is_rational(x, relative_error=FLOAT_RELATIVE_ERROR):
+    """
+    Whether the float x is (within its error) a rational with a denominator
+    too small to be a coincidence; see RATIONAL_MARGIN.
+    """
+    if not math.isfinite(x):
+        return False
+    if x == 0 or x.is_integer():
+        return True
+    lo, hi = float_interval(x, relative_error)
+    q = simplest_rational(lo, hi).denominator
+    return q * q * (hi - lo) <= RATIONAL_MARGIN
+
+def _find_period(terms):
+    """(s, k) for the shortest preperiod s + period k that the tail of terms repeats at least twice."""
+    n = len(terms)
+    for total in range(1, n):
+        for k in range(1, total + 1):
+            s = total - k
+            if n - s < max(2 * k, PERIOD_MIN_TERMS):
+                continue
+            if all(terms[i] == terms[i - k] for i in range(s + k, n)):
+                return s, k
+    return None
+
+def guess_quadratic(x, relative_error=FLOAT_RELATIVE_ERROR):
+    """
+    A QuadraticIrrational matching the float x if its certain partial
+    quotients are visibly periodic and the exact value lies within the
+    float's error, else None.
+    """
+    if not math.isfinite(x):
+        return None
+    lo, hi = float_interval(x, relative_error)
+    terms = list(interval_partial_quotients(lo, hi))
+    found = _find_period(terms)
+    if found is None:
+        return None
+    s, k = found
+    try:
+        q = from_periodic(terms[:s], terms[s:s + k])
+    except ValueError:
+        return None
+    if max(map(abs, minimal_polynomial(q))) > QUADRATIC_MAX_HEIGHT:
+        return None
+    if _compare(q, lo) < 0 or _compare(q, hi) > 0:
+        return None
+    return q
+
+def describe(x, max_terms=None):
+    """
+    Continued fraction summary of a real value for display:
+    {"terms", "more", "period", "quadratic", "exact"}. Exact values give
+    their full expansion (up to max_terms); floats give the simplest
+    rational within their error if they are rational, else only the terms
+    their error leaves certain, plus the periodic form when recognized.
+    """
+    if isinstance(x, float):
+        if float_is_rational(x):
+            x = simplest_rational(*float_interval(x))
+        else:
+            lo, hi = float_interval(x)
+            terms = list(interval_partial_quotients(lo, hi))
+            quadratic = guess_quadratic(x)
+            period = None
+            if quadratic is not None:
+                terms, period = periodic_expansion(quadratic)
+                if not terms:
+                    # Purely periodic: show a0 before the repeating block
+                    terms, period = period[:1], period[1:] + period[:1]
+            return {"terms": terms, "more": period is None, "period": period,
+                    "quadratic": quadratic, "exact": False}
+    terms, more = [], False
+    for a in partial_quotients(x):
+        if max_terms is not None and len(terms) >= max_terms:
+            more = True
+            break
+        terms.append(a)
+    return {"terms": terms, "more": more, "period": None, "quadratic": None, "exact": True}
@@ -0,0 +1,240 @@
+import math
+import time
+import random
+
+import numpy as np
+
+import number_analysis
+import modular_arithmetic
+
+# -----------------------------------------------------------------------------
+# Discrete logarithms modulo a prime
+# Solves g^x = h (mod p). The order of g is found from the factorization of
+# p - 1 and Pohlig-Hellman reduces the problem to one logarithm per prime
+# power q^e dividing it, i.e. e logarithms in a subgroup of prime order q.
+# Each of those uses baby-step giant-step when its table fits in the memory
+# budget and Pollard's rho (r-adding walk, Brent or Floyd cycle detection,
+# O(1) memory) otherwise.
+#
+# The BSGS table is compact: sorted 64-bit fingerprints of the baby steps
+# plus a uint32 index array, 12 bytes per entry instead of a dict of Python
+# ints. Giant steps are looked up in batches with np.searchsorted and every
+# fingerprint hit is verified exactly. With a table of m entries a subgroup
+# of order q costs m + q/m multiplications, so memory_limit trades memory
+# for time: BSGS is used while q/m stays within BSGS_GIANT_STEP_FACTOR times
+# the sqrt(q) steps of rho.
+# -----------------------------------------------------------------------------
+
+# Default BSGS table budget in bytes
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# Bytes per table entry: uint64 fingerprint + uint32 baby-step index
+TABLE_ENTRY_BYTES = 12
+# BSGS is preferred while its giant steps stay within this multiple of sqrt(q)
+BSGS_GIANT_STEP_FACTOR = 4
+# Giant steps computed per np.searchsorted batch
+GIANT_STEP_BATCH = 4096
+# Partitions of the r-adding walk used by rho
+RHO_PARTITIONS = 20
+# Steps between progress reports and cancel() checks
+CHECK_INTERVAL = 1 << 14
+
+_FINGERPRINT_MASK = (1 << 64) - 1
+
+class DiscreteLogCancelled(Exception):
+    """Raised when the time limit or cancel() stops the search."""
+    def __init__(self):
+        super().__init__("Discrete logarithm search stopped.")
+
+def _stopper(time_limit, cancel):
+    """Combine a time limit and a cancel() callable like number_analysis.factorize."""
+    if time_limit is None:
+        return cancel
+    deadline = time.monotonic() + time_limit
+    return lambda: time.monotonic() > deadline or (cancel is not None and cancel())
+
+def _check(stop):
+    if stop is not None and stop():
+        raise DiscreteLogCancelled()
+
+# -----------------------------------------------------------------------------
+# Prime-order subgroup logarithms
+# -----------------------------------------------------------------------------
+
+def _bsgs(gamma, beta, q, p, m, stop, progress):
+    """log_gamma(beta) in a group of order q with m baby steps, or None."""
+    # Baby steps gamma^j, j < m
+    keys = np.empty(m, dtype=np.uint64)
+    value = 1
+    for j in range(m):
+        if value == beta:
+            return j
+        keys[j] = value & _FINGERPRINT_MASK
+        value = value * gamma % p
+        if j % CHECK_INTERVAL == 0:
+            _check(stop)
+            if progress is not None:
+                progress(f"Baby steps {100 * j // m}%")
+    order = np.argsort(keys, kind="stable").astype(np.uint32)
+    keys = keys[order]
+
+    # Giant steps beta * gamma^(-m i)
+    factor = pow(gamma, -m, p)
+    giant_steps = -(-q // m)
+    value = beta
+    for start in range(0, giant_steps, GIANT_STEP_BATCH):
+        _check(stop)
+        if progress is not None:
+            progress(f"Giant steps {100 * start // giant_steps}%")
+        batch = []
+        for _ in range(min(GIANT_STEP_BATCH, giant_steps - start)):
+            batch.append(value)
+            value = value * factor % p
+        fingerprints = np.array([v & _FINGERPRINT_MASK for v in batch], dtype=np.uint64)
+        left = np.searchsorted(keys, fingerprints, side="left")
+        right = np.searchsorted(keys, fingerprints, side="right")
+        for i in np.flatnonzero(right > left):
+            for pos in range(left[i], right[i]):
+                x = ((start + int(i)) * m + int(order[pos])) % q
+                if pow(gamma, x, p) == beta:
+                    return x
+    return None
+
+def _rho(gamma, beta, q, p, stop, progress, cycle):
+    """log_gamma(beta) in a group of prime order q by Pollard's rho (beta is in the group)."""
+    rng = random.Random(q)
+    steps = 0
+    while True:
+        # r-adding walk: x -> x * M_j with M_j = gamma^a_j beta^b_j, j = x mod r
+        exps = [(rng.randrange(q), rng.randrange(q)) for _ in range(RHO_PARTITIONS)]
+        mults = [pow(gamma, a, p) * pow(beta, b, p) % p for a, b in exps]
+
+        def step(x, a, b):
+            j = x % RHO_PARTITIONS
+            da, db = exps[j]
+            return x * mults[j] % p, (a + da) % q, (b + db) % q
+
+        a0, b0 = rng.randrange(q), rng.randrange(q)
+        tortoise = (pow(gamma, a0, p) * pow(beta, b0, p) % p, a0, b0)
+        if cycle == "floyd":
+            hare = step(*tortoise)
+            while tortoise[0] != hare[0]:
+                tortoise = step(*tortoise)
+                hare = step(*step(*hare))
+                steps += 1
+                if steps % CHECK_INTERVAL == 0:
+                    _check(stop)
+                    if progress is not None:
+                        progress(f"Pollard rho: {steps:,} steps")
+        else:
+            # Brent: the tortoise jumps to the hare at every power of two
+            hare = step(*tortoise)
+            power = length = 1
+            while tortoise[0] != hare[0]:
+                if power == length:
+                    tortoise = hare
+                    power *= 2
+                    length = 0
+                hare = step(*hare)
+                length += 1
+                steps += 1
+                if steps % CHECK_INTERVAL == 0:
+                    _check(stop)
+                    if progress is not None:
+                        progress(f"Pollard rho: {steps:,} steps")
+
+        # gamma^a1 beta^b1 = gamma^a2 beta^b2  =>  x (b1 - b2) = a2 - a1 (mod q)
+        _, a1, b1 = tortoise
+        _, a2, b2 = hare
+        if (b1 - b2) % q == 0:
+            continue  # degenerate collision, restart with a new walk
+        x = (a2 - a1) * pow(b1 - b2, -1, q) % q
+        if pow(gamma, x, p) == beta:
+            return x
+
+def _subgroup_log(gamma, beta, q, p, max_entries, stop, progress, cycle):
+    """log_gamma(beta) where gamma has prime order q and beta is in its group."""
+    if beta == 1:
+        return 0
+    m = min(math.isqrt(q - 1) + 1, max_entries)
+    if m >= 1 and -(-q // m) <= BSGS_GIANT_STEP_FACTOR * math.isqrt(q) + 1:
+        return _bsgs(gamma, beta, q, p, m, stop, progress)
+    return _rho(gamma, beta, q, p, stop, progress, cycle)
+
+# -----------------------------------------------------------------------------
+# Pohlig-Hellman
+# -----------------------------------------------------------------------------
+
+def multiplicative_order(g, p, factors):
+    """Order of g modulo the prime p, given the factorization of p - 1."""
+    order = p - 1
+    for q, e in factors.items():
+        for _ in range(e):
+            if pow(g, order // q, p) != 1:
+                break
+            order //= q
+    return order
+
+def _factor_order(order, factors):
+    result = {}
+    for q in factors:
+        while order % q == 0:
+            order //= q
+            result[q] = result.get(q, 0) + 1
+    return result
+
+def discrete_log(g, h, p, memory_limit=DEFAULT_MEMORY_LIMIT, time_limit=None, cancel=None,
+                 progress=None, cycle="brent"):
+    """
+    Smallest x >= 0 with g^x = h (mod p), or None if h is not a power of g.
+
+    memory_limit bounds the BSGS table in bytes (0 forces Pollard rho);
+    cycle selects Brent ("brent") or Floyd ("floyd") cycle detection for rho.
+    progress(status) is called periodically; DiscreteLogCancelled is raised
+    when time_limit seconds pass or cancel() returns True.
+    """
+    if not number_analysis.is_prime(p):
+        raise ValueError(f"The modulus {p} must be prime.")
+    if cycle not in ("brent", "floyd"):
+        raise ValueError(f"Unknown cycle detection '{cycle}'.")
+    g, h = g % p, h % p
+    if g == 0:
+        raise ValueError("The base must not be divisible by p.")
+    if h == 0:
+        return None
+    stop = _stopper(time_limit, cancel)
+    max_entries = max(memory_limit // TABLE_ENTRY_BYTES, 0)
+
+    if progress is not None:
+        progress("Factoring p − 1")
+    factors, remaining = number_analysis.factorize(p - 1, time_limit, stop)
+    if remaining:
+        _check(stop)
+        raise ValueError("p − 1 could not be fully factored within the time limit.")
+    order = multiplicative_order(g, p, factors)
+    # In a cyclic group h is a power of g iff h^ord(g) = 1
+    if pow(h, order, p) != 1:
+        return None
+
+    residues, moduli = [], []
+    parts = _factor_order(order, factors)
+    for index, (q, e) in enumerate(parts.items(), start=1):
+        # Project onto the subgroup of order q^e and find x mod q^e digit by digit
+        cofactor = order // q ** e
+        g_i, h_i = pow(g, cofactor, p), pow(h, cofactor, p)
+        gamma = pow(g_i, q ** (e - 1), p)
+        x = 0
+        for k in range(e):
+            if progress is not None:
+                progress(f"Subgroup {index}/{len(parts)} (order {number_analysis.format_number(q)}), digit {k + 1}/{e}")
+            beta = pow(h_i * pow(g_i, -x, p) % p, q ** (e - 1 - k), p)
+            digit_progress = None
+            if progress is not None:
+                digit_progress = lambda status, prefix=f"Subgroup {index}/{len(parts)}: ": progress(prefix + status)
+            digit = _subgroup_log(gamma, beta, q, p, max_entries, stop, digit_progress, cycle)
+            if digit is None:
+                return None
+            x += digit * q ** k
+        residues.append(x)
+        moduli.append(q ** e)
+    x, _ = modular_arithmetic.crt(residues, moduli) if residues else (0, 1)
+    return x
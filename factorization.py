@@ -0,0 +1,394 @@
+import math
+import random
+import functools
+import logging
+
+import primality
+import prime_sieve
+
+# -----------------------------------------------------------------------------
+# Integer factorization
+# Trial division by small primes, then Pollard-Brent rho, then Lenstra's
+# elliptic curve method (Montgomery curves, Suyama parametrization) with a
+# baby-step/giant-step stage 2.
+# -----------------------------------------------------------------------------
+
+TRIAL_DIVISION_BOUND = 10000
+_TRIAL_PRIMES = prime_sieve.primes_up_to(TRIAL_DIVISION_BOUND)
+
+# Pollard-Brent gives up after this many iterations and hands over to ECM
+RHO_MAX_ITERATIONS = 1 << 16
+
+# (B1, number of curves) per ECM level, following the usual GMP-ECM table.
+# The last level is repeated until a factor is found.
+ECM_SCHEDULE = [
+    (2000, 25),
+    (11000, 90),
+    (50000, 300),
+    (250000, 700),
+    (1000000, 1800),
+    (3000000, 5100),
+]
+ECM_B2_FACTOR = 100
+
+class FactorizationCancelled(Exception):
+    """Raised when a factorization is cancelled; .partial holds what was found."""
+    def __init__(self, partial, remaining):
+        super().__init__("Factorization cancelled.")
+        self.partial = partial
+        self.remaining = remaining
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel():
+        raise _Cancelled()
+
+class _Cancelled(Exception):
+    pass
+
+# -----------------------------------------------------------------------------
+# Integer roots
+# -----------------------------------------------------------------------------
+
+def integer_root(n, k):
+    """Return floor(n ** (1/k)) for n >= 0 using integer Newton iteration."""
+    if n < 0:
+        raise ValueError("integer_root requires a non-negative integer.")
+    if k == 1 or n < 2:
+        return n
+    if k == 2:
+        return math.isqrt(n)
+    # Start just above the root from a float estimate of its top ~50 bits,
+    # so Newton only has to double the number of correct bits a few times
+    shift = max(0, n.bit_length() // k - 50)
+    top = n >> (shift * k)
+    x = (int(2.0 ** (math.log2(top) / k) * (1 + 1e-12)) + 2) << shift
+    while True:
+        y = ((k - 1) * x + n // pow(x, k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+# Roots below 2^_FLOAT_ROOT_BITS are recovered exactly from a float
+# estimate of log2(n) / k; larger k-th roots are only computed with Newton
+# after n has passed a k-th power residue test modulo a few primes q = 1 (mod k),
+# each of which rejects all but about 1/k of non-powers.
+_FLOAT_ROOT_BITS = 30
+_RESIDUE_MODULI = 4
+
+@functools.lru_cache(maxsize=None)
+def _power_residue_moduli(k):
+    """The first few primes q = 1 (mod k), paired with (q - 1) // k."""
+    moduli = []
+    q = 2 * k + 1
+    while len(moduli) < _RESIDUE_MODULI:
+        if primality.is_prime(q):
+            moduli.append((q, (q - 1) // k))
+        q += 2 * k
+    return tuple(moduli)
+
+def exact_root(n, k, log2n=None):
+    """Return r with r^k == n for n >= 0 if there is one, else None."""
+    if n < 2:
+        return n
+    if k == 2:
+        r = math.isqrt(n)
+        return r if r * r == n else None
+    if log2n is None:
+        log2n = math.log2(n)
+    if log2n < k * _FLOAT_ROOT_BITS:
+        t = 2.0 ** (log2n / k)
+        r = round(t)
+        if abs(t - r) > 1e-3 or r < 2:
+            return None
+        return r if pow(r, k) == n else None
+    for q, e in _power_residue_moduli(k):
+        x = n % q
+        if x and pow(x, e, q) != 1:
+            return None
+    r = integer_root(n, k)
+    return r if pow(r, k) == n else None
+
+_exponent_primes = []
+
+def _primes_for_exponents(limit):
+    """Primes <= limit (a cached, growing list)."""
+    global _exponent_primes
+    if not _exponent_primes or _exponent_primes[-1] < limit:
+        _exponent_primes = prime_sieve.primes_up_to(max(2 * limit, 1000))
+    return _exponent_primes
+
+def perfect_power(n):
+    """Return (base, exponent) with the largest exponent > 1 if n is a perfect power, else None."""
+    if n < 4:
+        return None
+    log2n = math.log2(n)
+    float_from = log2n / _FLOAT_ROOT_BITS
+    best = None
+    for k in _primes_for_exponents(n.bit_length()):
+        if k > log2n:
+            # The root would be below 2
+            break
+        if k > float_from:
+            # Inline form of the float path of exact_root; this loop runs
+            # for almost every k, so call overhead matters here
+            t = 2.0 ** (log2n / k)
+            r = round(t)
+            if abs(t - r) <= 1e-3 and r >= 2 and pow(r, k) == n:
+                best = (r, k)
+            continue
+        r = exact_root(n, k, log2n)
+        if r is not None:
+            best = (r, k)
+    if best is None:
+        return None
+    # Combine exponents, e.g. 2^6 is found as (8, 2) and (4, 3)
+    base, exp = best
+    inner = perfect_power(base)
+    while inner is not None:
+        base, exp = inner[0], exp * inner[1]
+        inner = perfect_power(base)
+    return base, exp
+
+# -----------------------------------------------------------------------------
+# Pollard-Brent rho
+# -----------------------------------------------------------------------------
+
+def pollard_brent(n, max_iterations=RHO_MAX_ITERATIONS, cancel=None, seed=None):
+    """Return a non-trivial factor of composite n, or None if the budget runs out."""
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(seed)
+    for _ in range(8):
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        m = 128
+        g = r = q = 1
+        iterations = 0
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                _check_cancel(cancel)
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+            iterations += r
+            if iterations > max_iterations:
+                return None
+        if g == n:
+            # Backtrack one step at a time from the last saved point
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+    return None
+
+# -----------------------------------------------------------------------------
+# Lenstra ECM on Montgomery curves
+# -----------------------------------------------------------------------------
+
+def _xdbl(x, z, a24, n):
+    s = (x + z) * (x + z) % n
+    d = (x - z) * (x - z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+def _xadd(xp, zp, xq, zq, xd, zd, n):
+    u = (xp - zp) * (xq + zq)
+    v = (xp + zp) * (xq - zq)
+    return zd * (u + v) * (u + v) % n, xd * (u - v) * (u - v) % n
+
+def _ladder(k, x, z, a24, n):
+    """Montgomery ladder: return the x/z coordinates of k*(x:z)."""
+    if k == 1:
+        return x, z
+    x0, z0 = x, z
+    x1, z1 = _xdbl(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x0, z0 = _xadd(x1, z1, x0, z0, x, z, n)
+            x1, z1 = _xdbl(x1, z1, a24, n)
+        else:
+            x1, z1 = _xadd(x1, z1, x0, z0, x, z, n)
+            x0, z0 = _xdbl(x0, z0, a24, n)
+    return x0, z0
+
+def _ecm_curve(n, sigma):
+    """Return (x, z, a24) for the Suyama curve with parameter sigma, or a factor of n."""
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    x = pow(u, 3, n)
+    z = pow(v, 3, n)
+    num = pow(v - u, 3, n) * (3 * u + v) % n
+    den = 16 * x * v % n
+    g = math.gcd(den, n)
+    if g != 1:
+        return g
+    a24 = num * pow(den, -1, n) % n
+    return x, z, a24
+
+def ecm_one_curve(n, b1, b2, sigma, cancel=None, stage1_primes=None):
+    """Run stage 1 and stage 2 of ECM on one curve; return a factor of n or None."""
+    curve = _ecm_curve(n, sigma)
+    if isinstance(curve, int):
+        return curve if curve != n else None
+    x, z, a24 = curve
+
+    # Stage 1: multiply by every prime power up to B1
+    if stage1_primes is None:
+        stage1_primes = prime_sieve.primes_up_to(b1)
+    for i, p in enumerate(stage1_primes):
+        if i % 512 == 0:
+            _check_cancel(cancel)
+        pe = p
+        while pe * p <= b1:
+            pe *= p
+        x, z = _ladder(pe, x, z, a24, n)
+    g = math.gcd(z, n)
+    if 1 < g < n:
+        return g
+    if g == n:
+        return None
+
+    # Stage 2: baby-step giant-step over the primes in (B1, B2]
+    d = max(2, min(1024, math.isqrt(b2) // 2))
+    while 2 * d >= b1:
+        d //= 2
+    if d < 2:
+        return None
+    sx = [0] * (d + 1)
+    sz = [0] * (d + 1)
+    beta = [0] * (d + 1)
+    sx[1], sz[1] = _xdbl(x, z, a24, n)
+    sx[2], sz[2] = _xdbl(sx[1], sz[1], a24, n)
+    for k in range(3, d + 1):
+        sx[k], sz[k] = _xadd(sx[k - 1], sz[k - 1], sx[1], sz[1], sx[k - 2], sz[k - 2], n)
+    for k in range(1, d + 1):
+        beta[k] = sx[k] * sz[k] % n
+
+    start = b1 if b1 % 2 else b1 - 1
+    tx, tz = _ladder(start - 2 * d, x, z, a24, n)
+    rx, rz = _ladder(start, x, z, a24, n)
+    acc = 1
+    r = start
+    primes = prime_sieve.primes_in_range(b1 + 1, b2)
+    q = next(primes, None)
+    steps = 0
+    while q is not None:
+        alpha = rx * rz % n
+        limit = r + 2 * d
+        while q is not None and q <= limit:
+            delta = (q - r) // 2
+            acc = acc * ((rx - sx[delta]) * (rz + sz[delta]) - alpha + beta[delta]) % n
+            q = next(primes, None)
+        rx, rz, tx, tz = (*_xadd(rx, rz, sx[d], sz[d], tx, tz, n), rx, rz)
+        r = limit
+        steps += 1
+        if steps % 64 == 0:
+            _check_cancel(cancel)
+    g = math.gcd(acc, n)
+    if 1 < g < n:
+        return g
+    return None
+
+def ecm(n, cancel=None, seed=None, schedule=ECM_SCHEDULE):
+    """Find a non-trivial factor of composite n with ECM, escalating B1 per the schedule."""
+    rng = random.Random(seed)
+    level = 0
+    while True:
+        b1, curves = schedule[min(level, len(schedule) - 1)]
+        b2 = b1 * ECM_B2_FACTOR
+        stage1_primes = prime_sieve.primes_up_to(b1)
+        logging.debug("ECM level B1=%d, %d curves", b1, curves)
+        for _ in range(curves):
+            _check_cancel(cancel)
+            sigma = rng.randrange(6, n - 1) if n > 7 else 6
+            # Stage 2 primes are streamed from the sieve per curve to keep memory flat
+            f = ecm_one_curve(n, b1, b2, sigma, cancel, stage1_primes)
+            if f is not None:
+                return f
+        level += 1
+
+# -----------------------------------------------------------------------------
+# Driver
+# -----------------------------------------------------------------------------
+
+def _add_factor(factors, p, e=1):
+    factors[p] = factors.get(p, 0) + e
+
+def _split(n, cancel):
+    """Return a non-trivial factor of composite n with no small factors."""
+    pp = perfect_power(n)
+    if pp is not None:
+        return pp[0]
+    f = pollard_brent(n, cancel=cancel)
+    if f is None:
+        f = ecm(n, cancel=cancel)
+    return f
+
+def factorint(n, cancel=None):
+    """
+    Return the prime factorization of n as a dict {prime: exponent}.
+
+    n must be a non-zero integer; the sign is reported as the factor -1.
+    cancel is an optional callable polled during the expensive stages; when
+    it returns True, FactorizationCancelled is raised with the partial result.
+    """
+    n = int(n)
+    if n == 0:
+        raise ValueError("Zero has no prime factorization.")
+    factors = {}
+    if n < 0:
+        factors[-1] = 1
+        n = -n
+
+    for p in _TRIAL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors[p] = e
+    if n > 1 and n < TRIAL_DIVISION_BOUND * TRIAL_DIVISION_BOUND:
+        _add_factor(factors, n)
+        n = 1
+
+    # Composite parts still to split, as (value, multiplicity)
+    pending = [(n, 1)] if n > 1 else []
+    try:
+        while pending:
+            m, mult = pending.pop()
+            if primality.is_prime(m):
+                _add_factor(factors, m, mult)
+                continue
+            f = _split(m, cancel)
+            g = m // f
+            if f == g:
+                pending.append((f, 2 * mult))
+            else:
+                pending.append((f, mult))
+                pending.append((g, mult))
+    except _Cancelled:
+        remaining = [m ** e for m, e in pending]
+        remaining.append(m ** mult)
+        raise FactorizationCancelled(dict(sorted(factors.items())), remaining)
+    return dict(sorted(factors.items()))
+
+def format_factorization(factors, fmt=str):
+    """Format {prime: exponent} as e.g. '2^3 × 3 × 7'; fmt formats each prime."""
+    if not factors:
+        return "1"
+    terms = [fmt(p) if e == 1 else f"{fmt(p)}^{e}" for p, e in factors.items()]
+    return " × ".join(terms)
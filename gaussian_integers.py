@@ -0,0 +1,257 @@
+import math
+
+import primality
+import number_parser
+import number_analysis
+
+# -----------------------------------------------------------------------------
+# Gaussian integers
+# Numbers a + bi with integer a, b, represented as (a, b) tuples. Primality
+# and factorization reduce to the rational integers through the norm
+# N(a + bi) = a^2 + b^2:
+#   * a + bi with a, b != 0 is a Gaussian prime iff N is a rational prime;
+#     p or pi (p rational) is one iff p is a prime with p = 3 (mod 4).
+#   * Every rational prime p dividing N contributes 1 + i (p = 2), p itself
+#     (p = 3 mod 4, N has it squared) or one of x + yi, x - yi where
+#     x^2 + y^2 = p (p = 1 mod 4), found with the Hermite-Serret algorithm.
+# N is factored with the shared rational engine (number_analysis.factorize),
+# so the cost is that of factoring a number twice as long as the parts.
+# -----------------------------------------------------------------------------
+
+UNITS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+def g_add(z, w):
+    return (z[0] + w[0], z[1] + w[1])
+
+def g_sub(z, w):
+    return (z[0] - w[0], z[1] - w[1])
+
+def g_mul(z, w):
+    return (z[0] * w[0] - z[1] * w[1], z[0] * w[1] + z[1] * w[0])
+
+def conjugate(z):
+    return (z[0], -z[1])
+
+def norm(z):
+    return z[0] * z[0] + z[1] * z[1]
+
+def _round_div(a, n):
+    """a / n rounded to the nearest integer (n > 0)."""
+    return (2 * a + n) // (2 * n)
+
+def g_divmod(z, w):
+    """Division with remainder: z = q*w + r with N(r) <= N(w) / 2."""
+    n = norm(w)
+    if n == 0:
+        raise ValueError("Division by zero.")
+    num = g_mul(z, conjugate(w))
+    q = (_round_div(num[0], n), _round_div(num[1], n))
+    return q, g_sub(z, g_mul(q, w))
+
+def exact_quotient(z, w):
+    """Return z / w if w divides z, else None."""
+    n = norm(w)
+    if n == 0:
+        raise ValueError("Division by zero.")
+    num = g_mul(z, conjugate(w))
+    if num[0] % n or num[1] % n:
+        return None
+    return (num[0] // n, num[1] // n)
+
+def normalize(z):
+    """The associate of z in the first quadrant (a > 0, b >= 0); 0 stays 0."""
+    a, b = z
+    if a == 0 and b == 0:
+        return z
+    # Multiply by -i, -1 or i until a > 0 and b >= 0
+    while not (a > 0 and b >= 0):
+        a, b = b, -a
+    return (a, b)
+
+def gaussian_gcd(z, w):
+    """Greatest common divisor of two Gaussian integers, normalized to the first quadrant."""
+    while w != (0, 0):
+        z, w = w, g_divmod(z, w)[1]
+    return normalize(z)
+
+def g_pow(z, e):
+    result = (1, 0)
+    while e:
+        if e & 1:
+            result = g_mul(result, z)
+        z = g_mul(z, z)
+        e >>= 1
+    return result
+
+# -----------------------------------------------------------------------------
+# Primality and the two-squares decomposition of split primes
+# -----------------------------------------------------------------------------
+
+def is_gaussian_prime(z, is_prime=number_analysis.is_prime):
+    """Check whether z is a Gaussian prime (is_prime tests rational integers)."""
+    a, b = abs(z[0]), abs(z[1])
+    if a == 0 or b == 0:
+        p = a or b
+        return p % 4 == 3 and is_prime(p)
+    return is_prime(a * a + b * b)
+
+def sum_of_two_squares(p):
+    """Return (x, y) with x^2 + y^2 = p, x > y > 0, for a prime p = 1 (mod 4) (or p = 2)."""
+    if p == 2:
+        return (1, 1)
+    if p % 4 != 1:
+        raise ValueError(f"{p} is not a sum of two squares.")
+    # t = sqrt(-1) mod p from any quadratic non-residue c
+    c = 2
+    while primality.jacobi(c, p) != -1:
+        c += 1
+    t = pow(c, (p - 1) // 4, p)
+    # Hermite-Serret: the first remainder of Euclid on (p, t) below sqrt(p)
+    # is x, and y follows from p - x^2
+    a, b = p, t
+    limit = math.isqrt(p)
+    while b > limit:
+        a, b = b, a % b
+    x = b
+    y = math.isqrt(p - x * x)
+    if x * x + y * y != p:
+        raise ValueError(f"{p} is not prime.")
+    return (max(x, y), min(x, y))
+
+# -----------------------------------------------------------------------------
+# Factorization
+# -----------------------------------------------------------------------------
+
+def _prime_divisors(p):
+    """The non-associate Gaussian primes above the rational prime p."""
+    if p == 2:
+        return [(1, 1)]
+    if p % 4 == 3:
+        return [(p, 0)]
+    x, y = sum_of_two_squares(p)
+    return [(x, y), (y, x)]
+
+def factorize(z, time_limit=None, cancel=None):
+    """
+    Factor a nonzero Gaussian integer into unit × ∏ π^e.
+
+    Returns (unit, factors, remaining): factors maps normalized Gaussian
+    primes to exponents, and remaining is the product of whatever was left
+    unfactored when time_limit or cancel() stopped the norm factorization
+    ((1, 0) when complete; it is then folded into the unit).
+    """
+    if z == (0, 0):
+        raise ValueError("Cannot factorize zero.")
+    # Factor the content g = gcd(a, b) and the norm of z / g separately:
+    # both are much smaller than N(z) = g^2 N(z / g)
+    g = math.gcd(*z)
+    primitive = (z[0] // g, z[1] // g)
+    rational = {}
+    remaining_rational = []
+    for m in (g, norm(primitive)):
+        if m == 1:
+            continue
+        factors, remaining = number_analysis.factorize(m, time_limit, cancel)
+        for p, e in factors.items():
+            rational[p] = rational.get(p, 0) + e
+        remaining_rational += remaining
+
+    factors = {}
+    rest = z
+    for p in sorted(rational):
+        for pi in _prime_divisors(p):
+            while True:
+                q = exact_quotient(rest, pi)
+                if q is None:
+                    break
+                rest = q
+                factors[pi] = factors.get(pi, 0) + 1
+
+    if remaining_rational or rest not in UNITS:
+        # rest still carries the primes above the unfactored cofactors
+        return (1, 0), dict(sorted(factors.items(), key=_prime_order)), rest
+    return rest, dict(sorted(factors.items(), key=_prime_order)), (1, 0)
+
+def _prime_order(item):
+    pi = item[0]
+    return (norm(pi), pi)
+
+# -----------------------------------------------------------------------------
+# Parsing and display
+# -----------------------------------------------------------------------------
+
+class _NotGaussian(Exception):
+    pass
+
+def _evaluate(node):
+    """Evaluate a number_parser AST over the Gaussian integers."""
+    kind = node[0]
+    if kind in ("const", "imag"):
+        value = node[1]
+        if not isinstance(value, int):
+            raise _NotGaussian()
+        return (value, 0) if kind == "const" else (0, value)
+    if kind == "neg":
+        a, b = _evaluate(node[1])
+        return (-a, -b)
+    left, right = _evaluate(node[1]), _evaluate(node[2])
+    if kind == "+":
+        return g_add(left, right)
+    if kind == "-":
+        return g_sub(left, right)
+    if kind == "*":
+        return g_mul(left, right)
+    if kind == "/":
+        if right == (0, 0):
+            raise ValueError("Division by zero.")
+        q = exact_quotient(left, right)
+        if q is None:
+            raise _NotGaussian()
+        return q
+    # Power: only non-negative integer exponents stay Gaussian integers
+    e, e_imag = right
+    if e_imag or e < 0:
+        raise _NotGaussian()
+    if left not in ((0, 0),) + UNITS and e * max(left[0].bit_length(), left[1].bit_length(), 1) > number_parser.MAX_RESULT_BITS:
+        raise ValueError("Number too large.")
+    return g_pow(left, e)
+
+def parse_gaussian(source):
+    """
+    Evaluate source exactly as a Gaussian integer (a, b), or return None if
+    the expression is not one (e.g. it has decimals or an inexact division).
+    """
+    try:
+        return _evaluate(number_parser.parse_ast(source.strip()))
+    except _NotGaussian:
+        return None
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply.")
+
+def format_gaussian(z):
+    """Display string for a Gaussian integer, e.g. '3 + 4i', '-i', '7'."""
+    a, b = z
+    fmt = number_analysis.format_number
+    if b == 0:
+        return fmt(a)
+    imag = "i" if abs(b) == 1 else f"{fmt(abs(b))}i"
+    if a == 0:
+        return f"-{imag}" if b < 0 else imag
+    return f"{fmt(a)} {'-' if b < 0 else '+'} {imag}"
+
+def format_gaussian_factorization(unit, factors, remaining=(1, 0)):
+    """Display string such as '-i × (1 + i)^2 × (2 + i) × 3'."""
+    parts = []
+    if unit != (1, 0) or not factors:
+        parts.append(format_gaussian(unit))
+    for pi, e in factors.items():
+        text = format_gaussian(pi)
+        if pi[0] and pi[1]:
+            text = f"({text})"
+        parts.append(text if e == 1 else f"{text}^{e}")
+    if remaining != (1, 0):
+        parts.append(f"({format_gaussian(remaining)} unfactored)")
+    text = " × ".join(parts)
+    if remaining != (1, 0):
+        text += " — time limit reached"
+    return text
@@ -0,0 +1,293 @@
+import math
+import operator
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# GCD, LCM and Bézout coefficients
+# Extended GCD of big integers in three tiers:
+#   * plain Euclid below LEHMER_THRESHOLD bits, where CPython's own
+#     division beats simulating quotients in Python;
+#   * Lehmer's algorithm (Knuth's Algorithm L): Euclid runs on the leading
+#     LEHMER_DIGIT_BITS of both numbers and the combined 2x2 cofactor matrix
+#     is applied to the full numbers, replacing ~30 big divisions by four
+#     big-by-small multiplications;
+#   * half-GCD for huge inputs: the matrix that halves the size of the
+#     numbers is built recursively from the top halves, so the cost follows
+#     that of multiplication (Karatsuba in CPython) rather than n^2.
+# All tiers only ever apply unimodular matrices to (a, b), so the gcd and the
+# tracked cofactors stay exact even where a truncated step differs from the
+# true Euclidean sequence; the Bézout pair is normalized at the end.
+#
+# The *_batch functions work elementwise on NumPy arrays: int64 kernels when
+# the values fit, object arrays of Python ints otherwise.
+# -----------------------------------------------------------------------------
+
+# Leading bits simulated per Lehmer step
+LEHMER_DIGIT_BITS = 250
+# Below this many bits plain Euclid is used
+LEHMER_THRESHOLD = 2000
+# Above this many bits the half-GCD recursion is used
+HGCD_THRESHOLD = 10000
+
+_IDENTITY = (1, 0, 0, 1)
+_INT64_MAX = np.iinfo(np.int64).max
+
+def _integer(x):
+    try:
+        return operator.index(x)
+    except TypeError:
+        raise ValueError(f"GCD needs integers, not {x!r}.")
+
+# -----------------------------------------------------------------------------
+# Matrix helpers: M = (A, B, C, D) maps the inputs (a0, b0) to the current
+# pair, a = A a0 + B b0 and b = C a0 + D b0.
+# -----------------------------------------------------------------------------
+
+def _mul(L, M):
+    """Matrix product L M."""
+    A, B, C, D = L
+    a, b, c, d = M
+    return (A * a + B * c, A * b + B * d, C * a + D * c, C * b + D * d)
+
+def _apply(M, a, b):
+    """Apply M to (a, b) and fix signs and order so that a >= b >= 0 (still unimodular)."""
+    A, B, C, D = M
+    a, b = A * a + B * b, C * a + D * b
+    if a < 0:
+        a, A, B = -a, -A, -B
+    if b < 0:
+        b, C, D = -b, -C, -D
+    if a < b:
+        a, b, A, B, C, D = b, a, C, D, A, B
+    return a, b, (A, B, C, D)
+
+def _euclid_step(a, b, M):
+    q, r = divmod(a, b)
+    A, B, C, D = M
+    return b, r, (C, D, A - q * C, B - q * D)
+
+def _lehmer_reduce(a, b, stop_bits, M=_IDENTITY):
+    """
+    Euclidean steps on a >= b >= 0 until b has at most stop_bits bits (it may
+    overshoot by one Lehmer step); returns (a, b, M) with M updated.
+    """
+    while b.bit_length() > stop_bits:
+        n = a.bit_length()
+        if n <= LEHMER_THRESHOLD:
+            a, b, M = _euclid_step(a, b, M)
+            continue
+        shift = max(n - LEHMER_DIGIT_BITS, 0)
+        ah, bh = a >> shift, b >> shift
+        # Knuth's test: a quotient is certain when both bounds agree
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C and bh + D:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            a, b, M = _euclid_step(a, b, M)
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            M = _mul((A, B, C, D), M)
+    return a, b, M
+
+def _hgcd(a, b):
+    """
+    For a >= b >= 0, reduce b to about half the bits of a; returns
+    (a', b', M) with (a', b') = M (a, b), a' >= b' >= 0.
+    """
+    n = a.bit_length()
+    h = n // 2
+    if b.bit_length() <= h:
+        return a, b, _IDENTITY
+    if n <= HGCD_THRESHOLD:
+        return _lehmer_reduce(a, b, h)
+    # The matrix reducing the top n - h bits reduces the whole to ~3n/4 bits
+    _, _, M = _hgcd(a >> h, b >> h)
+    a, b, M = _apply(M, a, b)
+    if b.bit_length() <= h:
+        return a, b, M
+    a, b, M = _euclid_step(a, b, M)
+    if b.bit_length() <= h:
+        return a, b, M
+    # Second recursion on the top part whose half lands at h bits
+    k = max(2 * h - a.bit_length(), 0)
+    _, _, M2 = _hgcd(a >> k, b >> k)
+    a, b, M2 = _apply(M2, a, b)
+    # A few more steps make up for the truncation
+    return _lehmer_reduce(a, b, h, _mul(M2, M))
+
+def _euclid(a, b):
+    """Plain extended Euclid: (g, x, y) with x a + y b = g."""
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+def _xgcd_nonnegative(a, b):
+    """(g, x, y) with x a + y b = g for a >= b >= 0, before normalization."""
+    if b.bit_length() <= LEHMER_THRESHOLD:
+        return _euclid(a, b)
+    M = _IDENTITY
+    while b.bit_length() > HGCD_THRESHOLD:
+        a, b, M1 = _hgcd(a, b)
+        M = _mul(M1, M)
+        if b:
+            a, b, M = _euclid_step(a, b, M)
+    a, b, M = _lehmer_reduce(a, b, LEHMER_THRESHOLD, M)
+    g, u, v = _euclid(a, b)
+    A, B, C, D = M
+    return g, u * A + v * C, u * B + v * D
+
+def extended_gcd(a, b):
+    """
+    Return (g, x, y) with a x + b y = g = gcd(a, b) >= 0, where x is the
+    smallest in absolute value (as plain extended Euclid gives).
+    """
+    a, b = _integer(a), _integer(b)
+    ua, ub = abs(a), abs(b)
+    if ua >= ub:
+        g, x, y = _xgcd_nonnegative(ua, ub)
+    else:
+        g, y, x = _xgcd_nonnegative(ub, ua)
+    if a < 0:
+        x = -x
+    if b < 0:
+        y = -y
+    if g and b:
+        # All solutions are (x - k |b|/g, y + k sign(b) a/g); pick x nearest zero
+        step = abs(b) // g
+        k, x = divmod(x, step)
+        if 2 * x > step:
+            x -= step
+            k += 1
+        if k:
+            y += k * (a // g) if b > 0 else -k * (a // g)
+    return g, x, y
+
+def bezout(*values):
+    """
+    Return (g, coefficients) with sum(c_i v_i) = g = gcd(values), extending
+    pairwise from left to right.
+    """
+    if not values:
+        raise ValueError("Bézout coefficients need at least one integer.")
+    values = [_integer(v) for v in values]
+    g, coefficients = abs(values[0]), [1 if values[0] >= 0 else -1]
+    for v in values[1:]:
+        g, x, y = extended_gcd(g, v)
+        coefficients = [c * x for c in coefficients] + [y]
+    return g, coefficients
+
+# -----------------------------------------------------------------------------
+# GCD and LCM of many arguments
+# -----------------------------------------------------------------------------
+
+def gcd(*values):
+    """GCD of any number of integers (0 for none)."""
+    return math.gcd(*[_integer(v) for v in values])
+
+def _lcm2(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return abs(a // math.gcd(a, b) * b)
+
+def lcm(*values):
+    """
+    LCM of any number of integers (1 for none, 0 if any is 0). Divides before
+    multiplying and combines the values pairwise in a balanced tree, so the
+    intermediate results stay as small, and the multiplications as balanced,
+    as possible.
+    """
+    values = [abs(_integer(v)) for v in values]
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [_lcm2(values[i], values[i + 1]) for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+# -----------------------------------------------------------------------------
+# Elementwise batches
+# -----------------------------------------------------------------------------
+
+def _as_array(x):
+    arr = np.asarray(x)
+    if arr.dtype.kind == "f" and not isinstance(x, np.ndarray):
+        # [-1, 2**63] fits neither int64 nor uint64 and comes back as float64;
+        # redo it as Python ints (genuine floats still fail below)
+        arr = np.array(x, dtype=object)
+    if arr.dtype.kind == "b":
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "u":
+        return arr.astype(object if arr.size and arr.max() > _INT64_MAX else np.int64)
+    if arr.dtype.kind == "i":
+        return arr.astype(np.int64, copy=False)
+    if arr.dtype == object:
+        for value in arr.flat:
+            _integer(value)
+        return arr
+    raise ValueError("GCD needs integer values.")
+
+def _pair(a, b):
+    a, b = np.broadcast_arrays(_as_array(a), _as_array(b))
+    if a.dtype == np.int64 and b.dtype == np.int64:
+        # abs(-2^63) overflows; such values go through Python ints
+        if (a == np.iinfo(np.int64).min).any() or (b == np.iinfo(np.int64).min).any():
+            return a.astype(object), b.astype(object), False
+        return a, b, True
+    return a.astype(object), b.astype(object), False
+
+def gcd_batch(a, b):
+    """Elementwise gcd of two broadcast arrays."""
+    a, b, int64 = _pair(a, b)
+    if int64:
+        return np.gcd(a, b)
+    return np.frompyfunc(math.gcd, 2, 1)(a, b)
+
+def lcm_batch(a, b):
+    """
+    Elementwise lcm; int64 results that would overflow are computed with
+    Python ints instead (the result is then an object array).
+    """
+    a, b, int64 = _pair(a, b)
+    if not int64:
+        return np.frompyfunc(_lcm2, 2, 1)(a, b)
+    a, b = np.abs(a), np.abs(b)
+    g = np.gcd(a, b)
+    left = a // np.where(g == 0, 1, g)
+    overflow = (b != 0) & (left > _INT64_MAX // np.where(b == 0, 1, b))
+    if overflow.any():
+        return np.frompyfunc(_lcm2, 2, 1)(a.astype(object), b.astype(object))
+    return left * b
+
+def _extended_gcd_int64(a, b):
+    """Vectorized extended Euclid on int64 arrays; returns (g, x, y) arrays (not normalized)."""
+    r0, r1 = np.abs(a), np.abs(b)
+    x0, x1 = np.ones_like(r0), np.zeros_like(r0)
+    y0, y1 = np.zeros_like(r0), np.ones_like(r0)
+    active = r1 != 0
+    while active.any():
+        q = r0 // np.where(active, r1, 1)
+        r0, r1 = np.where(active, r1, r0), np.where(active, r0 - q * r1, r1)
+        x0, x1 = np.where(active, x1, x0), np.where(active, x0 - q * x1, x1)
+        y0, y1 = np.where(active, y1, y0), np.where(active, y0 - q * y1, y1)
+        active = r1 != 0
+    return r0, np.where(a < 0, -x0, x0), np.where(b < 0, -y0, y0)
+
+def extended_gcd_batch(a, b):
+    """Elementwise extended gcd; returns arrays (g, x, y) with a x + b y = g."""
+    a, b, int64 = _pair(a, b)
+    if int64:
+        return _extended_gcd_int64(a, b)
+    g, x, y = np.frompyfunc(extended_gcd, 2, 3)(a, b)
+    return g, x, y
@@ -12,6 +12,7 @@ import complex_solver_functions
 import complex_visualization
 import advanced_math_operations
 import prime_calculator as number_properties  # Use prime_calculator as number_properties
+import modular_calculator
 
 def assign_advanced_math_functions():
     """Assign functions from advanced_math_operations to ComplexSolverApp."""
@@ -46,6 +47,10 @@ def assign_advanced_math_functions():
 def assign_complex_solver_functions():
     """Assign functions from complex_solver_functions to ComplexSolverApp."""
     ComplexSolverApp.solve_complex = complex_solver_functions.solve_complex
+    ComplexSolverApp.display_complex_results = complex_solver_functions.display_complex_results
+    ComplexSolverApp.run_complex_batch = complex_solver_functions.run_complex_batch
+    ComplexSolverApp.display_complex_batch = complex_solver_functions.display_complex_batch
+    ComplexSolverApp.save_complex_batch = complex_solver_functions.save_complex_batch
 
 def assign_visualization_functions():
     """Assign functions from complex_visualization to ComplexSolverApp."""
@@ -53,6 +58,7 @@ def assign_visualization_functions():
     ComplexSolverApp.setup_plot = complex_visualization.setup_plot
     ComplexSolverApp.update_plot = complex_visualization.update_plot
     ComplexSolverApp.add_to_visualization = complex_visualization.add_to_visualization
+    ComplexSolverApp.add_expression_curve = complex_visualization.add_expression_curve
     ComplexSolverApp.update_legend = complex_visualization.update_legend
     ComplexSolverApp.add_manual_complex = complex_visualization.add_manual_complex
     ComplexSolverApp.clear_visualization = complex_visualization.clear_visualization
@@ -77,7 +83,10 @@ def assign_number_properties_functions():
     logging a warning if any expected function is missing."""
     expected_functions = [
         "create_number_properties_tab", "analyze_number", "create_result_row",
-        "is_prime", "parse_input", "clear_properties_history", "export_properties_result"
+        "is_prime", "parse_input", "clear_properties_history", "export_properties_result",
+        "create_text_row", "clear_properties_results", "set_properties_status",
+        "cancel_properties_analysis", "display_prime_range", "display_number_analysis",
+        "show_property_update", "display_gcd_lcm"
     ]
     for func_name in expected_functions:
         if hasattr(number_properties, func_name):
@@ -85,6 +94,18 @@ def assign_number_properties_functions():
         else:
             logging.warning(f"{func_name} not found in number_properties")
 
+def assign_modular_arithmetic_functions():
+    """Assign functions from modular_calculator to ComplexSolverApp."""
+    expected_functions = [
+        "create_modular_arithmetic_tab", "update_modular_interface",
+        "calculate_modular_operation", "display_modular_result", "cancel_modular_operation"
+    ]
+    for func_name in expected_functions:
+        if hasattr(modular_calculator, func_name):
+            setattr(ComplexSolverApp, func_name, getattr(modular_calculator, func_name))
+        else:
+            logging.warning(f"{func_name} not found in modular_calculator")
+
 def create_tabs(app):
     """Create the tabs for the application if the functions exist."""
     # Create visualization tab
@@ -105,6 +126,12 @@ def create_tabs(app):
     else:
         logging.warning("Number Properties tab not created because create_number_properties_tab is missing.")
 
+    # Create modular arithmetic tab
+    if hasattr(app, "create_modular_arithmetic_tab"):
+        app.create_modular_arithmetic_tab()
+    else:
+        logging.warning("Modular Arithmetic tab function is missing.")
+
 # Fixed toggle_dark_mode function to properly handle text colors
 def patched_toggle_dark_mode(self):
     """Toggle between light and dark mode with proper text handling."""
@@ -147,6 +174,7 @@ def main():
     assign_visualization_functions()
     assign_advanced_math_functions()
     assign_number_properties_functions()
+    assign_modular_arithmetic_functions()
     
     # Create the tabs if the functions are available
     create_tabs(app)
@@ -0,0 +1,415 @@
+import operator
+
+import numpy as np
+
+import primality
+import number_analysis
+import gcd_algorithms
+
+# -----------------------------------------------------------------------------
+# Modular arithmetic
+# Modular exponentiation, inverses (gcd_algorithms.extended_gcd), Chinese
+# remaindering with arbitrary (not necessarily coprime) moduli, Jacobi and
+# Legendre symbols and square roots modulo a prime (Tonelli-Shanks, or
+# Cipolla when p - 1 is divisible by a large power of two).
+#
+# Every operation takes Python ints and returns Python ints, or takes
+# sequences / NumPy arrays (broadcast against each other) and returns NumPy
+# arrays. When every modulus is below INT64_MODULUS_LIMIT the vector paths
+# run as int64 kernels, so a million (a, e, m) triples are a few dozen array
+# operations; larger values fall back to object arrays of Python ints.
+# -----------------------------------------------------------------------------
+
+# Residues below 2^31 multiply without overflowing int64
+INT64_MODULUS_LIMIT = 1 << 31
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+def _integer(x, name):
+    try:
+        return operator.index(x)
+    except TypeError:
+        raise ValueError(f"{name} must be an integer, not {x!r}.")
+
+def _modulus(m):
+    m = _integer(m, "The modulus")
+    if m < 1:
+        raise ValueError(f"The modulus must be positive, not {m}.")
+    return m
+
+def _require_prime(p):
+    if not number_analysis.is_prime(p):
+        raise ValueError(f"{p} is not prime.")
+
+def is_vector(x):
+    return isinstance(x, (list, tuple, np.ndarray))
+
+def _as_array(x):
+    """int64 array when the values fit, else an object array of Python ints."""
+    arr = np.asarray(x)
+    if arr.dtype.kind == "f" and not isinstance(x, np.ndarray):
+        # NumPy infers float64 for Python ints of mixed sign beyond int64
+        # (e.g. [-1, 2**63]); keep them exact (the object path rejects real floats)
+        arr = np.array(x, dtype=object)
+    if arr.dtype.kind == "b":
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "u":
+        if arr.size and arr.max() > _INT64_MAX:
+            return arr.astype(object)
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "i":
+        return arr.astype(np.int64, copy=False)
+    if arr.dtype == object:
+        for value in arr.flat:
+            _integer(value, "Every value")
+        return arr
+    raise ValueError("Modular arithmetic needs integer values.")
+
+def _vector_args(*args):
+    """Broadcast the arguments; the second result says whether they are all int64."""
+    arrays = np.broadcast_arrays(*[_as_array(x) for x in args])
+    arrays = [np.array(a) for a in arrays]  # writable copies
+    return arrays, all(a.dtype == np.int64 for a in arrays)
+
+def _check_moduli(m):
+    if m.size and (m < 1).any():
+        raise ValueError(f"Every modulus must be positive (got {m[m < 1].flat[0]}).")
+
+def _small(m):
+    """True if an int64 modulus array is small enough for the int64 kernels."""
+    return m.dtype == np.int64 and (not m.size or m.max() < INT64_MODULUS_LIMIT)
+
+def _first_failure(mask, message, *arrays):
+    """Raise ValueError describing how many elements fail and the first one."""
+    index = tuple(int(i) for i in np.argwhere(mask)[0])
+    values = ", ".join(str(a[index]) for a in arrays)
+    count = int(np.count_nonzero(mask))
+    prefix = f"{count} of {mask.size} values: " if mask.size > 1 else ""
+    raise ValueError(f"{prefix}{message} (first at index {index[0] if len(index) == 1 else index}: {values}).")
+
+# -----------------------------------------------------------------------------
+# Inverses
+# -----------------------------------------------------------------------------
+
+def _inverse_scalar(a, m):
+    a = _integer(a, "The value")
+    m = _modulus(m)
+    g, x, _ = gcd_algorithms.extended_gcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"{a} has no inverse modulo {m} (gcd is {g}).")
+    return x % m
+
+def _inverse_int64(a, m):
+    """Vectorized extended Euclid; returns (gcd, inverse-or-garbage) arrays."""
+    r0, r1 = m.copy(), a % m
+    t0, t1 = np.zeros_like(m), np.ones_like(m)
+    active = r1 != 0
+    while active.any():
+        q = r0 // np.where(active, r1, 1)
+        r0, r1 = np.where(active, r1, r0), np.where(active, r0 - q * r1, r1)
+        t0, t1 = np.where(active, t1, t0), np.where(active, t0 - q * t1, t1)
+        active = r1 != 0
+    return r0, t0 % m
+
+def inverse(a, m):
+    """Inverse of a modulo m; raises ValueError if gcd(a, m) != 1."""
+    if not (is_vector(a) or is_vector(m)):
+        return _inverse_scalar(a, m)
+    (a, m), int64 = _vector_args(a, m)
+    _check_moduli(m)
+    if int64:
+        g, inv = _inverse_int64(a, m)
+        if (g != 1).any():
+            _first_failure(g != 1, "no inverse", a, m)
+        return inv
+    g = np.gcd(a % m, m)
+    if (g != 1).any():
+        _first_failure(g != 1, "no inverse", a, m)
+    return np.frompyfunc(_inverse_scalar, 2, 1)(a, m)
+
+# -----------------------------------------------------------------------------
+# Modular exponentiation
+# -----------------------------------------------------------------------------
+
+def _modpow_scalar(a, e, m):
+    a = _integer(a, "The base")
+    e = _integer(e, "The exponent")
+    m = _modulus(m)
+    if e < 0:
+        a, e = _inverse_scalar(a, m), -e
+    return pow(a, e, m)
+
+def _modpow_int64(a, e, m):
+    """Right-to-left square and multiply over whole arrays (m < 2^31, e >= 0)."""
+    result = np.ones_like(a) % m
+    base = a % m
+    e = e.copy()
+    while True:
+        odd = (e & 1).astype(bool)
+        result = np.where(odd, result * base % m, result)
+        e >>= 1
+        if not e.any():
+            return result
+        base = base * base % m
+
+def modpow(a, e, m):
+    """a^e mod m; a negative exponent uses the inverse of a."""
+    if not (is_vector(a) or is_vector(e) or is_vector(m)):
+        return _modpow_scalar(a, e, m)
+    (a, e, m), int64 = _vector_args(a, e, m)
+    _check_moduli(m)
+    if not (int64 and _small(m)):
+        return np.frompyfunc(_modpow_scalar, 3, 1)(a, e, m)
+    negative = e < 0
+    if negative.any():
+        g, inv = _inverse_int64(a, m)
+        if (negative & (g != 1)).any():
+            _first_failure(negative & (g != 1), "negative exponent of a non-invertible base", a, m)
+        a = np.where(negative, inv, a)
+        e = np.abs(e)
+    return _modpow_int64(a, e, m)
+
+# -----------------------------------------------------------------------------
+# Chinese remainder theorem
+# -----------------------------------------------------------------------------
+
+def _crt_scalar(residues, moduli):
+    if len(residues) != len(moduli):
+        raise ValueError("CRT needs one modulus per residue.")
+    x, M = 0, 1
+    for r, m in zip(residues, moduli):
+        r = _integer(r, "Every residue")
+        m = _modulus(m)
+        # x + M k = r (mod m)  <=>  (M/g) k = (r - x)/g (mod m/g)
+        g, p, _ = gcd_algorithms.extended_gcd(M, m)
+        if (r - x) % g:
+            raise ValueError(f"The congruences are inconsistent: x = {x} (mod {M}) and x = {r} (mod {m}).")
+        step = m // g
+        x = (x + (r - x) // g * p % step * M) % (M * step)
+        M *= step
+    return x, M
+
+def crt(residues, moduli):
+    """
+    Solve x = r_i (mod m_i) for coprime or non-coprime moduli.
+
+    With a 1-D list of residues returns (x, M), 0 <= x < M = lcm(m_i), and
+    raises ValueError if the congruences are inconsistent. With a 2-D array
+    each row is one system (moduli may be shared, 1-D, or per row, 2-D) and
+    x and M are arrays.
+    """
+    if np.ndim(residues) <= 1 and np.ndim(moduli) <= 1:
+        return _crt_scalar(np.ravel(np.asarray(residues, dtype=object)).tolist(),
+                           np.ravel(np.asarray(moduli, dtype=object)).tolist())
+    (r, m), int64 = _vector_args(residues, moduli)
+    if r.ndim != 2:
+        raise ValueError("Vector CRT needs a 2-D array of residues, one system per row.")
+    _check_moduli(m)
+    x = np.zeros(r.shape[0], dtype=np.int64 if int64 else object)
+    M = np.ones(r.shape[0], dtype=x.dtype)
+    for j in range(r.shape[1]):
+        rj, mj = r[:, j], m[:, j]
+        if x.dtype == np.int64 and (mj.max() >= INT64_MODULUS_LIMIT
+                                   or M.max() >= (1 << 62) // max(int(mj.max()), 1)):
+            # The next modulus would overflow int64: continue with Python ints
+            x, M, rj, mj = x.astype(object), M.astype(object), rj.astype(object), mj.astype(object)
+        rj = rj % mj
+        g = np.gcd(M, mj)
+        d = rj - x
+        bad = d % g != 0
+        if bad.any():
+            _first_failure(bad, "inconsistent congruences", x, M, rj, mj)
+        step = mj // g
+        if x.dtype == np.int64:
+            _, p = _inverse_int64((M // g) % step, step)
+        else:
+            p = np.frompyfunc(_inverse_scalar, 2, 1)((M // g) % step, step)
+        x = x + (d // g) % step * p % step * M
+        M = M * step
+        x %= M
+    return x, M
+
+# -----------------------------------------------------------------------------
+# Jacobi and Legendre symbols
+# -----------------------------------------------------------------------------
+
+def _jacobi_scalar(a, n):
+    return primality.jacobi(_integer(a, "The value"), _integer(n, "The modulus"))
+
+def _jacobi_int64(a, n):
+    """Binary Jacobi algorithm over whole arrays (odd positive n)."""
+    a = a % n
+    result = (n == 1).astype(np.int64)
+    idx = np.flatnonzero(a)
+    a, n = a.flat[idx], n.flat[idx]
+    sign = np.ones_like(a)
+    while idx.size:
+        # Strip all factors of two at once: (2/n) = -1 iff n = 3, 5 (mod 8)
+        twos = np.log2(a & -a).astype(np.int64)
+        a >>= twos
+        n8 = n & 7
+        flip = (twos & 1 == 1) & ((n8 == 3) | (n8 == 5))
+        # Reciprocity: swap, flipping the sign when both are 3 (mod 4)
+        flip ^= (a & 3 == 3) & (n & 3 == 3)
+        sign = np.where(flip, -sign, sign)
+        a, n = n % a, a
+        done = a == 0
+        if done.any():
+            result.flat[idx[done]] = np.where(n[done] == 1, sign[done], 0)
+            keep = ~done
+            idx, a, n, sign = idx[keep], a[keep], n[keep], sign[keep]
+    return result
+
+def jacobi(a, n):
+    """Jacobi symbol (a/n) for odd positive n."""
+    if not (is_vector(a) or is_vector(n)):
+        return _jacobi_scalar(a, n)
+    (a, n), int64 = _vector_args(a, n)
+    bad = (n <= 0) | (n % 2 == 0)
+    if bad.any():
+        _first_failure(bad, "the Jacobi symbol needs an odd positive modulus", n)
+    if int64:
+        return _jacobi_int64(a, n)
+    return np.frompyfunc(_jacobi_scalar, 2, 1)(a, n)
+
+def _require_primes(p):
+    """Check every distinct modulus in an array once."""
+    for value in np.unique(p):
+        _require_prime(int(value))
+
+def legendre(a, p):
+    """Legendre symbol (a/p) for an odd prime p."""
+    if not (is_vector(a) or is_vector(p)):
+        p = _integer(p, "The modulus")
+        if p == 2:
+            raise ValueError("The Legendre symbol needs an odd prime.")
+        _require_prime(p)
+        return _jacobi_scalar(a, p)
+    (a, p), _ = _vector_args(a, p)
+    if (p == 2).any():
+        raise ValueError("The Legendre symbol needs an odd prime.")
+    _require_primes(p)
+    return jacobi(a, p)
+
+# -----------------------------------------------------------------------------
+# Square roots modulo a prime
+# -----------------------------------------------------------------------------
+
+def _non_residue(p):
+    """Smallest quadratic non-residue modulo an odd prime p."""
+    z = 2
+    while primality.jacobi(z, p) != -1:
+        z += 1
+    return z
+
+def _two_adic(n):
+    """(q, s) with n = q 2^s, q odd."""
+    s = (n & -n).bit_length() - 1
+    return n >> s, s
+
+def _tonelli_shanks(a, p):
+    q, s = _two_adic(p - 1)
+    c = pow(_non_residue(p), q, p)
+    t = pow(a, q, p)
+    r = pow(a, (q + 1) // 2, p)
+    m = s
+    while t != 1:
+        # Least i with t^(2^i) = 1
+        i, tt = 0, t
+        while tt != 1:
+            tt = tt * tt % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c = i, b * b % p
+        t, r = t * c % p, r * b % p
+    return r
+
+def _cipolla(a, p):
+    # Find t with w = t^2 - a a non-residue and compute (t + sqrt(w))^((p+1)/2) in F_p^2
+    t = 1
+    while primality.jacobi(t * t - a, p) != -1:
+        t += 1
+    w = (t * t - a) % p
+    x, y = 1, 0          # result = x + y sqrt(w)
+    bx, by = t, 1        # base
+    e = (p + 1) // 2
+    while e:
+        if e & 1:
+            x, y = (x * bx + y * by % p * w) % p, (x * by + y * bx) % p
+        bx, by = (bx * bx + by * by % p * w) % p, 2 * bx * by % p
+        e >>= 1
+    return x
+
+def _uses_cipolla(p, s):
+    # Tonelli-Shanks costs about log p + s^2/2 multiplications, Cipolla about
+    # 3 log p (multiplications in F_p^2); switch when s^2 > 4 log p
+    return s * s > 4 * p.bit_length()
+
+def _sqrt_mod_scalar(a, p, checked=False):
+    a = _integer(a, "The value")
+    p = _integer(p, "The modulus")
+    if not checked:
+        _require_prime(p)
+    a %= p
+    if a == 0 or p == 2:
+        return a
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    _, s = _two_adic(p - 1)
+    x = _cipolla(a, p) if _uses_cipolla(p, s) else _tonelli_shanks(a, p)
+    return min(x, p - x)
+
+def _sqrt_mod_int64(a, p):
+    """Tonelli-Shanks over whole arrays (p < 2^31 prime); -1 marks non-residues."""
+    a = a % p
+    result = np.where((a == 0) | (p == 2), a, -1)
+    euler = _modpow_int64(a, (p - 1) // 2, p)
+    todo = np.flatnonzero((result == -1) & (euler == 1))
+    if not todo.size:
+        return result
+    av, pv = a.flat[todo], p.flat[todo]
+    q, s = pv - 1, np.zeros_like(pv)
+    even = q & 1 == 0
+    while even.any():
+        q = np.where(even, q >> 1, q)
+        s += even
+        even = q & 1 == 0
+    primes, index = np.unique(pv, return_inverse=True)
+    z = np.array([_non_residue(int(v)) for v in primes], dtype=np.int64)[index]
+    c = _modpow_int64(z, q, pv)
+    t = _modpow_int64(av, q, pv)
+    r = _modpow_int64(av, (q + 1) // 2, pv)
+    m = s
+    active = t != 1
+    while active.any():
+        i, tt, searching = np.zeros_like(m), t, active.copy()
+        while searching.any():
+            tt = np.where(searching, tt * tt % pv, tt)
+            i += searching
+            searching &= tt != 1
+        k = np.where(active, m - i - 1, 0)
+        b = c
+        while (k > 0).any():
+            b = np.where(k > 0, b * b % pv, b)
+            k = np.maximum(k - 1, 0)
+        m = np.where(active, i, m)
+        c = np.where(active, b * b % pv, c)
+        t = np.where(active, t * c % pv, t)
+        r = np.where(active, r * b % pv, r)
+        active = t != 1
+    result.flat[todo] = np.minimum(r, pv - r)
+    return result
+
+def sqrt_mod(a, p):
+    """
+    The smaller square root of a modulo the prime p, or None if a is a
+    quadratic non-residue. Vector results hold -1 for non-residues.
+    """
+    if not (is_vector(a) or is_vector(p)):
+        return _sqrt_mod_scalar(a, p)
+    (a, p), int64 = _vector_args(a, p)
+    _require_primes(p)
+    if int64 and _small(p):
+        return _sqrt_mod_int64(a, p)
+    root = np.frompyfunc(lambda x, q: _sqrt_mod_scalar(x, q, checked=True), 2, 1)(a, p)
+    return np.where(np.equal(root, None), -1, root)
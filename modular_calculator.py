@@ -0,0 +1,274 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import logging
+
+import numpy as np
+
+import number_parser
+import number_analysis
+import modular_arithmetic
+import discrete_log
+import background_tasks
+
+# -----------------------------------------------------------------------------
+# Modular Arithmetic tab
+# Each field takes one integer expression or a comma-separated list of them;
+# lists are broadcast against single values (e.g. a = 2, 3, 5 with m = 7)
+# and run through the vector paths of modular_arithmetic in one call.
+# -----------------------------------------------------------------------------
+
+# operation -> input field labels
+MODULAR_OPERATIONS = {
+    "Modular Power a^e mod m": ("Base a:", "Exponent e:", "Modulus m:"),
+    "Inverse a⁻¹ mod m": ("Value a:", "Modulus m:"),
+    "Chinese Remainder Theorem": ("Residues r₁, r₂, …:", "Moduli m₁, m₂, …:"),
+    "Jacobi Symbol (a/n)": ("Value a:", "Odd modulus n:"),
+    "Legendre Symbol (a/p)": ("Value a:", "Odd prime p:"),
+    "Square Root mod p": ("Value a:", "Prime p:"),
+    "Discrete Log g^x ≡ h (mod p)": ("Base g:", "Target h:", "Prime p:"),
+}
+
+MODULAR_DISPLAY_LIMIT = 500
+# Discrete logarithms give up after this many seconds
+DISCRETE_LOG_TIME_LIMIT = 300.0
+
+def create_modular_arithmetic_tab(self):
+    """Create the Modular Arithmetic tab."""
+    mod_frame = ttk.Frame(self.notebook, style="TFrame", padding="20")
+    self.notebook.add(mod_frame, text="Modular Arithmetic")
+
+    # Header
+    header_label = ttk.Label(mod_frame, text="Modular Arithmetic", style="Header.TLabel")
+    header_label.grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 15))
+
+    # Operation selection
+    op_label = ttk.Label(mod_frame, text="Operation:", style="TLabel")
+    op_label.grid(row=1, column=0, sticky="w", pady=(0, 10))
+    self.mod_operation_var = tk.StringVar(value=next(iter(MODULAR_OPERATIONS)))
+    op_combo = ttk.Combobox(mod_frame, textvariable=self.mod_operation_var, state="readonly",
+                            values=list(MODULAR_OPERATIONS), width=30)
+    op_combo.grid(row=1, column=1, sticky="w", pady=(0, 10))
+    op_combo.bind("<<ComboboxSelected>>", lambda event: self.update_modular_interface())
+
+    # Input fields; labels and visibility follow the operation
+    self.mod_field_labels = []
+    self.mod_field_entries = []
+    self.mod_field_vars = []
+    for i in range(3):
+        label = ttk.Label(mod_frame, text="", style="TLabel")
+        label.grid(row=2 + i, column=0, sticky="w", pady=2)
+        var = tk.StringVar()
+        entry = ttk.Entry(mod_frame, textvariable=var, width=50)
+        entry.grid(row=2 + i, column=1, columnspan=2, sticky="ew", pady=2)
+        entry.bind("<Return>", lambda event: self.calculate_modular_operation())
+        self.mod_field_labels.append(label)
+        self.mod_field_entries.append(entry)
+        self.mod_field_vars.append(var)
+
+    # Discrete log options: BSGS table budget (time-memory tradeoff) and rho cycle detection
+    self.mod_dlog_frame = ttk.Frame(mod_frame, style="TFrame")
+    self.mod_dlog_frame.grid(row=5, column=0, columnspan=3, sticky="w", pady=(5, 0))
+    ttk.Label(self.mod_dlog_frame, text="BSGS memory (MB):", style="TLabel").grid(row=0, column=0, sticky="w")
+    self.mod_dlog_memory_var = tk.StringVar(value=str(discrete_log.DEFAULT_MEMORY_LIMIT // (1024 * 1024)))
+    ttk.Spinbox(self.mod_dlog_frame, from_=0, to=4096, increment=16, width=6,
+                textvariable=self.mod_dlog_memory_var).grid(row=0, column=1, sticky="w", padx=(5, 15))
+    ttk.Label(self.mod_dlog_frame, text="Rho cycle detection:", style="TLabel").grid(row=0, column=2, sticky="w")
+    self.mod_dlog_cycle_var = tk.StringVar(value="brent")
+    for i, cycle in enumerate(("brent", "floyd")):
+        ttk.Radiobutton(self.mod_dlog_frame, text=cycle.capitalize(), value=cycle,
+                        variable=self.mod_dlog_cycle_var).grid(row=0, column=3 + i, sticky="w", padx=(5, 0))
+
+    # Calculate / Cancel buttons and status
+    buttons_frame = ttk.Frame(mod_frame, style="TFrame")
+    buttons_frame.grid(row=6, column=0, columnspan=3, sticky="w", pady=(10, 0))
+    calc_btn = ttk.Button(buttons_frame, text="Calculate", command=self.calculate_modular_operation)
+    calc_btn.grid(row=0, column=0, sticky="w")
+    self.mod_cancel_btn = ttk.Button(buttons_frame, text="Cancel", command=self.cancel_modular_operation)
+    self.mod_cancel_btn.grid(row=0, column=1, sticky="w", padx=(10, 0))
+    self.mod_cancel_btn.state(["disabled"])
+    self.mod_status_var = tk.StringVar()
+    status_label = ttk.Label(buttons_frame, textvariable=self.mod_status_var, style="TLabel")
+    status_label.grid(row=0, column=2, sticky="w", padx=(10, 0))
+    self.mod_runner = background_tasks.TkTaskRunner(self.root)
+
+    # Results
+    results_frame = ttk.Frame(mod_frame, style="TFrame")
+    results_frame.grid(row=7, column=0, columnspan=3, pady=(15, 0), sticky="nsew")
+    self.mod_results_text = tk.Text(results_frame, height=15, width=80, wrap="word", state="disabled")
+    results_scroll = ttk.Scrollbar(results_frame, orient="vertical", command=self.mod_results_text.yview)
+    self.mod_results_text.configure(yscrollcommand=results_scroll.set)
+    self.mod_results_text.grid(row=0, column=0, sticky="nsew")
+    results_scroll.grid(row=0, column=1, sticky="ns")
+    results_frame.columnconfigure(0, weight=1)
+    results_frame.rowconfigure(0, weight=1)
+
+    # Help text
+    help_text = (
+        "• Each field takes an integer expression such as 2**127 - 1\n"
+        "• Comma-separated lists compute many values at once: a = 2, 3, 5 with m = 7\n"
+        "• CRT moduli need not be coprime; inconsistent systems are reported\n"
+        "• Square roots show the smaller root x; the other is p − x\n"
+        "• Discrete logs use Pohlig–Hellman over p − 1, then baby-step giant-step while the\n"
+        "  table fits in the memory budget and Pollard rho (constant memory) beyond it"
+    )
+    help_label = ttk.Label(mod_frame, text=help_text, style="TLabel", justify="left")
+    help_label.grid(row=8, column=0, columnspan=3, sticky="w", pady=(15, 0))
+
+    mod_frame.columnconfigure(1, weight=1)
+    mod_frame.rowconfigure(7, weight=1)
+    self.update_modular_interface()
+
+def update_modular_interface(self):
+    """Show the input fields used by the selected operation."""
+    labels = MODULAR_OPERATIONS[self.mod_operation_var.get()]
+    for i, (label, entry) in enumerate(zip(self.mod_field_labels, self.mod_field_entries)):
+        if i < len(labels):
+            label.configure(text=labels[i])
+            label.grid()
+            entry.grid()
+        else:
+            label.grid_remove()
+            entry.grid_remove()
+    if self.mod_operation_var.get() == "Discrete Log g^x ≡ h (mod p)":
+        self.mod_dlog_frame.grid()
+    else:
+        self.mod_dlog_frame.grid_remove()
+
+def _argument(values):
+    """A single value stays a Python int; lists go to the vector paths."""
+    return values[0] if len(values) == 1 else values
+
+def compute_discrete_log(task, fields, memory_mb, cycle):
+    """Solve g^x = h (mod p) with progress reports and cancellation (worker thread)."""
+    if any(len(values) != 1 for values in fields):
+        raise ValueError("Discrete logarithms take a single g, h and p.")
+    g, h, p = (values[0] for values in fields)
+    try:
+        x = discrete_log.discrete_log(g, h, p, memory_limit=memory_mb * 1024 * 1024,
+                                      time_limit=DISCRETE_LOG_TIME_LIMIT, cancel=task.is_cancelled,
+                                      progress=task.report, cycle=cycle)
+    except discrete_log.DiscreteLogCancelled:
+        task.check_cancelled()
+        raise ValueError(f"No result within {DISCRETE_LOG_TIME_LIMIT:.0f} seconds.")
+    return {"operation": "Discrete Log g^x ≡ h (mod p)", "fields": fields, "result": x}
+
+def compute_modular_operation(task, operation, texts, options=None):
+    """Parse the fields and run one operation (worker thread)."""
+    fields = [number_parser.parse_integer_list(text) for text in texts]
+    if operation == "Discrete Log g^x ≡ h (mod p)":
+        return compute_discrete_log(task, fields, *options)
+    if operation == "Chinese Remainder Theorem":
+        residues, moduli = fields
+        return {"operation": operation, "fields": fields,
+                "result": modular_arithmetic.crt(residues, moduli)}
+    length = max(len(values) for values in fields)
+    if any(len(values) not in (1, length) for values in fields):
+        raise ValueError("Lists must have the same length (or a single value).")
+    func = {
+        "Modular Power a^e mod m": modular_arithmetic.modpow,
+        "Inverse a⁻¹ mod m": modular_arithmetic.inverse,
+        "Jacobi Symbol (a/n)": modular_arithmetic.jacobi,
+        "Legendre Symbol (a/p)": modular_arithmetic.legendre,
+        "Square Root mod p": modular_arithmetic.sqrt_mod,
+    }[operation]
+    result = func(*[_argument(values) for values in fields])
+    if isinstance(result, np.ndarray):
+        result = [int(x) for x in result.tolist()]
+    return {"operation": operation, "fields": fields, "length": length, "result": result}
+
+def _format_line(operation, args, value):
+    fmt = number_analysis.format_number
+    if operation == "Modular Power a^e mod m":
+        a, e, m = args
+        return f"{fmt(a)}^{fmt(e)} mod {fmt(m)} = {fmt(value)}"
+    if operation == "Inverse a⁻¹ mod m":
+        a, m = args
+        return f"{fmt(a)}⁻¹ mod {fmt(m)} = {fmt(value)}"
+    if operation == "Square Root mod p":
+        a, p = args
+        if value is None or value == -1:
+            return f"{fmt(a)} is a quadratic non-residue mod {fmt(p)}"
+        return f"√{fmt(a)} mod {fmt(p)} = ±{fmt(value)}"
+    a, n = args
+    return f"({fmt(a)}/{fmt(n)}) = {value}"
+
+def calculate_modular_operation(self):
+    """Run the selected operation on a background thread."""
+    operation = self.mod_operation_var.get()
+    count = len(MODULAR_OPERATIONS[operation])
+    texts = [var.get().strip() for var in self.mod_field_vars[:count]]
+    if not all(texts):
+        messagebox.showerror("Error", "Please fill in every field.")
+        return
+    options = None
+    if operation == "Discrete Log g^x ≡ h (mod p)":
+        try:
+            memory_mb = int(self.mod_dlog_memory_var.get())
+        except ValueError:
+            memory_mb = -1
+        if memory_mb < 0:
+            messagebox.showerror("Error", "The BSGS memory must be a non-negative number of MB.")
+            return
+        options = (memory_mb, self.mod_dlog_cycle_var.get())
+
+    def finish(status=""):
+        self.mod_status_var.set(status)
+        self.mod_cancel_btn.state(["disabled"])
+
+    def on_error(e):
+        finish()
+        if isinstance(e, ValueError):
+            messagebox.showerror("Error", str(e))
+        else:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    def on_done(result):
+        finish()
+        try:
+            self.display_modular_result(result)
+        except Exception as e:
+            logging.exception("Error displaying modular arithmetic result")
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    self.mod_status_var.set("Working…")
+    self.mod_cancel_btn.state(["!disabled"])
+    self.mod_runner.submit(compute_modular_operation, operation, texts, options,
+                           on_done=on_done, on_error=on_error,
+                           on_cancel=lambda: finish("Cancelled"),
+                           on_progress=lambda status: self.mod_status_var.set(f"{status or 'Working'}…"))
+
+def cancel_modular_operation(self):
+    """Cancel the calculation in progress, if any."""
+    if hasattr(self, 'mod_runner'):
+        self.mod_runner.cancel()
+
+def display_modular_result(self, result):
+    """Write the result of compute_modular_operation to the results box."""
+    operation, fields = result["operation"], result["fields"]
+    fmt = number_analysis.format_number
+    if operation == "Discrete Log g^x ≡ h (mod p)":
+        (g,), (h,), (p,) = fields
+        x = result["result"]
+        if x is None:
+            lines = [f"{fmt(h)} is not a power of {fmt(g)} modulo {fmt(p)}"]
+        else:
+            lines = [f"{fmt(g)}^x ≡ {fmt(h)} (mod {fmt(p)})", "", f"x = {fmt(x)}"]
+    elif operation == "Chinese Remainder Theorem":
+        x, M = result["result"]
+        lines = [f"x ≡ {fmt(r)} (mod {fmt(m)})" for r, m in zip(*fields)]
+        lines.append("")
+        lines.append(f"x ≡ {fmt(x)} (mod {fmt(M)})")
+    else:
+        length = result["length"]
+        values = result["result"] if isinstance(result["result"], list) else [result["result"]]
+        lines = []
+        for i in range(min(length, MODULAR_DISPLAY_LIMIT)):
+            args = [column[i] if len(column) > 1 else column[0] for column in fields]
+            lines.append(_format_line(operation, args, values[i]))
+        if length > MODULAR_DISPLAY_LIMIT:
+            lines.append(f"... ({length - MODULAR_DISPLAY_LIMIT} more)")
+
+    self.mod_results_text.configure(state="normal")
+    self.mod_results_text.delete("1.0", tk.END)
+    self.mod_results_text.insert(tk.END, "\n".join(lines))
+    self.mod_results_text.configure(state="disabled")
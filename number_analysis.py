@@ -0,0 +1,172 @@
+import time
+import fractions
+import decimal
+
+import primality
+import factorization
+import arithmetic_functions
+import prime_table
+import analysis_cache
+import continued_fractions
+
+# -----------------------------------------------------------------------------
+# Exact number classification
+# Works natively on int and Fraction (Decimal is converted to Fraction
+# exactly), so integers of any size are classified without a float round-trip.
+# Only float input, which can only come from a non-integer power, is treated
+# as approximate; its rationality is decided from its continued fraction
+# (see continued_fractions.float_is_rational).
+# -----------------------------------------------------------------------------
+
+PROPERTY_NAMES = [
+    "Complex Number", "Real Number", "Rational Number", "Irrational Number",
+    "Integer", "Whole Number", "Natural Number", "Positive", "Negative",
+    "Zero", "Even", "Odd", "Prime", "Composite",
+]
+
+def to_exact(num):
+    """Convert a parsed real value to int or Fraction where that is exact; floats are kept."""
+    if isinstance(num, complex):
+        if num.imag != 0:
+            return num
+        num = num.real
+    if isinstance(num, bool):
+        return int(num)
+    if isinstance(num, int):
+        return num
+    if isinstance(num, decimal.Decimal):
+        num = fractions.Fraction(num)
+    if isinstance(num, fractions.Fraction):
+        return num.numerator if num.denominator == 1 else num
+    if isinstance(num, float) and num.is_integer():
+        return int(num)
+    return num
+
+_cached_is_prime = analysis_cache.prime_cache.cached(primality.is_prime)
+
+def is_prime(n):
+    """
+    Check if n is prime: an O(1) lookup in the on-disk prime table below its
+    bound, cached Miller-Rabin / Baillie-PSW (see primality.py) above it.
+    """
+    known = prime_table.lookup(n)
+    if known is not None:
+        return known
+    return _cached_is_prime(n)
+
+def classify(num, is_prime=is_prime):
+    """
+    Return a dict mapping every name in PROPERTY_NAMES to True/False.
+
+    num may be int, Fraction, Decimal, float or complex; is_prime is the
+    primality predicate applied to natural numbers.
+    """
+    num = to_exact(num)
+    props = dict.fromkeys(PROPERTY_NAMES, False)
+
+    if isinstance(num, complex):
+        props["Complex Number"] = True
+        return props
+
+    props["Real Number"] = True
+    if isinstance(num, int):
+        sign = (num > 0) - (num < 0)
+        props["Rational Number"] = True
+        props["Integer"] = True
+        props["Whole Number"] = sign >= 0
+        props["Natural Number"] = sign > 0
+        props["Even"] = not num & 1
+        props["Odd"] = bool(num & 1)
+        if num > 1:
+            prime = is_prime(num)
+            props["Prime"] = prime
+            props["Composite"] = not prime
+    elif isinstance(num, fractions.Fraction):
+        sign = (num.numerator > 0) - (num.numerator < 0)
+        props["Rational Number"] = True
+    else:
+        sign = (num > 0) - (num < 0)
+        props["Rational Number"] = continued_fractions.float_is_rational(num)
+
+    props["Irrational Number"] = not props["Rational Number"]
+    props["Positive"] = sign > 0
+    props["Negative"] = sign < 0
+    props["Zero"] = sign == 0
+    return props
+
+def factorize(n, time_limit=None, cancel=None):
+    """
+    Factor n, giving up after time_limit seconds if one is given or as soon
+    as the optional cancel() callable returns True.
+
+    Returns (factors, remaining) where remaining lists the cofactors left
+    unfactored when it gave up; complete results are cached.
+    """
+    key = analysis_cache.cache_key(n)
+    factors = analysis_cache.factor_cache.get(key)
+    if factors is not None:
+        return factors, []
+    stop = cancel
+    if time_limit is not None:
+        deadline = time.monotonic() + time_limit
+        stop = lambda: time.monotonic() > deadline or (cancel is not None and cancel())
+    try:
+        factors = factorization.factorint(n, cancel=stop)
+    except factorization.FactorizationCancelled as e:
+        return e.partial, e.remaining
+    analysis_cache.factor_cache.put(key, factors)
+    return factors, []
+
+def arithmetic_values(n, time_limit=None, cancel=None):
+    """
+    Return {name: value} for φ, μ, d, σ and Ω of the natural number n, or None
+    if n could not be factored within time_limit (or before cancel()).
+
+    Small n are looked up in the precomputed tables; larger n are computed
+    from their factorization.
+    """
+    if n <= arithmetic_functions.DEFAULT_TABLE_LIMIT:
+        return arithmetic_functions.get_default_tables().lookup(n)
+    if is_prime(n):
+        return arithmetic_functions.from_factorization({n: 1})
+    factors, remaining = factorize(n, time_limit, cancel)
+    if remaining:
+        return None
+    return arithmetic_functions.from_factorization(factors)
+
+def format_factorization(factors, remaining=()):
+    """Display string for a (possibly partial) factorization."""
+    parts = [factorization.format_factorization(factors, format_number)] if factors or not remaining else []
+    parts += [f"({format_number(m)} unfactored)" for m in remaining]
+    text = " × ".join(parts)
+    if remaining:
+        text += " — time limit reached"
+    return text
+
+# Integers with more digits than this are shown abbreviated
+DISPLAY_DIGITS = 60
+
+def digit_count(n):
+    """Number of decimal digits of the integer |n|, without converting it to a string."""
+    n = abs(n)
+    if n == 0:
+        return 1
+    d = int(n.bit_length() * 0.30102999566398120)
+    if n >= 10 ** d:
+        d += 1
+    return d
+
+def format_number(num, max_digits=DISPLAY_DIGITS):
+    """Format a parsed value for display, abbreviating very long integers."""
+    if isinstance(num, fractions.Fraction):
+        return f"{format_number(num.numerator, max_digits)}/{format_number(num.denominator, max_digits)}"
+    if isinstance(num, int) and not isinstance(num, bool):
+        digits = digit_count(num)
+        if digits <= max_digits:
+            return str(num)
+        half = max_digits // 2
+        lead = abs(num) // 10 ** (digits - half)
+        tail = abs(num) % 10 ** half
+        sign = "-" if num < 0 else ""
+        return f"{sign}{lead}…{tail:0{half}d} ({digits} digits)"
+    return str(num)
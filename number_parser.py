@@ -0,0 +1,277 @@
+import re
+import functools
+from fractions import Fraction
+from decimal import Decimal
+
+# -----------------------------------------------------------------------------
+# Safe numeric expression parser
+# A tokenizer and recursive-descent parser that replace eval() for number
+# input. Each input string is parsed once into an AST of tuples, both the AST
+# and its value are cached per string, and evaluation is exact: int, Fraction,
+# Decimal (a lone decimal literal) or complex. Nothing goes through float
+# unless the input is complex or uses a non-integer exponent.
+#
+# Grammar:
+#   expr   := term (('+' | '-') term)*
+#   term   := unary (('*' | '/') unary)*
+#   unary  := ('+' | '-') unary | power
+#   power  := atom (('^' | '**') unary)?
+#   atom   := NUMBER | IMAGINARY | '(' expr ')'
+# -----------------------------------------------------------------------------
+
+# Results larger than this many bits are rejected instead of computed
+MAX_RESULT_BITS = 1 << 22
+
+# int() refuses very long digit strings (int_max_str_digits); longer literals
+# are converted by splitting them in halves.
+_INT_CHUNK_DIGITS = 4000
+
+_TOKEN_RE = re.compile(r"""
+    (?P<number>(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?[jJiI]?)
+  | (?P<imag>[jJiI])
+  | (?P<op>\*\*|[-+*/^()])
+  | (?P<space>\s+)
+  | (?P<error>.)
+""", re.VERBOSE)
+
+class Token:
+    __slots__ = ("kind", "text", "pos")
+
+    def __init__(self, kind, text, pos):
+        self.kind = kind
+        self.text = text
+        self.pos = pos
+
+def tokenize(source):
+    """Split source into NUMBER, IMAG and OP tokens; raise ValueError on anything else."""
+    tokens = []
+    for m in _TOKEN_RE.finditer(source):
+        kind = m.lastgroup
+        if kind == "space":
+            continue
+        if kind == "error":
+            raise ValueError(f"Unexpected character '{m.group()}' at position {m.start() + 1}.")
+        tokens.append(Token(kind, m.group(), m.start()))
+    return tokens
+
+def int_from_digits(digits):
+    """Convert a string of decimal digits to int without hitting int_max_str_digits."""
+    if len(digits) <= _INT_CHUNK_DIGITS:
+        return int(digits)
+    half = len(digits) // 2
+    low_len = len(digits) - half
+    return int_from_digits(digits[:half]) * 10 ** low_len + int_from_digits(digits[half:])
+
+def _literal_value(text):
+    """Exact value of a real number literal: int for integers, Decimal otherwise."""
+    text = text.replace("_", "")
+    if "." in text or "e" in text or "E" in text:
+        value = Decimal(text)
+        if abs(value.as_tuple().exponent) > MAX_RESULT_BITS // 4:
+            raise ValueError("Number too large.")
+        return value
+    return int_from_digits(text)
+
+# -----------------------------------------------------------------------------
+# Exact arithmetic helpers
+# -----------------------------------------------------------------------------
+
+def _exact(value):
+    """Lift Decimal to Fraction so that arithmetic stays exact."""
+    if isinstance(value, Decimal):
+        return Fraction(value)
+    return value
+
+def normalize(value):
+    """Return a Fraction with denominator 1 as int; other values are unchanged."""
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    return value
+
+def _check_size(value):
+    if isinstance(value, int) and value.bit_length() > MAX_RESULT_BITS:
+        raise ValueError("Number too large.")
+    if isinstance(value, Fraction) and max(value.numerator.bit_length(),
+                                           value.denominator.bit_length()) > MAX_RESULT_BITS:
+        raise ValueError("Number too large.")
+    return value
+
+def _add(a, b):
+    return _exact(a) + _exact(b)
+
+def _sub(a, b):
+    return _exact(a) - _exact(b)
+
+def _mul(a, b):
+    return _check_size(_exact(a) * _exact(b))
+
+def _div(a, b):
+    a, b = _exact(a), _exact(b)
+    if b == 0:
+        raise ValueError("Division by zero.")
+    if isinstance(a, (complex, float)) or isinstance(b, (complex, float)):
+        # Approximate operands give an approximate result, never an exact Fraction
+        return a / b
+    return normalize(Fraction(a) / b)
+
+def _pow(a, b):
+    a, b = _exact(a), normalize(_exact(b))
+    if isinstance(a, complex) or isinstance(b, complex):
+        if a == 0 and (isinstance(b, complex) or b < 0):
+            raise ValueError("Division by zero.")
+        return complex(a) ** complex(b)
+    if isinstance(b, int):
+        if a == 0 and b < 0:
+            raise ValueError("Division by zero.")
+        if isinstance(a, float):
+            # An approximate base stays approximate, never an exact Fraction
+            return a ** b
+        if a not in (0, 1, -1):
+            bits = abs(b) * max(Fraction(a).numerator.bit_length(), Fraction(a).denominator.bit_length())
+            if bits > MAX_RESULT_BITS:
+                raise ValueError("Number too large.")
+        if b < 0:
+            return normalize(Fraction(1) / Fraction(a) ** -b)
+        return a ** b
+    # Non-integer exponent: only representable approximately
+    if a == 0 and b < 0:
+        raise ValueError("Division by zero.")
+    if a < 0:
+        return complex(a) ** float(b)
+    return float(a) ** float(b)
+
+_BINARY_OPS = {"+": _add, "-": _sub, "*": _mul, "/": _div, "^": _pow, "**": _pow}
+
+# -----------------------------------------------------------------------------
+# Parser / compiler
+# -----------------------------------------------------------------------------
+
+class _Parser:
+    """
+    Recursive-descent parser producing an AST of ('const', value),
+    ('imag', coefficient), ('neg', node) and (op, left, right).
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def take(self):
+        tok = self.peek()
+        self.i += 1
+        return tok
+
+    def expect(self, text):
+        tok = self.take()
+        if tok is None or tok.text != text:
+            raise ValueError(f"Expected '{text}'.")
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Please enter a number.")
+        node = self.expr()
+        tok = self.peek()
+        if tok is not None:
+            raise ValueError(f"Unexpected '{tok.text}' at position {tok.pos + 1}.")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() is not None and self.peek().text in ("+", "-"):
+            node = (self.take().text, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() is not None and self.peek().text in ("*", "/"):
+            node = (self.take().text, node, self.unary())
+        return node
+
+    def unary(self):
+        tok = self.peek()
+        if tok is not None and tok.text in ("+", "-"):
+            self.take()
+            operand = self.unary()
+            return operand if tok.text == "+" else ("neg", operand)
+        return self.power()
+
+    def power(self):
+        node = self.atom()
+        tok = self.peek()
+        if tok is not None and tok.text in ("^", "**"):
+            self.take()
+            node = ("^", node, self.unary())
+        return node
+
+    def atom(self):
+        tok = self.take()
+        if tok is None:
+            raise ValueError("Unexpected end of input.")
+        if tok.kind == "imag":
+            return ("imag", 1)
+        if tok.kind == "number":
+            text = tok.text
+            if text[-1] in "jJiI":
+                # The coefficient is kept exact for consumers of the AST
+                # (see gaussian_integers.py); evaluation makes it a complex
+                return ("imag", _literal_value(text[:-1]))
+            return ("const", _literal_value(text))
+        if tok.text == "(":
+            node = self.expr()
+            self.expect(")")
+            return node
+        raise ValueError(f"Unexpected '{tok.text}' at position {tok.pos + 1}.")
+
+def evaluate(node):
+    """Evaluate an AST produced by parse_ast."""
+    kind = node[0]
+    if kind == "const":
+        return node[1]
+    if kind == "imag":
+        try:
+            return complex(0, float(node[1]))
+        except OverflowError:
+            raise ValueError("Number too large.")
+    if kind == "neg":
+        return -evaluate(node[1])
+    return _BINARY_OPS[kind](evaluate(node[1]), evaluate(node[2]))
+
+@functools.lru_cache(maxsize=1024)
+def parse_ast(source):
+    """Tokenize and parse source into an AST (cached per input string)."""
+    return _Parser(tokenize(source)).parse()
+
+@functools.lru_cache(maxsize=1024)
+def _cached_value(source):
+    return normalize(evaluate(parse_ast(source)))
+
+def parse_number(source):
+    """Parse a numeric expression to an exact int, Fraction, Decimal or complex."""
+    try:
+        return _cached_value(source.strip())
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply.")
+    except OverflowError:
+        # float and complex arithmetic on huge operands
+        raise ValueError("Number too large.")
+    except ZeroDivisionError:
+        raise ValueError("Division by zero.")
+
+def parse_integer(source):
+    """Parse an expression that must evaluate to an integer, e.g. 2**127 - 1 or 1e6."""
+    value = normalize(_exact(parse_number(source)))
+    if not isinstance(value, int):
+        raise ValueError(f"'{source.strip()}' is not an integer.")
+    return value
+
+def parse_integer_list(source):
+    """Parse a comma- or semicolon-separated list of integer expressions."""
+    parts = [part.strip() for part in source.replace(";", ",").split(",")]
+    if not any(parts):
+        raise ValueError("Please enter at least one integer.")
+    if not all(parts):
+        raise ValueError(f"Empty entry in '{source.strip()}'.")
+    return [parse_integer(part) for part in parts]
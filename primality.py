@@ -0,0 +1,162 @@
+import math
+import logging
+
+# -----------------------------------------------------------------------------
+# Primality engine
+# Small-prime trial division as a pre-filter, deterministic Miller-Rabin below
+# 3.3e24 and Baillie-PSW (strong base-2 + strong Lucas) above that.
+# -----------------------------------------------------------------------------
+
+TRIAL_DIVISION_LIMIT = 1000
+
+def _small_primes(limit):
+    """Return the list of primes below limit using a simple sieve."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+SMALL_PRIMES = _small_primes(TRIAL_DIVISION_LIMIT)
+_SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+_SMALL_PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# Deterministic Miller-Rabin witness sets: (upper bound, bases).
+# Testing the first 13 prime bases is deterministic for n < 3317044064679887385961981.
+MR_WITNESSES = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+MR_DETERMINISTIC_LIMIT = MR_WITNESSES[-1][0]
+
+def _strong_probable_prime(n, base, d, s):
+    """Strong probable-prime test of odd n to the given base, with n - 1 = d * 2^s."""
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def miller_rabin(n, bases):
+    """Run the strong probable-prime test of odd n > 2 for every base."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for base in bases:
+        base %= n
+        if base == 0:
+            continue
+        if not _strong_probable_prime(n, base, d, s):
+            return False
+    return True
+
+def jacobi(a, n):
+    """Compute the Jacobi symbol (a/n) for odd positive n."""
+    if n <= 0 or n % 2 == 0:
+        raise ValueError("Jacobi symbol requires an odd positive modulus.")
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def _strong_lucas_probable_prime(n):
+    """Strong Lucas probable-prime test with Selfridge's parameters (method A)."""
+    # Find D in 5, -7, 9, -11, ... with Jacobi(D/n) = -1
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+        if D == 13 and math.isqrt(n) ** 2 == n:
+            # Perfect squares never produce Jacobi -1
+            return False
+    P = 1
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    # Binary ladder for U_d, V_d, Q^d
+    U, V, Qk = 0, 2, 1
+    inv2 = (n + 1) // 2
+    for bit in bin(d)[2:]:
+        # Doubling
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (P * U + V) * inv2 % n, (D * U + P * V) * inv2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+def baillie_psw(n):
+    """Baillie-PSW test for odd n with no small factors."""
+    return miller_rabin(n, (2,)) and _strong_lucas_probable_prime(n)
+
+def is_prime(n):
+    """
+    Return True if the integer n is prime.
+
+    Deterministic for n < 3.3e24; above that Baillie-PSW is used, for which
+    no counterexample is known.
+    """
+    n = int(n)
+    if n < 2:
+        return False
+    if n < TRIAL_DIVISION_LIMIT:
+        return n in _SMALL_PRIME_SET
+    # One gcd against the primorial replaces 168 separate divisions
+    if math.gcd(n, _SMALL_PRIMORIAL) != 1:
+        return False
+    if n < TRIAL_DIVISION_LIMIT * TRIAL_DIVISION_LIMIT:
+        return True
+    if n < MR_DETERMINISTIC_LIMIT:
+        for bound, bases in MR_WITNESSES:
+            if n < bound:
+                return miller_rabin(n, bases)
+    logging.debug("Using Baillie-PSW for %d-bit input", n.bit_length())
+    return baillie_psw(n)
+
+def next_prime(n):
+    """Return the smallest prime strictly greater than n."""
+    n = int(n)
+    if n < 2:
+        return 2
+    if n == 2:
+        return 3
+    candidate = n + 1 if n % 2 == 0 else n + 2
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
@@ -3,9 +3,23 @@ from tkinter import ttk, messagebox, filedialog
 import math
 import cmath
 import fractions
+import os
 import re
+import itertools
+import time
 import logging
 
+import prime_table
+import number_parser
+import number_analysis
+import analysis_cache
+import prime_counting
+import background_tasks
+import analysis_history
+import gaussian_integers
+import property_graph
+import gcd_algorithms
+
 logging.basicConfig(level=logging.DEBUG)
 
 def create_number_properties_tab(self):
@@ -48,18 +62,53 @@ def create_number_properties_tab(self):
     input_frame = ttk.Frame(props_frame, style="TFrame")
     input_frame.grid(row=1, column=0, columnspan=2, pady=(0, 20), sticky="ew")
     
+    # Mode selection: analyze a single number, query primes in a range, or GCD / LCM of a list
+    self.num_props_mode_var = tk.StringVar(value="single")
+    mode_frame = ttk.Frame(input_frame, style="TFrame")
+    mode_frame.grid(row=0, column=0, columnspan=2, pady=(0, 5), sticky="w")
+    ttk.Radiobutton(mode_frame, text="Single Number", value="single",
+                    variable=self.num_props_mode_var).grid(row=0, column=0, sticky="w", padx=(0, 10))
+    ttk.Radiobutton(mode_frame, text="Prime Range [a, b]", value="range",
+                    variable=self.num_props_mode_var).grid(row=0, column=1, sticky="w", padx=(0, 10))
+    ttk.Radiobutton(mode_frame, text="GCD / LCM of a, b, …", value="gcd",
+                    variable=self.num_props_mode_var).grid(row=0, column=2, sticky="w")
+    
     # Input label
-    input_label = ttk.Label(input_frame, text="Enter a number (integer, decimal, fraction, or complex):", style="TLabel")
-    input_label.grid(row=0, column=0, pady=(0, 5), sticky="w")
+    input_label = ttk.Label(input_frame, text="Enter a number (integer, decimal, fraction, or complex), a range a, b, or integers a, b, …:", style="TLabel")
+    input_label.grid(row=1, column=0, pady=(0, 5), sticky="w")
     
     # Input entry
     self.num_props_input_var = tk.StringVar()
     self.num_props_input_entry = ttk.Entry(input_frame, textvariable=self.num_props_input_var, width=40)
-    self.num_props_input_entry.grid(row=1, column=0, padx=(0, 10), sticky="ew")
+    self.num_props_input_entry.grid(row=2, column=0, padx=(0, 10), sticky="ew")
     
     # Analyze button
     analyze_button = ttk.Button(input_frame, text="Analyze", command=self.analyze_number)
-    analyze_button.grid(row=1, column=1, sticky="w")
+    analyze_button.grid(row=2, column=1, sticky="w")
+    
+    # Progress indicator and Cancel button for the background analysis
+    progress_frame = ttk.Frame(input_frame, style="TFrame")
+    progress_frame.grid(row=3, column=0, columnspan=2, pady=(5, 0), sticky="ew")
+    self.num_props_progress = ttk.Progressbar(progress_frame, mode="indeterminate", length=150)
+    self.num_props_progress.grid(row=0, column=0, padx=(0, 10), sticky="w")
+    self.num_props_progress_running = False
+    self.num_props_status_var = tk.StringVar()
+    status_label = ttk.Label(progress_frame, textvariable=self.num_props_status_var, style="TLabel")
+    status_label.grid(row=0, column=1, padx=(0, 10), sticky="w")
+    self.num_props_cancel_btn = ttk.Button(progress_frame, text="Cancel", command=self.cancel_properties_analysis)
+    self.num_props_cancel_btn.grid(row=0, column=2, sticky="w")
+    self.num_props_cancel_btn.state(["disabled"])
+    self.num_props_runner = background_tasks.TkTaskRunner(self.root)
+    
+    # Property groups to compute; unchecked groups are skipped entirely
+    groups_frame = ttk.Frame(input_frame, style="TFrame")
+    groups_frame.grid(row=4, column=0, columnspan=2, pady=(5, 0), sticky="w")
+    ttk.Label(groups_frame, text="Compute:", style="TLabel").grid(row=0, column=0, padx=(0, 10), sticky="w")
+    self.num_props_group_vars = {}
+    for i, group in enumerate(property_graph.GROUPS):
+        var = tk.BooleanVar(value=True)
+        self.num_props_group_vars[group] = var
+        ttk.Checkbutton(groups_frame, text=group, variable=var).grid(row=0, column=i + 1, padx=(0, 8), sticky="w")
     
     # Configure grid to expand with window
     input_frame.columnconfigure(0, weight=1)
@@ -67,6 +116,10 @@ def create_number_properties_tab(self):
     # Results frame
     self.prop_results_frame = ttk.Frame(props_frame, style="TFrame")
     self.prop_results_frame.grid(row=2, column=0, columnspan=2, pady=(0, 20), sticky="ew")
+    self.prop_results_pool = ResultRowPool(self.prop_results_frame)
+    
+    # Structured analysis history (bounded in memory, spills to SQLite)
+    self.properties_history = analysis_history.AnalysisHistory()
     
     # History and export buttons frame
     buttons_frame = ttk.Frame(props_frame, style="TFrame")
@@ -79,6 +132,11 @@ def create_number_properties_tab(self):
     export_btn = ttk.Button(buttons_frame, text="Export Results", command=self.export_properties_result)
     export_btn.grid(row=0, column=1)
     
+    # Result cache statistics
+    self.cache_stats_var = tk.StringVar(value=analysis_cache.format_stats())
+    cache_stats_label = ttk.Label(buttons_frame, textvariable=self.cache_stats_var, style="TLabel")
+    cache_stats_label.grid(row=0, column=2, padx=(20, 0), sticky="w")
+    
     # Help text frame
     help_frame = ttk.Frame(props_frame, style="TFrame")
     help_frame.grid(row=4, column=0, columnspan=2, sticky="ew")
@@ -90,8 +148,10 @@ def create_number_properties_tab(self):
         "• Integers: 42, -7, 0",
         "• Decimals: 3.14, -0.5",
         "• Fractions: 2/3, -4/7",
-        "• Complex Numbers: 2+3j, 4-2j",
-        "• Mixed Fractions: 1 1/2 (enter as 1.5 or 3/2)"
+        "• Complex Numbers: 2+3j, 4-2j (integer parts are analyzed as Gaussian integers)",
+        "• Mixed Fractions: 1 1/2 (enter as 1.5 or 3/2)",
+        "• Prime Range mode: 1000, 2000 (lists and counts the primes in [a, b])",
+        "• GCD / LCM mode: 240, 46, 2**64 - 1 (GCD, LCM and Bézout coefficients)"
     ]
     
     for i, example in enumerate(examples):
@@ -106,227 +166,429 @@ def create_number_properties_tab(self):
     canvas.config(width=props_frame.winfo_width())
     
     
+def _properties_history(self):
+    if getattr(self, 'properties_history', None) is None:
+        self.properties_history = analysis_history.AnalysisHistory()
+    return self.properties_history
+
 def clear_properties_history(self):
     """Clear the history of analyzed numbers."""
-    if hasattr(self, 'history'):
-        self.history.clear()
-        messagebox.showinfo("History", "Analysis history has been cleared.")
-    else:
-        # Initialize history if it doesn't exist
-        self.history = []
+    _properties_history(self).clear()
+    messagebox.showinfo("History", "Analysis history has been cleared.")
 
 def export_properties_result(self):
-    """Export the analysis results to a text file."""
+    """Export the analysis history as text, CSV, JSON lines or compressed NumPy columns."""
     try:
         file_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("NumPy archive", "*.npz"), ("All files", "*.*")],
             title="Export Number Properties"
         )
         if not file_path:
             return
         
         # Check if we have a history to export
-        if not hasattr(self, 'history') or not self.history:
+        history = _properties_history(self)
+        if not len(history):
             messagebox.showinfo("Export", "No analysis history available to export.")
             return
         
-        with open(file_path, "w") as f:
-            f.write("Number Properties Analysis\n")
-            f.write("=========================\n\n")
-            for entry in self.history:
-                f.write(f"{entry}\n")
+        fmt = os.path.splitext(file_path)[1].lstrip(".").lower()
+        if fmt not in analysis_history.EXPORT_FORMATS:
+            fmt = "txt"
+        count = history.export(file_path, fmt)
         
-        messagebox.showinfo("Export", f"Analysis history exported successfully to {file_path}")
+        messagebox.showinfo("Export", f"{count} analyses exported successfully to {file_path}")
         
     except Exception as e:
         messagebox.showerror("Export Error", str(e))
 
+# -----------------------------------------------------------------------------
+# Pooled result rows
+# The widgets for each row of the results grid are created the first time the
+# row is used and afterwards only reconfigured, so re-rendering touches a
+# fixed number of widgets and never destroys or recreates any.
+# -----------------------------------------------------------------------------
+
+class ResultRowPool:
+    """Reusable header and name/value rows inside a results frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.header = None
+        self.rows = []
+        # Rows 1 .. shown-1 are currently gridded
+        self.shown = 1
+
+    def set_header(self, text):
+        if self.header is None:
+            self.header = ttk.Label(self.frame, style="Header.TLabel")
+        self.header.configure(text=text)
+        self.header.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky="w")
+
+    def _slot(self, row):
+        while len(self.rows) <= row:
+            self.rows.append({})
+        return self.rows[row]
+
+    def _name_label(self, slot, row, property_name):
+        label = slot.get("name")
+        if label is None:
+            label = slot["name"] = ttk.Label(self.frame, style="Result.TLabel")
+        label.configure(text=f"{property_name}:")
+        label.grid(row=row, column=0, sticky="w", padx=(0, 10), pady=3)
+
+    def yes_no(self, row, property_name, is_true):
+        """Show a property name with a colored Yes/No indicator in the given row."""
+        slot = self._slot(row)
+        self._name_label(slot, row, property_name)
+        style = "Yes.TLabel" if is_true else "No.TLabel"
+        if "flag" not in slot:
+            slot["flag_frame"] = ttk.Frame(self.frame)
+            slot["flag"] = ttk.Label(slot["flag_frame"], padding=(10, 3))
+            slot["flag"].pack()
+        slot["flag_frame"].configure(style=style)
+        slot["flag"].configure(text="Yes" if is_true else "No", style=style)
+        slot["flag_frame"].grid(row=row, column=1, sticky="w", pady=3)
+        if "text" in slot:
+            slot["text"].grid_remove()
+        self._mark_shown(row)
+
+    def text(self, row, property_name, text, wraplength=500):
+        """Show a free-form value in the given row; without a name it spans both columns."""
+        slot = self._slot(row)
+        if property_name is not None:
+            self._name_label(slot, row, property_name)
+        elif "name" in slot:
+            slot["name"].grid_remove()
+        if "text" not in slot:
+            slot["text"] = ttk.Label(self.frame, style="Result.TLabel", justify="left")
+        slot["text"].configure(text=text, wraplength=wraplength)
+        if property_name is None:
+            slot["text"].grid(row=row, column=0, columnspan=2, sticky="w", pady=3)
+        else:
+            slot["text"].grid(row=row, column=1, columnspan=1, sticky="w", pady=3)
+        if "flag_frame" in slot:
+            slot["flag_frame"].grid_remove()
+        self._mark_shown(row)
+
+    def _mark_shown(self, row):
+        self.shown = max(self.shown, row + 1)
+
+    def trim(self, row):
+        """Hide every row from row onwards (row 0 also hides the header)."""
+        if row <= 0 and self.header is not None:
+            self.header.grid_remove()
+        for r in range(max(row, 1), self.shown):
+            for widget in self.rows[r].values():
+                if widget.winfo_manager() == "grid":
+                    widget.grid_remove()
+        self.shown = max(row, 1)
+
+def _result_pool(self):
+    if getattr(self, 'prop_results_pool', None) is None:
+        self.prop_results_pool = ResultRowPool(self.prop_results_frame)
+    return self.prop_results_pool
+
 def create_result_row(self, row, property_name, is_true):
-    """Create a row in the results frame with property name and Yes/No indicator."""
-    style = "Yes.TLabel" if is_true else "No.TLabel"
-    value = "Yes" if is_true else "No"
-    
-    # Property name
-    property_label = ttk.Label(self.prop_results_frame, text=f"{property_name}:", style="Result.TLabel")
-    property_label.grid(row=row, column=0, sticky="w", padx=(0, 10), pady=3)
-    
-    # Value label with colored background
-    value_frame = ttk.Frame(self.prop_results_frame, style=style)
-    value_frame.grid(row=row, column=1, sticky="w", pady=3)
-    value_label = ttk.Label(value_frame, text=value, style=style, padding=(10, 3))
-    value_label.pack()
-    
+    """Fill a row in the results frame with property name and Yes/No indicator."""
+    _result_pool(self).yes_no(row, property_name, is_true)
+    return row + 1
+
+def create_text_row(self, row, property_name, text):
+    """Fill a row in the results frame with property name and a free-form value."""
+    _result_pool(self).text(row, property_name, text)
     return row + 1
 
+# Interactive factorizations give up after this many seconds and report what was found
+FACTORIZATION_TIME_LIMIT = 10.0
+
 def is_prime(self, n):
-    """Check if a number is prime."""
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+    """Check if a number is prime (prime table lookup or Miller-Rabin / Baillie-PSW)."""
+    return number_analysis.is_prime(n)
 
 def parse_input(self, input_str):
     """
-    Parse a string into a number (integer, float, fraction, or complex).
+    Parse a string into an exact number (int, Fraction, Decimal, or complex)
+    using the safe expression parser in number_parser.py.
     Returns a tuple containing the parsed number and its type.
     """
-    # Remove spaces
-    input_str = input_str.replace(" ", "")
+    num = number_parser.parse_number(input_str)
+    if isinstance(num, complex):
+        return num, "complex"
+    if isinstance(num, fractions.Fraction):
+        return num, "fraction"
+    return num, "number"
+
+PRIME_RANGE_DISPLAY_LIMIT = 200
+# Only this much of a range is scanned to find the primes that are listed
+PRIME_RANGE_SCAN_LIMIT = 10 ** 7
+# Ranges narrower than this (or above the π(x) cap) are counted by sieving,
+# in chunks of this size; wider ones with π(b) - π(a - 1)
+PRIME_RANGE_SIEVE_WIDTH = 10 ** 7
+
+def parse_range_input(input_str):
+    """Parse 'a, b', 'a..b' or 'a b' (each bound an integer expression) into a pair of integers."""
+    parts = [p for p in re.split(r"\s*(?:,|\.\.)\s*", input_str.strip()) if p]
+    if len(parts) == 1:
+        parts = parts[0].split()
+    if len(parts) != 2:
+        raise ValueError("Enter a range as two integers, e.g. 1000, 2000.")
+    a, b = number_parser.parse_integer(parts[0]), number_parser.parse_integer(parts[1])
+    if a > b:
+        raise ValueError("Range start must not exceed range end.")
+    return a, b
+
+# -----------------------------------------------------------------------------
+# Analysis work (runs on a background thread, see background_tasks.py)
+# These functions must not touch Tk; they return plain dicts that the
+# display_* methods below render on the Tk thread.
+# -----------------------------------------------------------------------------
+
+def _count_primes(task, a, b):
+    """Primes in [a, b]: π(x) for wide ranges, so they never have to be enumerated, else a sieve."""
+    if b - a >= PRIME_RANGE_SIEVE_WIDTH and b <= prime_counting.MAX_PRIME_PI_ARGUMENT:
+        count = prime_counting.prime_pi(b)
+        task.check_cancelled()
+        return count - prime_counting.prime_pi(a - 1)
+    count = 0
+    for start in range(a, b + 1, PRIME_RANGE_SIEVE_WIDTH):
+        count += prime_table.count_primes_in_range(start, min(start + PRIME_RANGE_SIEVE_WIDTH - 1, b))
+        task.check_cancelled()
+    return count
+
+def compute_prime_range(task, input_str):
+    """Count the primes in [a, b] and list the first few from the prime table."""
+    a, b = parse_range_input(input_str)
+    task.report("Counting primes")
+    count = _count_primes(task, a, b)
+    task.check_cancelled()
+    task.report("Listing primes")
+    shown = list(itertools.islice(prime_table.primes_in_range(a, min(b, max(a, 2) + PRIME_RANGE_SCAN_LIMIT)),
+                                  PRIME_RANGE_DISPLAY_LIMIT))
+    return {"input": input_str, "a": a, "b": b, "count": count, "shown": shown}
+
+def compute_gcd_lcm(task, input_str):
+    """GCD, LCM and Bézout coefficients of a list of integers."""
+    values = number_parser.parse_integer_list(input_str)
+    if len(values) < 2:
+        raise ValueError("Enter at least two integers, e.g. 240, 46.")
+    task.report("Computing GCD and Bézout coefficients")
+    g, coefficients = gcd_algorithms.bezout(*values)
+    task.check_cancelled()
+    task.report("Computing LCM")
+    return {"input": input_str, "values": values, "gcd": g, "lcm": gcd_algorithms.lcm(*values),
+            "coefficients": coefficients}
+
+def compute_number_analysis(task, input_str, names):
+    """
+    Evaluate the requested property nodes (see property_graph.py) for one
+    number. Posts ("layout", display, rows) once the applicable rows are
+    known, then ("value", name, value) as each node completes, cheapest first.
+    """
+    task.report("Parsing")
+    num = number_parser.parse_number(input_str)
+    display = number_analysis.format_number(num)
+    num = number_analysis.to_exact(num)
     
-    # Check if it's a complex number
-    if 'j' in input_str or 'i' in input_str:
-        # Replace 'i' with 'j' for Python's complex number notation
-        input_str = input_str.replace('i', 'j')
-        try:
-            # Try to evaluate it as a complex number
-            num = complex(eval(input_str))
-            return num, "complex"
-        except:
-            raise ValueError("Invalid complex number format.")
-    
-    # Check if it's a fraction
-    if '/' in input_str:
-        try:
-            # Try to parse as a fraction
-            parts = input_str.split('/')
-            if len(parts) == 2:
-                numerator = float(eval(parts[0]))
-                denominator = float(eval(parts[1]))
-                if denominator == 0:
-                    raise ValueError("Division by zero.")
-                return numerator / denominator, "fraction"
-            else:
-                raise ValueError("Invalid fraction format.")
-        except Exception as e:
-            if str(e) == "Division by zero.":
-                raise ValueError("Division by zero.")
-            raise ValueError("Invalid fraction format.")
+    cache_key = analysis_cache.cache_key(num)
+    ctx = property_graph.PropertyContext(num, input_str, FACTORIZATION_TIME_LIMIT, task.is_cancelled,
+                                         analysis_cache.property_cache.get(cache_key))
+    if isinstance(num, complex) and ctx.get("_gaussian") is not None:
+        display = gaussian_integers.format_gaussian(ctx.get("_gaussian"))
     
-    # Try to evaluate as a regular number
-    try:
-        num = float(eval(input_str))
-        return num, "number"
-    except:
-        raise ValueError("Invalid number format.")
+    rows = ctx.plan(names)
+    task.post(("layout", display, rows))
+    values = {}
+    for name in ctx.schedule(rows):
+        task.report(f"Computing {name}")
+        values[name] = ctx.get(name)
+        task.check_cancelled()
+        task.post(("value", name, values[name]))
+    
+    # Gaussian results depend on the input text, not just the (float) value
+    known = ctx.complete()
+    if known is not None and not isinstance(num, complex):
+        analysis_cache.property_cache.put(cache_key, known)
+    return {"input": input_str, "display": display, "rows": rows, "values": values}
+
+# -----------------------------------------------------------------------------
+# Tk side: submit, progress, cancel and display
+# -----------------------------------------------------------------------------
+
+def clear_properties_results(self):
+    """Hide all result rows (the widgets are kept for reuse)."""
+    _result_pool(self).trim(0)
+
+def set_properties_status(self, busy, status=""):
+    """Show or hide the progress indicator and enable the Cancel button while busy."""
+    if not hasattr(self, 'num_props_progress'):
+        return
+    if busy:
+        elapsed = time.monotonic() - self.num_props_started
+        self.num_props_status_var.set(f"{status or 'Working'}… {elapsed:.1f} s")
+        if not self.num_props_progress_running:
+            self.num_props_progress.start(15)
+            self.num_props_progress_running = True
+        self.num_props_cancel_btn.state(["!disabled"])
+    else:
+        self.num_props_status_var.set(status)
+        self.num_props_progress.stop()
+        self.num_props_progress_running = False
+        self.num_props_cancel_btn.state(["disabled"])
+    if hasattr(self, 'cache_stats_var'):
+        self.cache_stats_var.set(analysis_cache.format_stats())
+
+def cancel_properties_analysis(self):
+    """Cancel the analysis in progress, if any."""
+    if hasattr(self, 'num_props_runner'):
+        self.num_props_runner.cancel()
 
 def analyze_number(self):
     """
-    Analyze the properties of the input number and display the results.
-    This function handles integers, floats, fractions, and complex numbers.
+    Analyze the input number (or prime range, or GCD / LCM list) on a
+    background thread. Pressing Enter again while an analysis is running
+    supersedes it; the results are rendered by display_number_analysis,
+    display_prime_range or display_gcd_lcm.
     """
-    # Clear previous results
-    for widget in self.prop_results_frame.winfo_children():
-        widget.destroy()
+    # Get the input string
+    input_str = self.num_props_input_var.get().strip() if hasattr(self, 'num_props_input_var') else self.input_var.get().strip()
     
-    try:
-        # Get the input string
-        input_str = self.num_props_input_var.get().strip() if hasattr(self, 'num_props_input_var') else self.input_var.get().strip()
-        
-        if not input_str:
-            messagebox.showerror("Error", "Please enter a number.")
-            return
-        
-        # Parse the input
-        num, num_type = self.parse_input(input_str)
-        
-        # Display the value being analyzed
-        value_label = ttk.Label(self.prop_results_frame, text=f"Results for: {num}", style="Header.TLabel")
-        value_label.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky="w")
-        
-        row = 1
-        
-        # Basic classifications
-        is_complex = isinstance(num, complex) and num.imag != 0
-        is_real = isinstance(num, (int, float)) or (isinstance(num, complex) and num.imag == 0)
-        
-        # If it's a complex number with imaginary part, we only analyze the complex property
-        if is_complex:
-            row = self.create_result_row(row, "Complex Number", True)
-            row = self.create_result_row(row, "Real Number", False)
-            
-            # Add to history
-            if hasattr(self, 'history'):
-                self.history.append(f"Number: {num} - Complex Number: Yes, Real Number: No")
-            
-            return
-        
-        # For real numbers, extract the real part if it's a complex with imag=0
-        if isinstance(num, complex):
-            num = num.real
-        
-        # Check if it's an integer
-        is_integer = num.is_integer() if isinstance(num, float) else True
-        
-        # Check if it's rational or irrational
+    if not input_str:
+        messagebox.showerror("Error", "Please enter a number.")
+        return
+    
+    mode = self.num_props_mode_var.get() if hasattr(self, 'num_props_mode_var') else "single"
+    if mode == "range":
+        compute, display, args = compute_prime_range, self.display_prime_range, ()
+    elif mode == "gcd":
+        compute, display, args = compute_gcd_lcm, self.display_gcd_lcm, ()
+    else:
+        # Only the property groups that are switched on get computed
+        groups = [group for group, var in getattr(self, 'num_props_group_vars', {}).items() if var.get()]
+        if not hasattr(self, 'num_props_group_vars'):
+            groups = property_graph.GROUPS
+        compute, display = compute_number_analysis, self.display_number_analysis
+        args = (property_graph.names_in_groups(groups),)
+    
+    if not hasattr(self, 'num_props_runner'):
+        self.num_props_runner = background_tasks.TkTaskRunner(self.root)
+    
+    def on_done(result):
+        self.set_properties_status(False, f"Done in {time.monotonic() - self.num_props_started:.1f} s")
         try:
-            fraction = fractions.Fraction(num).limit_denominator(1000)
-            is_rational = abs(num - fraction.numerator / fraction.denominator) < 1e-10
-        except:
-            is_rational = is_integer
-        
-        is_irrational = is_real and not is_rational
-        
-        # For integers only
-        if is_integer:
-            num_int = int(num)
-            is_whole = num_int >= 0
-            is_natural = num_int > 0
-            is_positive = num_int > 0
-            is_negative = num_int < 0
-            is_zero = num_int == 0
-            is_even = num_int % 2 == 0
-            is_odd = num_int % 2 != 0
-            is_prime_number = is_natural and self.is_prime(num_int)
-            is_composite = is_natural and not is_prime_number and num_int > 1
+            display(result)
+        except Exception as e:
+            logging.exception("Error displaying number analysis")
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    
+    def on_error(e):
+        self.set_properties_status(False)
+        self.clear_properties_results()
+        if isinstance(e, ValueError):
+            messagebox.showerror("Error", str(e))
         else:
-            is_whole = False
-            is_natural = False
-            is_positive = num > 0
-            is_negative = num < 0
-            is_zero = num == 0
-            is_even = False
-            is_odd = False
-            is_prime_number = False
-            is_composite = False
-        
-        # Create result rows for all properties
-        row = self.create_result_row(row, "Complex Number", is_complex)
-        row = self.create_result_row(row, "Real Number", is_real)
-        row = self.create_result_row(row, "Rational Number", is_rational)
-        row = self.create_result_row(row, "Irrational Number", is_irrational)
-        row = self.create_result_row(row, "Integer", is_integer)
-        row = self.create_result_row(row, "Whole Number", is_whole)
-        row = self.create_result_row(row, "Natural Number", is_natural)
-        row = self.create_result_row(row, "Positive", is_positive)
-        row = self.create_result_row(row, "Negative", is_negative)
-        row = self.create_result_row(row, "Zero", is_zero)
-        row = self.create_result_row(row, "Even", is_even)
-        row = self.create_result_row(row, "Odd", is_odd)
-        row = self.create_result_row(row, "Prime", is_prime_number)
-        row = self.create_result_row(row, "Composite", is_composite)
-        
-        # Add to history
-        if hasattr(self, 'history'):
-            result_summary = f"Number: {num} - "
-            result_summary += f"Real: {'Yes' if is_real else 'No'}, "
-            result_summary += f"Rational: {'Yes' if is_rational else 'No'}, "
-            result_summary += f"Integer: {'Yes' if is_integer else 'No'}, "
-            result_summary += f"Positive: {'Yes' if is_positive else 'No'}, "
-            if is_integer and is_natural:
-                result_summary += f"Prime: {'Yes' if is_prime_number else 'No'}"
-            self.history.append(result_summary)
-        
-    except ValueError as e:
-        messagebox.showerror("Error", str(e))
-    except Exception as e:
-        logging.exception("Error during number analysis")
-        messagebox.showerror("Error", f"An error occurred: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    
+    def on_cancel():
+        self.set_properties_status(False, "Cancelled")
+    
+    # Previous results stay visible until the new ones replace them
+    self.num_props_started = time.monotonic()
+    self.set_properties_status(True, "Starting")
+    self.num_props_runner.submit(
+        compute, input_str, *args,
+        on_done=on_done, on_error=on_error, on_cancel=on_cancel,
+        on_progress=lambda status: self.set_properties_status(True, status),
+        on_partial=self.show_property_update,
+    )
+
+def display_prime_range(self, result):
+    """Render the result of compute_prime_range."""
+    a, b, count, shown = result["a"], result["b"], result["count"], result["shown"]
+    pool = _result_pool(self)
+    
+    pool.set_header(f"Primes in [{a}, {b}]")
+    row = self.create_text_row(1, "Prime Count", str(count))
+    
+    listing = ", ".join(str(p) for p in shown)
+    if count > len(shown):
+        listing += f", ... ({count - len(shown)} more)"
+    pool.text(row, None, listing or "None", wraplength=600)
+    pool.trim(row + 1)
+    
+    _properties_history(self).add("range", result["input"], f"[{a}, {b}]",
+                                  f"Range: [{a}, {b}] - Prime Count: {count}",
+                                  details={"a": str(a), "b": str(b), "count": count})
+
+def display_gcd_lcm(self, result):
+    """Render the result of compute_gcd_lcm."""
+    fmt = number_analysis.format_number
+    values, g, coefficients = result["values"], result["gcd"], result["coefficients"]
+    pool = _result_pool(self)
+    
+    listing = ", ".join(fmt(v) for v in values)
+    pool.set_header(f"GCD / LCM of {listing}")
+    row = self.create_text_row(1, "GCD", fmt(g))
+    row = self.create_text_row(row, "LCM", fmt(result["lcm"]))
+    row = self.create_result_row(row, "Coprime", g == 1)
+    identity = " + ".join(f"({fmt(c)})·({fmt(v)})" for c, v in zip(coefficients, values))
+    row = self.create_text_row(row, "Bézout Coefficients", ", ".join(fmt(c) for c in coefficients))
+    pool.text(row, None, f"{identity} = {fmt(g)}", wraplength=600)
+    pool.trim(row + 1)
+    
+    _properties_history(self).add("gcd", result["input"], listing,
+                                  f"GCD / LCM: {listing} - GCD: {fmt(g)}, LCM: {fmt(result['lcm'])}",
+                                  details={"gcd": str(g), "lcm": str(result["lcm"]),
+                                           "coefficients": [str(c) for c in coefficients]})
+
+def show_property_update(self, item):
+    """Apply one partial result posted by compute_number_analysis."""
+    pool = _result_pool(self)
+    if item[0] == "layout":
+        _, display, rows = item
+        pool.set_header(f"Results for: {display}")
+        self.num_props_rows = {}
+        for row, name in enumerate(rows, start=1):
+            self.create_text_row(row, name, "…")
+            self.num_props_rows[name] = row
+        pool.trim(len(rows) + 1)
+        return
+    _, name, value = item
+    row = self.num_props_rows[name]
+    kind = property_graph.PROPERTY_NODES[name].kind
+    if kind == "text":
+        self.create_text_row(row, name, value)
+    elif kind == "special" and value[0] is None:
+        self.create_text_row(row, name, "Unknown (not factored)")
+    else:
+        flag = value[0] if kind == "special" else value
+        self.create_result_row(row, property_graph.display_label(name, value), flag)
+
+def display_number_analysis(self, result):
+    """Record a finished analysis (its rows were already streamed in) in the history."""
+    display, values = result["display"], result["values"]
+    
+    parts = []
+    details = {}
+    special_names = []
+    for name in result["rows"]:
+        value = values[name]
+        kind = property_graph.PROPERTY_NODES[name].kind
+        if kind == "text":
+            parts.append(f"{name}: {value}")
+            details[name] = value
+        elif kind == "special":
+            if value[0]:
+                special_names.append(property_graph.display_label(name, value))
+        else:
+            parts.append(f"{name}: {'Yes' if value else 'No'}")
+    if special_names:
+        parts.append(f"Special: {'; '.join(special_names)}")
+        details["special"] = special_names
+    
+    # Only flags that were actually computed are recorded
+    props = {name: values[name] for name in number_analysis.PROPERTY_NAMES if name in values}
+    result_summary = f"Number: {display} - " + ", ".join(parts)
+    _properties_history(self).add("number", result["input"], display, result_summary, props, details)
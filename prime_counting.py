@@ -0,0 +1,155 @@
+import math
+import functools
+import threading
+import logging
+
+import numpy as np
+
+import prime_table
+import prime_sieve
+
+# -----------------------------------------------------------------------------
+# Prime-counting function π(x) and the n-th prime
+#
+# Below the prime table bound π(x) is a popcount over the on-disk bitmap.
+# Above it, Legendre's partial sieve function φ(v, a) (the count of n <= v
+# with no prime factor among the first a primes) is tabulated for every
+# v = x // k at once and advanced one prime at a time:
+#
+#     φ(v, a) = φ(v, a-1) - φ(v // p_a, a-1)         for p_a^2 <= v
+#
+# Once a = π(sqrt(x)), φ(v, a) + a - 1 = π(v) for every tabulated v
+# (Legendre's formula, i.e. Meissel-Lehmer with P2 = 0). Each step is a single vectorized
+# NumPy update over the entries with v >= p^2, so the total work is about
+# x^(3/4) / log x array operations and memory is O(sqrt(x)). The finished
+# tables are kept so later queries for any x // k are O(1).
+# -----------------------------------------------------------------------------
+
+# Use the prime table directly up to this bound (growing it if needed)
+TABLE_DIRECT_LIMIT = 1 << 27
+# Largest x accepted: the φ tables take O(sqrt(x)) memory and cannot be cancelled
+MAX_PRIME_PI_ARGUMENT = 10 ** 14
+
+class _PhiTables:
+    """π(v) for every v = x // k, as produced by the φ recurrence."""
+
+    def __init__(self, x):
+        self.x = x
+        self.r = r = math.isqrt(x)
+        # small[v] for v <= r, large[k] for v = x // k with 1 <= k <= r.
+        # Counts below sqrt(x) fit in int32, which halves the memory traffic.
+        small = np.arange(-1, r, dtype=np.int32)
+        small[0] = 0
+        k = np.arange(r + 1, dtype=np.int64)
+        k[0] = 1
+        v_large = x // k
+        large = v_large - 1
+        large[0] = 0
+
+        for p in (prime_table.primes_in_range(2, r) if r >= 2 else ()):
+            sp = int(small[p - 1])  # π(p - 1): number of primes before p
+            p2 = p * p
+            # Large entries: v = x // k >= p^2  <=>  k <= x // p^2
+            kmax = min(r, x // p2)
+            split = min(kmax, r // p)
+            if split >= 1:
+                # x // (k*p) is itself a large entry when k*p <= r
+                large[1:split + 1] -= large[p:split * p + 1:p] - sp
+            if kmax > split:
+                # x // (k*p) == (x // k) // p; dividing by a scalar is much faster
+                large[split + 1:kmax + 1] -= small[v_large[split + 1:kmax + 1] // p] - sp
+            # Small entries v >= p^2. v // p runs through p, p+1, ... with each
+            # value repeated p times, so a repeat replaces a gather. The
+            # right-hand side is read in full before anything is written.
+            if p2 <= r:
+                small[p2:] -= np.repeat(small[p:r // p + 1], p)[:r + 1 - p2] - sp
+        self.small = small
+        self.large = large
+
+    def lookup(self, v):
+        """Return π(v) if v is tabulated, else None."""
+        if v > self.x:
+            return None
+        if v <= self.r:
+            return int(self.small[v])
+        k = self.x // v
+        if k <= self.r and self.x // k == v:
+            return int(self.large[k])
+        return None
+
+_last_tables = None
+_tables_lock = threading.Lock()
+
+def _phi_tables(x):
+    global _last_tables
+    with _tables_lock:
+        tables = _last_tables
+        if tables is None or tables.x != x:
+            logging.debug("Computing φ tables for x = %d", x)
+            tables = _PhiTables(x)
+            _last_tables = tables
+        return tables
+
+@functools.lru_cache(maxsize=256)
+def prime_pi(x):
+    """Return π(x), the number of primes <= x."""
+    x = int(x)
+    if x < 2:
+        return 0
+    if x > MAX_PRIME_PI_ARGUMENT:
+        raise ValueError("Prime counting is limited to x <= 10^14.")
+    table = prime_table.get_default_table()
+    if table is not None and (x < table.bound or x <= TABLE_DIRECT_LIMIT):
+        return table.count_primes_in_range(2, x)
+    if table is None and x <= TABLE_DIRECT_LIMIT:
+        return prime_sieve.count_primes_in_range(2, x)
+    # Reuse the last tables when x is one of their tabulated values
+    tables = _last_tables
+    if tables is not None:
+        known = tables.lookup(x)
+        if known is not None:
+            return known
+    return _phi_tables(x).lookup(x)
+
+def _nth_prime_estimate(n):
+    """Cipolla's asymptotic estimate of the n-th prime (n >= 6)."""
+    ln = math.log(n)
+    lnln = math.log(ln)
+    return int(n * (ln + lnln - 1 + (lnln - 2) / ln))
+
+def nth_prime(n):
+    """Return the n-th prime (nth_prime(1) == 2) by inverting π(x)."""
+    n = int(n)
+    if n < 1:
+        raise ValueError("n must be a positive integer.")
+    if n < 6:
+        return (2, 3, 5, 7, 11)[n - 1]
+    # Two Newton-style corrections using the prime density 1 / ln(x)
+    x = _nth_prime_estimate(n)
+    for _ in range(2):
+        count = prime_pi(x)
+        if count == n:
+            break
+        x = max(2, x + int((n - count) * math.log(x)))
+    count = prime_pi(x)
+    # Walk the remaining gap with the sieve, in windows
+    window = max(1 << 16, int(abs(n - count) * math.log(x) * 1.2))
+    if count >= n:
+        # The n-th prime is <= x: scan downwards
+        hi = x
+        while True:
+            lo = max(2, hi - window + 1)
+            primes = list(prime_sieve.primes_in_range(lo, hi))
+            if count - len(primes) < n:
+                return primes[n - (count - len(primes)) - 1]
+            count -= len(primes)
+            hi = lo - 1
+    else:
+        lo = x + 1
+        while True:
+            hi = lo + window - 1
+            for p in prime_sieve.primes_in_range(lo, hi):
+                count += 1
+                if count == n:
+                    return p
+            lo = hi + 1
@@ -0,0 +1,95 @@
+import math
+
+from primality import _small_primes
+
+# -----------------------------------------------------------------------------
+# Segmented Sieve of Eratosthenes
+# Only odd numbers are stored (one byte each), and each segment is sized to
+# stay resident in a typical L2 cache, so memory use is constant in the size of
+# the range: O(sqrt(b)) for the base primes plus one segment.
+# -----------------------------------------------------------------------------
+
+SEGMENT_BYTES = 1 << 19  # 512 KiB of odd-number flags per segment
+
+def _base_primes(limit):
+    """Odd primes up to and including limit."""
+    return _small_primes(limit + 1)[1:]
+
+def _segments(lo, hi, segment_bytes=SEGMENT_BYTES):
+    """
+    Yield (start, flags) pairs covering the odd numbers in [lo, hi).
+
+    flags[i] is 1 if start + 2*i is prime. lo must be odd and >= 3.
+    """
+    base = _base_primes(math.isqrt(hi - 1) if hi > 1 else 1)
+    span = 2 * segment_bytes
+    zeros = memoryview(bytes(segment_bytes))
+    # Active sieving primes and the flag index of their next odd multiple,
+    # carried from one segment to the next so no division is needed per segment.
+    active_primes = []
+    offsets = []
+    next_base = 0
+    start = lo
+    while start < hi:
+        end = min(start + span, hi)
+        size = (end - start + 1) // 2
+        while next_base < len(base) and base[next_base] * base[next_base] < end:
+            p = base[next_base]
+            first = p * p
+            if first < start:
+                first = start + (-start) % p
+                if first % 2 == 0:
+                    first += p
+            active_primes.append(p)
+            offsets.append((first - start) // 2)
+            next_base += 1
+        flags = bytearray(b"\x01") * size
+        for j, p in enumerate(active_primes):
+            idx = offsets[j]
+            if idx < size:
+                count = (size - 1 - idx) // p + 1
+                flags[idx::p] = zeros[:count]
+                idx += count * p
+            offsets[j] = idx - size
+        yield start, flags
+        start = end
+
+def _normalize_range(a, b):
+    """Clamp [a, b] to an odd start >= 3 and an exclusive end."""
+    a, b = int(a), int(b)
+    if a > b:
+        raise ValueError("Range start must not exceed range end.")
+    lo = max(a, 3)
+    if lo % 2 == 0:
+        lo += 1
+    return lo, b + 1
+
+def primes_in_range(a, b, segment_bytes=SEGMENT_BYTES):
+    """Generate the primes p with a <= p <= b in increasing order."""
+    a, b = int(a), int(b)
+    if a <= 2 <= b:
+        yield 2
+    lo, hi = _normalize_range(a, b)
+    if lo >= hi:
+        return
+    for start, flags in _segments(lo, hi, segment_bytes):
+        find = flags.find
+        i = find(1)
+        while i != -1:
+            yield start + 2 * i
+            i = find(1, i + 1)
+
+def count_primes_in_range(a, b, segment_bytes=SEGMENT_BYTES):
+    """Count the primes p with a <= p <= b."""
+    a, b = int(a), int(b)
+    count = 1 if a <= 2 <= b else 0
+    lo, hi = _normalize_range(a, b)
+    if lo >= hi:
+        return count
+    for _, flags in _segments(lo, hi, segment_bytes):
+        count += flags.count(1)
+    return count
+
+def primes_up_to(n):
+    """Return the list of primes <= n."""
+    return list(primes_in_range(2, n))
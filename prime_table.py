@@ -0,0 +1,245 @@
+import os
+import sys
+import mmap
+import struct
+import threading
+import logging
+
+import prime_sieve
+
+# -----------------------------------------------------------------------------
+# Persistent prime table
+# A bitmap over the odd numbers (bit i <=> 2*i + 1 is prime) stored in the
+# user's cache directory and read through mmap, so lookups below the table
+# bound are O(1) and the table is never loaded into RAM as a whole. Range
+# queries extend the table on demand by sieving only the missing part.
+# -----------------------------------------------------------------------------
+
+MAGIC = b"PRTB"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")  # magic, version, bound (table covers n < bound)
+
+INITIAL_BOUND = 1 << 24
+MAX_BOUND = 1 << 32  # 256 MiB on disk; larger range queries use the sieve directly
+TABLE_FILENAME = "prime_table.bin"
+
+# Bounds are kept multiples of 16 so the bitmap always ends on a whole byte
+_ALIGN = 16
+
+def default_cache_dir():
+    """Return the per-user cache directory for this application."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "DiscreetMath")
+
+def _pack_flags(flags):
+    """Pack a bytearray of 0/1 flags (length a multiple of 8) into little-endian bits."""
+    if not flags:
+        return b""
+    bits = flags.translate(_FLAG_TO_ASCII)[::-1]
+    return int(bits, 2).to_bytes(len(flags) // 8, "little")
+
+_FLAG_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_BYTE_BIT_POSITIONS = [tuple(j for j in range(8) if byte >> j & 1) for byte in range(256)]
+
+class PrimeTable:
+    """Memory-mapped odd-number prime bitmap that grows on demand."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._file = None
+        self._map = None
+        self.bound = 0
+        self._open()
+
+    # -- file management -------------------------------------------------------
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0))
+        self._file = open(self.path, "r+b")
+        magic, version, bound = HEADER.unpack(self._file.read(HEADER.size))
+        expected_size = HEADER.size + bound // _ALIGN
+        if magic != MAGIC or version != VERSION or os.path.getsize(self.path) < expected_size:
+            logging.warning("Prime table %s is invalid; rebuilding it", self.path)
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0))
+            self._file.flush()
+            bound = 0
+        self.bound = bound
+        self._remap()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self.bound:
+            self._map = mmap.mmap(self._file.fileno(), HEADER.size + self.bound // _ALIGN,
+                                  access=mmap.ACCESS_READ)
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def grow(self, bound):
+        """Extend the table so it covers every n < bound (rounded up, capped at MAX_BOUND)."""
+        bound = min(-(-int(bound) // _ALIGN) * _ALIGN, MAX_BOUND)
+        with self._lock:
+            if bound <= self.bound:
+                return
+            old_bound = self.bound
+            logging.debug("Growing prime table from %d to %d", old_bound, bound)
+            # Windows cannot extend a file while it is mapped
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.seek(HEADER.size + old_bound // _ALIGN)
+            pending = bytearray()
+            if old_bound == 0:
+                pending += b"\x00"  # 1 is not prime
+                lo = 3
+            else:
+                lo = old_bound + 1
+            for _, flags in prime_sieve._segments(lo, bound):
+                pending += flags
+                whole = len(pending) - len(pending) % 8
+                self._file.write(_pack_flags(pending[:whole]))
+                del pending[:whole]
+            self._file.write(_pack_flags(pending))
+            self._file.flush()
+            # Publish the new bound only after the bitmap is on disk
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, VERSION, bound))
+            self._file.flush()
+            self.bound = bound
+            self._remap()
+
+    # -- queries ---------------------------------------------------------------
+
+    def lookup(self, n):
+        """Return True/False if n is below the table bound, otherwise None."""
+        n = int(n)
+        # grow() unmaps the file while extending it, so reads hold the lock
+        with self._lock:
+            if n >= self.bound:
+                return None
+            if n < 3:
+                return n == 2
+            if n % 2 == 0:
+                return False
+            i = n >> 1
+            return bool(self._map[HEADER.size + (i >> 3)] >> (i & 7) & 1)
+
+    def _bits(self, lo_index, hi_index):
+        """Return the bitmap entries [lo_index, hi_index) as an int, bit 0 = lo_index."""
+        start = lo_index >> 3
+        end = (hi_index + 7) >> 3
+        with self._lock:
+            chunk = int.from_bytes(self._map[HEADER.size + start:HEADER.size + end], "little")
+        chunk >>= lo_index - (start << 3)
+        return chunk & ((1 << (hi_index - lo_index)) - 1)
+
+    # Bytes per chunk when scanning ranges
+    _CHUNK = 1 << 16
+
+    def primes_in_range(self, a, b):
+        """Generate the primes in [a, b]; the table grows to cover b when possible."""
+        a, b = int(a), int(b)
+        if a > b:
+            raise ValueError("Range start must not exceed range end.")
+        if b >= MAX_BOUND:
+            yield from prime_sieve.primes_in_range(a, b)
+            return
+        self.grow(b + 1)
+        if a <= 2 <= b:
+            yield 2
+        lo = max(a, 3) >> 1
+        hi = (b + 1) >> 1
+        if lo >= hi:
+            return
+        first_byte = lo >> 3
+        last_byte = (hi - 1) >> 3
+        positions = _BYTE_BIT_POSITIONS
+        for chunk_start in range(first_byte, last_byte + 1, self._CHUNK):
+            chunk_end = min(chunk_start + self._CHUNK, last_byte + 1)
+            # Copied under the lock; the lock is not held across yields
+            with self._lock:
+                chunk = self._map[HEADER.size + chunk_start:HEADER.size + chunk_end]
+            for k, byte in enumerate(chunk):
+                if byte:
+                    base = (chunk_start + k) << 3
+                    for j in positions[byte]:
+                        i = base + j
+                        if lo <= i < hi:
+                            yield 2 * i + 1
+
+    def count_primes_in_range(self, a, b):
+        """Count the primes in [a, b]; the table grows to cover b when possible."""
+        a, b = int(a), int(b)
+        if a > b:
+            raise ValueError("Range start must not exceed range end.")
+        if b >= MAX_BOUND:
+            return prime_sieve.count_primes_in_range(a, b)
+        self.grow(b + 1)
+        count = 1 if a <= 2 <= b else 0
+        lo = max(a, 3) >> 1
+        hi = (b + 1) >> 1
+        while lo < hi:
+            top = min(lo + 8 * self._CHUNK, hi)
+            count += self._bits(lo, top).bit_count()
+            lo = top
+        return count
+
+# -----------------------------------------------------------------------------
+# Shared default table
+# -----------------------------------------------------------------------------
+
+_default_table = None
+_default_lock = threading.Lock()
+
+def get_default_table():
+    """Open (creating if needed) the table in the user cache directory, or None if unavailable."""
+    global _default_table
+    with _default_lock:
+        if _default_table is None:
+            try:
+                table = PrimeTable(os.path.join(default_cache_dir(), TABLE_FILENAME))
+                if table.bound < INITIAL_BOUND:
+                    table.grow(INITIAL_BOUND)
+                _default_table = table
+            except OSError as e:
+                logging.warning("Prime table unavailable: %s", e)
+                _default_table = False
+        return _default_table or None
+
+def lookup(n):
+    """Look n up in the default table; None if it is beyond the bound or the table is unavailable."""
+    table = get_default_table()
+    return table.lookup(n) if table is not None else None
+
+def primes_in_range(a, b):
+    """Generate the primes in [a, b], using the default table where possible."""
+    table = get_default_table()
+    if table is None:
+        return prime_sieve.primes_in_range(a, b)
+    return table.primes_in_range(a, b)
+
+def count_primes_in_range(a, b):
+    """Count the primes in [a, b], using the default table where possible."""
+    table = get_default_table()
+    if table is None:
+        return prime_sieve.count_primes_in_range(a, b)
+    return table.count_primes_in_range(a, b)
@@ -0,0 +1,416 @@
+import fractions
+from collections import namedtuple
+
+import number_analysis
+import arithmetic_functions
+import special_numbers
+import gaussian_integers
+import continued_fractions
+
+# -----------------------------------------------------------------------------
+# Number properties as a lazy dependency graph
+# Every property is a node with its dependencies, a cost estimate and a
+# compute function. A PropertyContext evaluates nodes on demand and memoizes
+# them, so asking for "Composite" evaluates "Natural Number" and then "Prime"
+# only if n > 1, and nothing that was not asked for is ever computed. Callers
+# pick the nodes to show; stream() yields them cheapest first, so the
+# expensive ones (primality of large n, factorization, σ) arrive last.
+#
+# Nodes whose group is None are internal helpers (e.g. the factorization
+# itself) and are never displayed.
+# -----------------------------------------------------------------------------
+
+PropertyNode = namedtuple("PropertyNode", "name group kind deps cost compute applies")
+
+# Registered nodes by name, in display order
+PROPERTY_NODES = {}
+
+GROUPS = ("Basic", "Primality", "Factorization", "Arithmetic Functions", "Special Classes", "Gaussian Integers",
+          "Continued Fraction")
+
+# Special-class recognizers estimated above this many microseconds are skipped;
+# this keeps every class sub-millisecond at 1000 digits (the Carmichael base-2
+# Fermat test, about 140 ms there, only runs up to about 150 digits)
+SPECIAL_COST_BUDGET = 1000
+
+# Partial quotients and convergents shown for a continued fraction
+CF_DISPLAY_TERMS = 30
+CONVERGENTS_SHOWN = 8
+
+# Cost estimates are capped here so unknown costs still sort
+_MAX_COST = 1e12
+
+def node(name, group=None, kind="flag", deps=(), cost=1, applies=None):
+    """
+    Register compute(ctx) as the node name. cost is a number or cost(ctx)
+    (microseconds); applies(ctx) decides whether the node is meaningful for
+    the value, e.g. parity only for integers.
+    """
+    def decorator(compute):
+        PROPERTY_NODES[name] = PropertyNode(name, group, kind, tuple(deps),
+                                            cost if callable(cost) else (lambda ctx, c=cost: c),
+                                            compute, applies)
+        return compute
+    return decorator
+
+def names_in_groups(groups):
+    """Displayable node names belonging to any of groups, in display order."""
+    return [name for name, n in PROPERTY_NODES.items() if n.group in groups]
+
+class PropertyContext:
+    """Lazy, memoized evaluation of property nodes for one value."""
+
+    def __init__(self, value, source=None, time_limit=None, cancel=None, known=None):
+        self.value = number_analysis.to_exact(value)
+        self.source = source
+        self.time_limit = time_limit
+        self.cancel = cancel
+        self.values = dict(known or {})
+
+    @property
+    def bits(self):
+        v = self.value
+        return abs(v).bit_length() if isinstance(v, int) else 0
+
+    def get(self, name):
+        if name not in self.values:
+            self.values[name] = PROPERTY_NODES[name].compute(self)
+        return self.values[name]
+
+    def peek(self, name, default=None):
+        """The value of name if it has been computed, else default."""
+        return self.values.get(name, default)
+
+    def applies(self, name):
+        predicate = PROPERTY_NODES[name].applies
+        return predicate is None or predicate(self)
+
+    def cost(self, name, _seen=None):
+        """Estimated cost of evaluating name, including dependencies not yet computed."""
+        if name in self.values:
+            return 0
+        seen = set() if _seen is None else _seen
+        if name in seen:
+            return 0
+        seen.add(name)
+        n = PROPERTY_NODES[name]
+        total = min(n.cost(self), _MAX_COST)
+        for dep in n.deps:
+            total += self.cost(dep, seen)
+        return min(total, _MAX_COST)
+
+    def plan(self, names):
+        """The applicable names, in display order."""
+        return [name for name in names if self.applies(name)]
+
+    def schedule(self, names):
+        """
+        Yield names cheapest remaining first; costs are re-estimated after
+        each one, since computing a node can make others cheaper.
+        """
+        pending = list(names)
+        while pending:
+            name = min(pending, key=self.cost)
+            pending.remove(name)
+            yield name
+
+    def stream(self, names):
+        """Yield (name, value) for each name, cheapest remaining first."""
+        for name in self.schedule(names):
+            yield name, self.get(name)
+
+    def complete(self):
+        """Values worth caching: everything unless a factorization was cut short."""
+        factorization = self.values.get("_factorization")
+        if factorization is not None and factorization[1]:
+            return None
+        return dict(self.values)
+
+# -----------------------------------------------------------------------------
+# Basic classification (mirrors number_analysis.classify)
+# -----------------------------------------------------------------------------
+
+def _is_real(ctx):
+    return not isinstance(ctx.value, complex)
+
+def _is_natural(ctx):
+    return ctx.get("Natural Number")
+
+def _sign(ctx):
+    v = ctx.value
+    if isinstance(v, fractions.Fraction):
+        v = v.numerator
+    return (v > 0) - (v < 0)
+
+@node("Complex Number", "Basic")
+def _complex(ctx):
+    return isinstance(ctx.value, complex)
+
+@node("Real Number", "Basic")
+def _real(ctx):
+    return _is_real(ctx)
+
+@node("Rational Number", "Basic", applies=_is_real)
+def _rational(ctx):
+    v = ctx.value
+    if isinstance(v, (int, fractions.Fraction)):
+        return True
+    return isinstance(v, float) and continued_fractions.float_is_rational(v)
+
+@node("Irrational Number", "Basic", deps=("Rational Number",), applies=_is_real)
+def _irrational(ctx):
+    return _is_real(ctx) and not ctx.get("Rational Number")
+
+@node("Integer", "Basic", applies=_is_real)
+def _integer(ctx):
+    return isinstance(ctx.value, int)
+
+@node("Whole Number", "Basic", deps=("Integer",), applies=_is_real)
+def _whole(ctx):
+    return ctx.get("Integer") and ctx.value >= 0
+
+@node("Natural Number", "Basic", deps=("Integer",), applies=_is_real)
+def _natural(ctx):
+    return ctx.get("Integer") and ctx.value > 0
+
+@node("Positive", "Basic", applies=_is_real)
+def _positive(ctx):
+    return _is_real(ctx) and _sign(ctx) > 0
+
+@node("Negative", "Basic", applies=_is_real)
+def _negative(ctx):
+    return _is_real(ctx) and _sign(ctx) < 0
+
+@node("Zero", "Basic", applies=_is_real)
+def _zero(ctx):
+    return _is_real(ctx) and _sign(ctx) == 0
+
+@node("Even", "Basic", deps=("Integer",), applies=_is_real)
+def _even(ctx):
+    return ctx.get("Integer") and not ctx.value & 1
+
+@node("Odd", "Basic", deps=("Integer",), applies=_is_real)
+def _odd(ctx):
+    return ctx.get("Integer") and bool(ctx.value & 1)
+
+# -----------------------------------------------------------------------------
+# Primality and factorization
+# -----------------------------------------------------------------------------
+
+def _primality_cost(ctx):
+    bits = ctx.bits
+    # Table lookup below 2^32, Miller-Rabin / Baillie-PSW above
+    return 1 if bits <= 32 else 1 + bits ** 2.6 / 10 ** 4
+
+def _factorization_cost(ctx):
+    bits = ctx.bits
+    if bits <= 40:
+        return 100
+    # Rho and ECM run time grows exponentially with the size of the factors
+    return 1e4 * 2.0 ** min(bits / 8, 100)
+
+@node("Prime", "Primality", deps=("Natural Number",), cost=_primality_cost, applies=_is_real)
+def _prime(ctx):
+    return ctx.get("Natural Number") and ctx.value > 1 and number_analysis.is_prime(ctx.value)
+
+@node("Composite", "Primality", deps=("Natural Number", "Prime"), cost=_primality_cost, applies=_is_real)
+def _composite(ctx):
+    return ctx.get("Natural Number") and ctx.value > 1 and not ctx.get("Prime")
+
+@node("_factorization", deps=("Prime",), cost=_factorization_cost)
+def _factorization(ctx):
+    """(factors, remaining) for n > 1; remaining lists unfactored cofactors."""
+    if ctx.get("Prime"):
+        return {ctx.value: 1}, []
+    return number_analysis.factorize(ctx.value, ctx.time_limit, ctx.cancel)
+
+@node("_factors", deps=("_factorization",))
+def _factors(ctx):
+    """The complete factorization, or None if it was cut short."""
+    if ctx.value == 1:
+        return {}
+    factors, remaining = ctx.get("_factorization")
+    return None if remaining else factors
+
+def _natural_above_one(ctx):
+    return _is_real(ctx) and _is_natural(ctx) and ctx.value > 1
+
+@node("Prime Factorization", "Factorization", kind="text", deps=("_factorization",),
+      cost=_factorization_cost, applies=_natural_above_one)
+def _factorization_text(ctx):
+    factors, remaining = ctx.get("_factorization")
+    if not remaining and factors == {ctx.value: 1}:
+        return f"{number_analysis.format_number(ctx.value)} (prime)"
+    return number_analysis.format_factorization(factors, remaining)
+
+# -----------------------------------------------------------------------------
+# Arithmetic functions
+# -----------------------------------------------------------------------------
+
+def _arith_cost(ctx):
+    # Table lookup or combining the factors; the factorization is the _factors dependency
+    return 1
+
+@node("_arith", deps=("_factors",), cost=_arith_cost)
+def _arith(ctx):
+    """{name: value} for φ, μ, d, σ, Ω, or None if n could not be factored."""
+    n = ctx.value
+    if n <= arithmetic_functions.DEFAULT_TABLE_LIMIT:
+        return arithmetic_functions.get_default_tables().lookup(n)
+    factors = ctx.get("_factors")
+    return arithmetic_functions.from_factorization(factors) if factors is not None else None
+
+def _register_arithmetic(name):
+    @node(arithmetic_functions.FUNCTION_LABELS[name], "Arithmetic Functions", kind="text",
+          deps=("_arith",), applies=lambda ctx: _is_real(ctx) and _is_natural(ctx))
+    def compute(ctx):
+        values = ctx.get("_arith")
+        return number_analysis.format_number(values[name]) if values else "Unknown (not factored)"
+
+for _name in arithmetic_functions.FUNCTION_NAMES:
+    _register_arithmetic(_name)
+
+# -----------------------------------------------------------------------------
+# Special number classes (special_numbers.py); values are (flag, detail)
+# -----------------------------------------------------------------------------
+
+# The node each special_numbers fact comes from
+_FACT_NODES = {"prime": "Prime", "factors": "_factors", "sigma": "_arith"}
+
+def _fact(ctx, key, compute):
+    value = ctx.get(_FACT_NODES[key]) if compute else ctx.peek(_FACT_NODES[key])
+    if key == "sigma":
+        return value["sigma"] if value else None
+    return value
+
+def _special_facts(ctx, needed=()):
+    """The facts a recognizer needs (computing them), plus whatever else is already known."""
+    return {key: _fact(ctx, key, key in needed) for key in _FACT_NODES}
+
+def _register_special(prop):
+    def cost(ctx):
+        return prop.cost(ctx.bits, _special_facts(ctx))
+
+    @node(prop.name, "Special Classes", kind="special",
+          deps=("Natural Number",) + tuple(_FACT_NODES[key] for key in prop.facts), cost=cost,
+          applies=lambda ctx: _is_real(ctx) and _is_natural(ctx))
+    def compute(ctx):
+        facts = _special_facts(ctx, prop.facts)
+        if prop.cost(ctx.bits, facts) > SPECIAL_COST_BUDGET:
+            return None, None
+        return prop.test(ctx.value, facts)
+
+for _prop in special_numbers.SPECIAL_PROPERTIES:
+    _register_special(_prop)
+
+# -----------------------------------------------------------------------------
+# Gaussian integers (complex input with integer parts)
+# -----------------------------------------------------------------------------
+
+@node("_gaussian")
+def _gaussian(ctx):
+    """(a, b) if the input is a Gaussian integer, else None."""
+    if not isinstance(ctx.value, complex) or ctx.source is None:
+        return None
+    return gaussian_integers.parse_gaussian(ctx.source)
+
+def _is_gaussian(ctx):
+    return isinstance(ctx.value, complex) and ctx.get("_gaussian") is not None
+
+def _gaussian_cost(ctx):
+    z = ctx.peek("_gaussian")
+    bits = 2 * max(abs(z[0]), abs(z[1])).bit_length() if z else 0
+    return 1 + bits ** 2.6 / 10 ** 4
+
+@node("Gaussian Integer", "Gaussian Integers", deps=("_gaussian",),
+      applies=lambda ctx: isinstance(ctx.value, complex))
+def _gaussian_integer(ctx):
+    return ctx.get("_gaussian") is not None
+
+@node("Gaussian Prime", "Gaussian Integers", deps=("_gaussian",), cost=_gaussian_cost, applies=_is_gaussian)
+def _gaussian_prime(ctx):
+    return gaussian_integers.is_gaussian_prime(ctx.get("_gaussian"))
+
+@node("Norm a² + b²", "Gaussian Integers", kind="text", deps=("_gaussian",), applies=_is_gaussian)
+def _gaussian_norm(ctx):
+    return number_analysis.format_number(gaussian_integers.norm(ctx.get("_gaussian")))
+
+def _gaussian_factorization_cost(ctx):
+    z = ctx.peek("_gaussian")
+    bits = 2 * max(abs(z[0]), abs(z[1])).bit_length() if z else 0
+    return 1e4 * 2.0 ** min(bits / 8, 100)
+
+@node("Gaussian Factorization", "Gaussian Integers", kind="text", deps=("Gaussian Prime",),
+      cost=_gaussian_factorization_cost, applies=_is_gaussian)
+def _gaussian_factorization(ctx):
+    z = ctx.get("_gaussian")
+    if ctx.get("Gaussian Prime"):
+        return f"{gaussian_integers.format_gaussian(z)} (Gaussian prime)"
+    unit, factors, remaining = gaussian_integers.factorize(z, ctx.time_limit, ctx.cancel)
+    return gaussian_integers.format_gaussian_factorization(unit, factors, remaining)
+
+# -----------------------------------------------------------------------------
+# Continued fractions (non-integer reals; floats only to their precision)
+# -----------------------------------------------------------------------------
+
+def _is_fraction(ctx):
+    return _is_real(ctx) and not isinstance(ctx.value, int)
+
+def _continued_fraction_cost(ctx):
+    v = ctx.value
+    if isinstance(v, fractions.Fraction):
+        bits = max(abs(v.numerator).bit_length(), v.denominator.bit_length())
+        return 1 + bits ** 2 / 10 ** 3
+    # Floats: interval expansion and the periodicity search
+    return 1000
+
+@node("_continued_fraction", cost=_continued_fraction_cost)
+def _continued_fraction(ctx):
+    """continued_fractions.describe() of the value."""
+    return continued_fractions.describe(ctx.value, CF_DISPLAY_TERMS)
+
+@node("Continued Fraction", "Continued Fraction", kind="text", deps=("_continued_fraction",),
+      applies=_is_fraction)
+def _continued_fraction_text(ctx):
+    cf = ctx.get("_continued_fraction")
+    return continued_fractions.format_continued_fraction(cf["terms"], cf["more"], cf["period"])
+
+@node("Convergents", "Continued Fraction", kind="text", deps=("_continued_fraction",),
+      applies=_is_fraction)
+def _convergents(ctx):
+    cf = ctx.get("_continued_fraction")
+    terms = cf["terms"]
+    if cf["quadratic"] is not None:
+        terms = continued_fractions.partial_quotients(cf["quadratic"])
+    shown = []
+    for fraction in continued_fractions.convergents(terms):
+        if len(shown) == CONVERGENTS_SHOWN:
+            shown.append("…")
+            break
+        shown.append(number_analysis.format_number(number_analysis.to_exact(fraction)))
+    return ", ".join(shown)
+
+@node("Quadratic Irrational", "Continued Fraction", kind="text", deps=("_continued_fraction",),
+      applies=lambda ctx: isinstance(ctx.value, float))
+def _quadratic_irrational(ctx):
+    quadratic = ctx.get("_continued_fraction")["quadratic"]
+    if quadratic is None:
+        return "Not recognized"
+    return continued_fractions.format_quadratic(quadratic)
+
+# -----------------------------------------------------------------------------
+# Presentation helpers
+# -----------------------------------------------------------------------------
+
+def to_record_value(name, value):
+    """JSON-friendly form of a node value."""
+    if PROPERTY_NODES[name].kind == "special":
+        flag, detail = value
+        return None if flag is None else (f"{detail}" if flag and detail else flag)
+    return value
+
+def display_label(name, value):
+    """Row label for a computed node, e.g. 'Fibonacci Number (F(12))'."""
+    if PROPERTY_NODES[name].kind == "special" and value[1]:
+        return f"{name} ({value[1]})"
+    return name
@@ -0,0 +1,220 @@
+import math
+from collections import namedtuple
+
+import factorization
+import number_analysis
+
+# -----------------------------------------------------------------------------
+# Special number classes
+# Each class is a registered recognizer with a cost estimate; recognize()
+# runs them cheapest first and can skip those above a cost budget. All
+# kernels are exact integer arithmetic: isqrt and Newton k-th roots for the
+# power tests, fast-doubling Fibonacci/Lucas with the index estimated from
+# log(n), bit tricks for the Mersenne and Fermat forms. A recognizer returns
+# (True/False, detail) or (None, None) when it cannot decide cheaply, e.g. a
+# divisor-sum test without a factorization.
+# -----------------------------------------------------------------------------
+
+SpecialProperty = namedtuple("SpecialProperty", "name cost test facts")
+
+# Registered recognizers, in display order
+SPECIAL_PROPERTIES = []
+
+# Odd perfect numbers, if any exist, are larger than this (Ochem & Rao, 2012)
+ODD_PERFECT_LOWER_BOUND = 10 ** 1500
+
+_LOG_PHI = math.log((1 + math.sqrt(5)) / 2)
+_LOG_SQRT5 = 0.5 * math.log(5)
+
+def register(name, cost, facts=()):
+    """
+    Register test(n, facts) as the recognizer for a special number class.
+    cost(bits, facts) estimates its running time in microseconds; facts names
+    the facts ("prime", "factors", "sigma") the test needs to decide, which
+    callers able to compute them should supply.
+    """
+    def decorator(test):
+        SPECIAL_PROPERTIES.append(SpecialProperty(name, cost, test, tuple(facts)))
+        return test
+    return decorator
+
+# -----------------------------------------------------------------------------
+# Integer kernels
+# -----------------------------------------------------------------------------
+
+def fibonacci_pair(k):
+    """Return (F(k), F(k+1)) by fast doubling."""
+    a, b = 0, 1
+    for bit in bin(k)[2:]:
+        # F(2m) = F(m) (2F(m+1) - F(m)), F(2m+1) = F(m)^2 + F(m+1)^2
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+def fibonacci(k):
+    return fibonacci_pair(k)[0]
+
+def lucas(k):
+    """L(k) = 2 F(k+1) - F(k)."""
+    f, f1 = fibonacci_pair(k)
+    return 2 * f1 - f
+
+def _index_estimate(n, offset):
+    """Round((log n + offset) / log φ), the index of a Fibonacci-like value near n."""
+    return max(0, round((math.log(n) + offset) / _LOG_PHI))
+
+# -----------------------------------------------------------------------------
+# Recognizers
+# -----------------------------------------------------------------------------
+
+def _constant(us):
+    return lambda bits, facts: us
+
+def _linear(us_per_kbit):
+    return lambda bits, facts: 1 + bits * us_per_kbit / 1000
+
+@register("Mersenne Number", _constant(1))
+def is_mersenne_form(n, facts):
+    """n = 2^k - 1."""
+    if n & (n + 1):
+        return False, None
+    return True, f"2^{(n + 1).bit_length() - 1} − 1"
+
+@register("Fermat Number", _constant(1))
+def is_fermat_form(n, facts):
+    """n = 2^(2^m) + 1."""
+    k = (n - 1).bit_length() - 1
+    if n < 3 or n - 1 != 1 << k or k & (k - 1):
+        return False, None
+    return True, f"F{k.bit_length() - 1} = 2^{k} + 1"
+
+@register("Perfect Square", _linear(20))
+def is_perfect_square(n, facts):
+    r = math.isqrt(n)
+    if r * r != n:
+        return False, None
+    return True, f"{number_analysis.format_number(r)}²"
+
+@register("Perfect Power", _linear(100))
+def is_perfect_power(n, facts):
+    if n == 1:
+        return True, "1^k"
+    power = factorization.perfect_power(n)
+    if power is None:
+        return False, None
+    base, exp = power
+    return True, f"{number_analysis.format_number(base)}^{exp}"
+
+@register("Triangular Number", _linear(20))
+def is_triangular(n, facts):
+    """n = k(k+1)/2  <=>  8n + 1 is a square."""
+    s = math.isqrt(8 * n + 1)
+    if s * s != 8 * n + 1:
+        return False, None
+    return True, f"T({number_analysis.format_number((s - 1) // 2)})"
+
+@register("Fibonacci Number", _linear(30))
+def is_fibonacci(n, facts):
+    # F(k) ≈ φ^k / sqrt(5); check the estimate and its neighbours exactly
+    k = max(0, _index_estimate(n, _LOG_SQRT5) - 1)
+    a, b = fibonacci_pair(k)
+    for i in range(k, k + 3):
+        if a == n:
+            return True, f"F({i})"
+        a, b = b, a + b
+    return False, None
+
+@register("Lucas Number", _linear(30))
+def is_lucas(n, facts):
+    # L(k) ≈ φ^k; L(k) = F(k-1) + F(k+1)
+    if n in (1, 2):
+        return True, "L(1)" if n == 1 else "L(0)"
+    k = max(1, _index_estimate(n, 0) - 1)
+    f_prev, f = fibonacci_pair(k - 1)
+    f_next = f_prev + f
+    for i in range(k, k + 3):
+        if f_prev + f_next == n:
+            return True, f"L({i})"
+        f_prev, f, f_next = f, f_next, f + f_next
+    return False, None
+
+@register("Perfect Number", _linear(5))
+def is_perfect(n, facts):
+    """Even perfect numbers are 2^(p-1) (2^p - 1) with 2^p - 1 prime (Euclid-Euler)."""
+    if n & 1:
+        if n < ODD_PERFECT_LOWER_BOUND:
+            return False, None
+        sigma = facts.get("sigma")
+        return (sigma == 2 * n, None) if sigma is not None else (None, None)
+    v = (n & -n).bit_length() - 1
+    m = n >> v
+    if m != (1 << (v + 1)) - 1 or not number_analysis.is_prime(m):
+        return False, None
+    return True, f"2^{v} × (2^{v + 1} − 1)"
+
+@register("Abundant Number", _constant(10), facts=("prime", "sigma"))
+def is_abundant(n, facts):
+    """σ(n) > 2n."""
+    if facts.get("prime"):
+        return False, None
+    sigma = facts.get("sigma")
+    if sigma is None and facts.get("factors") is not None:
+        sigma = 1
+        for p, e in facts["factors"].items():
+            sigma *= (p ** (e + 1) - 1) // (p - 1)
+    if sigma is not None:
+        return sigma > 2 * n, None
+    # Proper multiples of the perfect number 6 are abundant
+    if n % 6 == 0 and n > 6:
+        return True, None
+    return None, None
+
+def _carmichael_cost(bits, facts):
+    if facts.get("factors") is not None or facts.get("prime"):
+        return 10
+    # One base-2 Fermat test
+    return 1 + bits ** 2.6 / 10 ** 4
+
+@register("Carmichael Number", _carmichael_cost, facts=("prime", "factors"))
+def is_carmichael(n, facts):
+    """Composite, squarefree, and p - 1 | n - 1 for every prime p | n (Korselt)."""
+    if n < 561 or not n & 1 or facts.get("prime"):
+        return False, None
+    factors = facts.get("factors")
+    if factors is not None:
+        if len(factors) < 3 or any(e > 1 for e in factors.values()):
+            return False, None
+        return all((n - 1) % (p - 1) == 0 for p in factors), None
+    # Every Carmichael number is a base-2 Fermat pseudoprime
+    if pow(2, n - 1, n) != 1:
+        return False, None
+    return None, None
+
+# -----------------------------------------------------------------------------
+# Driver
+# -----------------------------------------------------------------------------
+
+def recognize(n, prime=None, factors=None, sigma=None, max_cost=None):
+    """
+    Classify the natural number n against every registered class.
+
+    prime, factors (a complete factorization) and sigma (σ(n)) are optional
+    facts the caller already has. Recognizers run in order of estimated cost;
+    those above max_cost (microseconds) are skipped and reported as None.
+    Returns a list of (name, value, detail) in registration order, where value
+    is True, False or None (undecided).
+    """
+    if n < 1:
+        raise ValueError("Special number classes are defined for natural numbers.")
+    facts = {"prime": prime, "factors": factors, "sigma": sigma}
+    bits = n.bit_length()
+    costs = [prop.cost(bits, facts) for prop in SPECIAL_PROPERTIES]
+    results = [None] * len(SPECIAL_PROPERTIES)
+    for i in sorted(range(len(SPECIAL_PROPERTIES)), key=costs.__getitem__):
+        if max_cost is not None and costs[i] > max_cost:
+            results[i] = (SPECIAL_PROPERTIES[i].name, None, None)
+            continue
+        value, detail = SPECIAL_PROPERTIES[i].test(n, facts)
+        results[i] = (SPECIAL_PROPERTIES[i].name, value, detail)
+    return results
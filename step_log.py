@@ -0,0 +1,43 @@
+from collections import namedtuple
+
+# -----------------------------------------------------------------------------
+# Step-by-step calculation log
+# Solvers record each step as a Step (a format template and its arguments)
+# instead of a finished string, so building the log costs one tuple per step
+# and the text is only formatted when a step is actually drawn. A template
+# may also be a function, called with the arguments, for text that is more
+# than one format string. The log needs no Tk; step_view draws it.
+# -----------------------------------------------------------------------------
+
+class Step(namedtuple("Step", "template args")):
+    __slots__ = ()
+
+    def text(self):
+        if callable(self.template):
+            return self.template(*self.args)
+        # Steps without arguments are taken verbatim (they may contain braces)
+        return self.template.format(*self.args) if self.args else self.template
+
+class StepLog:
+    """The steps of one calculation; reading an entry formats it."""
+
+    def __init__(self):
+        self.records = []
+
+    def add(self, template, *args):
+        self.records.append(Step(template, args))
+
+    def extend(self, texts):
+        """Append finished strings (or another StepLog's records)."""
+        for text in texts.records if isinstance(texts, StepLog) else texts:
+            self.records.append(text if isinstance(text, Step) else Step(text, ()))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index].text()
+
+    def __iter__(self):
+        for record in self.records:
+            yield record.text()
@@ -0,0 +1,119 @@
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+from step_log import StepLog
+
+# -----------------------------------------------------------------------------
+# Virtualized view of a StepLog
+# The log is drawn on a Canvas with one fixed-height line per step, and text
+# items are only created for the lines in view (and recreated on scrolling),
+# so a log of thousands of steps opens and scrolls as fast as a log of ten.
+# Steps are formatted as they come into view.
+# -----------------------------------------------------------------------------
+
+# Lines shown before the view starts scrolling
+STEP_VIEW_LINES = 12
+STEP_VIEW_WIDTH = 700
+STEP_FONT = ("Arial", 10, "italic")
+
+class StepView:
+    """Scrollable view of a StepLog that only materializes the visible lines."""
+
+    def __init__(self, parent, colors, max_lines=STEP_VIEW_LINES, width=STEP_VIEW_WIDTH, font=STEP_FONT):
+        self.font = tkfont.Font(font=font)
+        self.line_height = self.font.metrics("linespace") + 2
+        self.max_lines = max_lines
+        self.log = StepLog()
+        self.text_width = 0
+
+        self.frame = ttk.Frame(parent, style="TFrame")
+        self.canvas = tk.Canvas(self.frame, width=width, height=0, highlightthickness=0,
+                                yscrollincrement=self.line_height)
+        self.v_scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self._yview)
+        self.h_scroll = ttk.Scrollbar(self.frame, orient="horizontal", command=self.canvas.xview)
+        self.canvas.configure(yscrollcommand=self.v_scroll.set, xscrollcommand=self.h_scroll.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.frame.columnconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+        self.set_colors(colors)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_colors(self, colors):
+        self.fg = colors["fg"]
+        self.canvas.configure(background=colors["bg"])
+        self.canvas.itemconfigure("step", fill=self.fg)
+
+    def set_log(self, log):
+        """Show log (a StepLog or a list of strings) in place of the current one."""
+        if not isinstance(log, StepLog):
+            strings, log = log, StepLog()
+            log.extend(strings)
+        self.log = log
+        self.text_width = 0
+        self.canvas.yview_moveto(0)
+        self.canvas.xview_moveto(0)
+        self.refresh()
+
+    def clear(self):
+        self.set_log(StepLog())
+
+    def add(self, text):
+        self.log.add(text)
+        self.refresh()
+
+    def refresh(self):
+        """Resize to the log (up to max_lines) and redraw."""
+        count = len(self.log)
+        self.canvas.configure(height=min(count, self.max_lines) * self.line_height)
+        if count > self.max_lines:
+            self.v_scroll.grid(row=0, column=1, sticky="ns")
+        else:
+            self.v_scroll.grid_remove()
+        self._update_scrollregion()
+        self.render()
+
+    def _update_scrollregion(self):
+        width = max(self.text_width + 10, self.canvas.winfo_width())
+        self.canvas.configure(scrollregion=(0, 0, width, len(self.log) * self.line_height))
+        if self.text_width + 10 > self.canvas.winfo_width() > 1:
+            self.h_scroll.grid(row=1, column=0, sticky="ew")
+        else:
+            self.h_scroll.grid_remove()
+
+    def render(self):
+        """Draw the steps in view; text widths seen so far set the horizontal extent."""
+        self.canvas.delete("step")
+        count = len(self.log)
+        if not count:
+            return
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.line_height)
+        first = max(int(top // self.line_height), 0)
+        last = min(int((top + height) // self.line_height) + 1, count)
+        widest = self.text_width
+        for index in range(first, last):
+            text = self.log[index]
+            widest = max(widest, self.font.measure(text))
+            self.canvas.create_text(4, index * self.line_height, text=text, anchor="nw",
+                                    font=self.font, fill=self.fg, tags="step")
+        if widest > self.text_width:
+            self.text_width = widest
+            self._update_scrollregion()
+
+    def _on_configure(self, event):
+        self._update_scrollregion()
+        self.render()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def _on_mousewheel(self, event):
+        self._yview("scroll", -1 if event.delta > 0 else 1, "units")
+        return "break"